@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compile Skill Search Indexes — builds the columnar, memory-mapped index of
+every skill CSV ahead of time (data/.index/<name>.idx).
+
+Searches compile a missing or stale index on first use; running this after
+editing CSVs (or at install time) keeps that cost off the first query.
+
+Usage:
+    python3 compile-search-index.py                    # All skills
+    python3 compile-search-index.py --skills ui-ux     # Selected skills
+    python3 compile-search-index.py --force            # Rebuild even if current
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.csv_index import federated_path, get_federated, index_path, load_index
+from lib.skill_cores import SKILL_CORES, core_corpora, load_core, min_token_len
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile skill search indexes")
+    parser.add_argument("--skills", nargs="+", choices=list(SKILL_CORES),
+                        help="Only compile these skills (default: all)")
+    parser.add_argument("--force", action="store_true", help="Rebuild indexes that are up to date")
+    args = parser.parse_args()
+
+    for skill in args.skills or list(SKILL_CORES):
+        module = load_core(skill)
+        data_dir, min_len = module.DATA_DIR, min_token_len(module)
+        print(f"{skill}:")
+        for path, search_cols, _ in core_corpora(module):
+            target = index_path(data_dir, path)
+            if args.force and target.exists():
+                target.unlink()
+            start = time.perf_counter()
+            index = load_index(data_dir, path, search_cols, min_len)
+            elapsed = (time.perf_counter() - start) * 1000
+            size = target.stat().st_size if target.exists() else 0
+            print(f"  {path.relative_to(data_dir).as_posix():32} {index.n_rows:6} rows  "
+                  f"{size / 1024:8.1f} KB  {elapsed:7.1f} ms")
+
+        # Cores searching all domains at once also use a federated index
+        if hasattr(module, "_search_csv_federated"):
+            domains = [(data_dir / c["file"], c["search_cols"]) for c in module.CSV_CONFIG.values()]
+            domains = [(path, cols) for path, cols in domains if path.exists()]
+            target = federated_path(data_dir, domains)
+            if args.force and target.exists():
+                target.unlink()
+            start = time.perf_counter()
+            get_federated(data_dir, domains, min_len)
+            elapsed = (time.perf_counter() - start) * 1000
+            size = target.stat().st_size if target.exists() else 0
+            print(f"  {'(all domains, federated)':32} {len(domains):6} CSVs  "
+                  f"{size / 1024:8.1f} KB  {elapsed:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
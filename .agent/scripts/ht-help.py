@@ -8,6 +8,7 @@ Usage:
     python3 ht-help.py fix                # Category guide with workflow
     python3 ht-help.py debug login error  # Task recommendations
     python3 ht-help.py auth               # Search (unknown word)
+    python3 ht-help.py --search webhook signature  # Full-text search of skills, references, workflows
 """
 
 import sys
@@ -21,9 +22,10 @@ if sys.platform == 'win32':
 # Add scripts dir to path for lib imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from lib.discovery import discover_workflows, discover_skills
+from lib.discovery import MANIFEST_FILENAME, Manifest, discover_workflows, discover_skills
 from lib.guides import detect_intent
-from lib.display import show_overview, show_category_guide, do_search, recommend_task
+from lib.display import show_overview, show_category_guide, do_search, recommend_task, show_fulltext_results
+from lib.fulltext import FullTextIndex
 
 
 def main():
@@ -35,9 +37,11 @@ def main():
     workflows_dir = agent_dir / "workflows"
     skills_dir = agent_dir / "skills"
 
-    # Discover available workflows and skills
-    workflows = discover_workflows(workflows_dir)
-    skills = discover_skills(skills_dir)
+    # Discover available workflows and skills (cached until their files change)
+    manifest = Manifest(agent_dir / ".cache" / MANIFEST_FILENAME)
+    workflows = discover_workflows(workflows_dir, manifest)
+    skills = discover_skills(skills_dir, manifest)
+    manifest.save()
 
     if not workflows:
         print("Error: No workflows found in .agent/workflows/")
@@ -53,6 +57,14 @@ def main():
         print(f"Workflows: {len(workflows)}, Skills: {len(skills)}")
         return
 
+    if sys.argv[1:2] in (["--search"], ["-s"]):
+        term = " ".join(sys.argv[2:]).strip()
+        if not term:
+            print("Usage: ht-help.py --search <terms>")
+            sys.exit(1)
+        show_fulltext_results(term, FullTextIndex(agent_dir, agent_dir / ".cache").search(term))
+        return
+
     # Detect intent and route
     workflow_names = [wf["name"].lstrip("/") for wf in workflows]
     intent = detect_intent(user_input, workflow_names)
@@ -1 +1 @@
-# Antigravity-HTKit Help System Library
+# Antigravity-HTKit Shared Script Library (help system, skill search)
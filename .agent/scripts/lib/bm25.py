@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""Shared BM25 ranking engine for skill CSV knowledge bases."""
+
+import heapq
+import importlib.util
+import re
+from collections import defaultdict
+from collections.abc import Mapping
+from math import log
+
+# NumPy is imported only when a vectorized scorer is built, keeping CLI startup fast
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+# Typo tolerance: query terms missing from the vocabulary are matched to
+# vocabulary terms sharing character trigrams within a small edit distance.
+# Short terms are never corrected, so real words missing from a corpus
+# ("firm", "game") do not drift to neighbours, and corrections next to
+# known terms weigh less, so they refine a query rather than redirect it
+FUZZY_MIN_LEN = 5          # shorter terms are too ambiguous to correct
+FUZZY_MAX_EXPANSIONS = 3   # vocabulary terms kept per misspelled term
+FUZZY_DISCOUNT = 0.5       # weight multiplier per edit
+FUZZY_MIXED_DISCOUNT = 0.25 # further multiplier when the query has known terms
+
+
+def trigrams(term: str) -> set:
+    """Character trigrams of a term padded with word boundaries."""
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(term: str) -> int:
+    """Edit distance tolerated when correcting a term: none below 5 characters, 1 up to 9, then 2.
+
+    Two edits only from 10 characters, so a word never reaches a longer
+    relative of itself ("education" -> "educational").
+    """
+    if len(term) < FUZZY_MIN_LEN:
+        return 0
+    return 1 if len(term) < 10 else 2
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance of a and b, or limit + 1 once it exceeds limit.
+
+    Only the diagonal band of width 2 * limit + 1 is computed, and the
+    search stops as soon as a whole row exceeds the limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    too_far = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= limit else too_far
+        for j in range(lo, hi + 1):
+            cost = 0 if ca == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+        if min(current[lo - 1:hi + 1]) > limit:
+            return too_far
+        previous = current
+    return min(previous[len(b)], too_far)
+
+
+def tokenize(text, min_len: int = 3) -> list:
+    """Lowercase, split, remove punctuation, drop words shorter than min_len."""
+    text = _NON_WORD.sub(' ', str(text).lower())
+    return [w for w in text.split() if len(w) >= min_len]
+
+
+def term_counts(tokens: list) -> dict:
+    """{term: frequency} of tokens, in order of first occurrence."""
+    counts = defaultdict(int)
+    for token in tokens:
+        counts[token] += 1
+    return dict(counts)
+
+
+def _best(scores: dict, k: int) -> list:
+    """The k best (doc_idx, score) pairs of scores with a positive score."""
+    # Ties go to the earlier document, as with a stable full sort
+    best = heapq.nlargest(k, scores.items(), key=lambda x: (x[1], -x[0]))
+    return [(idx, score) for idx, score in best if score > 0]
+
+
+class PostingList:
+    """One term's postings as parallel document/term-frequency arrays."""
+
+    __slots__ = ("docs", "tfs")
+
+    def __init__(self, docs, tfs):
+        self.docs = docs
+        self.tfs = tfs
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __iter__(self):
+        return zip(self.docs, self.tfs)
+
+
+class ArrayMapping(Mapping):
+    """Read-only term -> value mapping over an array indexed by term id."""
+
+    def __init__(self, term_ids: dict, array):
+        self.term_ids = term_ids
+        self.array = array
+
+    def __getitem__(self, term):
+        return self.array[self.term_ids[term]]
+
+    def __contains__(self, term) -> bool:
+        return term in self.term_ids
+
+    def __iter__(self):
+        return iter(self.term_ids)
+
+    def __len__(self):
+        return len(self.term_ids)
+
+
+class CSRPostings(Mapping):
+    """Read-only term -> postings mapping over compressed sparse row arrays.
+
+    term_ptr[i]:term_ptr[i + 1] delimits the documents (docs) and term
+    frequencies (tfs) of the term with id i. The arrays can be memory-mapped
+    views, so a compiled index is scored without materializing its postings.
+    """
+
+    def __init__(self, term_ids: dict, term_ptr, docs, tfs):
+        self.term_ids = term_ids
+        self.term_ptr = term_ptr
+        self.docs = docs
+        self.tfs = tfs
+
+    def __getitem__(self, term) -> PostingList:
+        i = self.term_ids[term]
+        start, end = self.term_ptr[i], self.term_ptr[i + 1]
+        return PostingList(self.docs[start:end], self.tfs[start:end])
+
+    def __contains__(self, term) -> bool:
+        return term in self.term_ids
+
+    def __iter__(self):
+        return iter(self.term_ids)
+
+    def __len__(self):
+        return len(self.term_ids)
+
+
+class BM25:
+    """BM25 ranking over per-document term-frequency postings.
+
+    Scoring walks only the postings of the query terms, so query cost grows
+    with the number of matching (term, document) pairs rather than with the
+    size of the corpus.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, min_len: int = 3):
+        self.k1 = k1
+        self.b = b
+        self.min_len = min_len
+        self.doc_lengths = []
+        self.avgdl = 0
+        self.idf = {}
+        self.postings = {}
+        self.N = 0
+        self._trigram_index = None
+        self._expansions = {}
+
+    def tokenize(self, text) -> list:
+        """Tokenize text with this index's settings."""
+        return tokenize(text, self.min_len)
+
+    def fit(self, documents: list) -> None:
+        """Build postings, document lengths and IDF from documents."""
+        self.fit_counts([term_counts(self.tokenize(doc)) for doc in documents])
+
+    def fit_counts(self, counts: list) -> None:
+        """Build the index from one {term: term_freq} dict per document."""
+        self.N = len(counts)
+        if self.N == 0:
+            return
+        self.doc_lengths = [sum(term_freqs.values()) for term_freqs in counts]
+        self.avgdl = sum(self.doc_lengths) / self.N
+
+        # Postings: term -> [[doc_idx, term_freq], ...] in doc order
+        postings = defaultdict(list)
+        for idx, term_freqs in enumerate(counts):
+            for word, tf in term_freqs.items():
+                postings[word].append([idx, tf])
+        self.postings = dict(postings)
+
+        for word, docs in self.postings.items():
+            freq = len(docs)
+            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+
+    def _build_trigram_index(self) -> dict:
+        """Map each trigram to the vocabulary terms containing it."""
+        index = defaultdict(list)
+        for term in self.idf:
+            for gram in trigrams(term):
+                index[gram].append(term)
+        return dict(index)
+
+    def expand_term(self, token: str) -> list:
+        """Vocabulary terms close to a token missing from the vocabulary.
+
+        Returns up to FUZZY_MAX_EXPANSIONS (term, weight) pairs. Candidates
+        come from the trigram index (only terms sharing enough trigrams to be
+        within the edit bound are checked) and are confirmed with a bounded
+        edit distance; weight is FUZZY_DISCOUNT per edit.
+        """
+        if len(token) < FUZZY_MIN_LEN or not self.idf:
+            return []
+        cached = self._expansions.get(token)
+        if cached is not None:
+            return cached
+
+        if self._trigram_index is None:
+            self._trigram_index = self._build_trigram_index()
+
+        # Each edit changes at most three padded trigrams
+        limit = max_edits(token)
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for term in self._trigram_index.get(gram, ()):
+                shared[term] += 1
+        needed = max(1, len(grams) - 3 * limit)
+
+        matches = []
+        for term, count in shared.items():
+            if count < needed:
+                continue
+            distance = bounded_edit_distance(token, term, limit)
+            if distance <= limit:
+                matches.append((distance, -len(self.postings[term]), term))
+        matches.sort()
+
+        expansions = [(term, FUZZY_DISCOUNT ** distance)
+                      for distance, _, term in matches[:FUZZY_MAX_EXPANSIONS]]
+        self._expansions[token] = expansions
+        return expansions
+
+    def query_terms(self, query) -> list:
+        """(term, weight) pairs to score.
+
+        Known tokens score at weight 1. Each unknown token is expanded on its
+        own, at FUZZY_MIXED_DISCOUNT of its correction weight when the query
+        also has known tokens.
+        """
+        tokens = self.tokenize(query)
+        discount = FUZZY_MIXED_DISCOUNT if any(token in self.idf for token in tokens) else 1.0
+        terms = []
+        for token in tokens:
+            if token in self.idf:
+                terms.append((token, 1.0))
+            else:
+                terms.extend((term, weight * discount) for term, weight in self.expand_term(token))
+        return terms
+
+    def _accumulate(self, query, allowed=None) -> dict:
+        """Return {doc_idx: score} for documents sharing a term with query (and in allowed, if given)."""
+        scores = defaultdict(float)
+        k1, b, avgdl = self.k1, self.b, self.avgdl
+        doc_lengths = self.doc_lengths
+
+        for token, weight in self.query_terms(query):
+            idf = self.idf[token]
+            for idx, tf in self.postings[token]:
+                if allowed is not None and idx not in allowed:
+                    continue
+                denominator = tf + k1 * (1 - b + b * doc_lengths[idx] / avgdl)
+                scores[idx] += idf * (tf * (k1 + 1)) / denominator * weight
+
+        return scores
+
+    def score(self, query) -> list:
+        """Score documents containing a query term, best first."""
+        scores = self._accumulate(query)
+        return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+
+    def top_k(self, query, k: int, allowed=None) -> list:
+        """Return the k best (doc_idx, score) pairs with a positive score.
+
+        allowed, a set of doc indices, restricts scoring to those documents.
+        """
+        if k <= 0:
+            return []
+        return _best(self._accumulate(query, allowed), k)
+
+    def to_dict(self) -> dict:
+        """Serialize the fitted index."""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "min_len": self.min_len,
+            "N": self.N,
+            "avgdl": self.avgdl,
+            "doc_lengths": self.doc_lengths,
+            "idf": self.idf,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BM25":
+        """Restore an index produced by to_dict()."""
+        bm25 = cls(data["k1"], data["b"], data["min_len"])
+        bm25.N = data["N"]
+        bm25.avgdl = data["avgdl"]
+        bm25.doc_lengths = data["doc_lengths"]
+        bm25.idf = data["idf"]
+        bm25.postings = data["postings"]
+        return bm25
+
+
+class VectorBM25:
+    """NumPy BM25 backend over a CSR term-document weight matrix.
+
+    Row t of the matrix holds the precomputed BM25 weight of term t in every
+    document containing it, so a query is scored as one sparse row-vector
+    product: the query's rows are concatenated and summed per document with
+    np.bincount. Scores match BM25.top_k() exactly, including tie order.
+    """
+
+    def __init__(self, bm25: BM25):
+        import numpy as np
+        self.np = np
+        self.bm25 = bm25
+        self.N = bm25.N
+        self.term_ids = {term: i for i, term in enumerate(bm25.postings)}
+
+        postings = bm25.postings
+        if isinstance(postings, CSRPostings):
+            # Compiled index: the CSR arrays already exist, wrap them without copying
+            self.indptr = np.frombuffer(postings.term_ptr, dtype=np.uint32).astype(np.int64)
+            lengths = np.diff(self.indptr)
+            self.indices = np.frombuffer(postings.docs, dtype=np.uint32).astype(np.int64)
+            tf = np.frombuffer(postings.tfs, dtype=np.uint32).astype(np.float64)
+        else:
+            lengths = [len(docs) for docs in postings.values()]
+            self.indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=self.indptr[1:])
+
+            pairs = np.array([pair for docs in postings.values() for pair in docs],
+                             dtype=np.int64).reshape(-1, 2)
+            self.indices = pairs[:, 0]
+            tf = pairs[:, 1].astype(np.float64)
+        doc_len = np.asarray(bm25.doc_lengths, dtype=np.float64)[self.indices]
+        if isinstance(bm25.idf, ArrayMapping):
+            idf = np.repeat(np.frombuffer(bm25.idf.array, dtype=np.float64), lengths)
+        else:
+            idf = np.repeat(np.array([bm25.idf[t] for t in bm25.postings], dtype=np.float64), lengths)
+
+        k1, b, avgdl = bm25.k1, bm25.b, bm25.avgdl or 1
+        denominator = tf + k1 * (1 - b + b * doc_len / avgdl)
+        self.data = idf * (tf * (k1 + 1)) / denominator
+
+    def top_k(self, query, k: int, allowed=None) -> list:
+        """Return the k best (doc_idx, score) pairs with a positive score (see BM25.top_k)."""
+        np = self.np
+        terms = self.bm25.query_terms(query) if k > 0 else []
+        if not terms:
+            return []
+
+        spans = [(slice(self.indptr[self.term_ids[t]], self.indptr[self.term_ids[t] + 1]), w)
+                 for t, w in terms]
+        docs = np.concatenate([self.indices[s] for s, _ in spans])
+        weights = np.concatenate([self.data[s] if w == 1.0 else self.data[s] * w for s, w in spans])
+        if allowed is not None:
+            mask = np.zeros(self.N, dtype=bool)
+            mask[np.fromiter(allowed, dtype=np.int64, count=len(allowed))] = True
+            keep = mask[docs]
+            docs, weights = docs[keep], weights[keep]
+        scores = np.bincount(docs, weights=weights, minlength=self.N)
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            # Keep everything tied with the k-th score, then order exactly
+            cutoff = np.partition(scores[candidates], -k)[-k]
+            candidates = candidates[scores[candidates] >= cutoff]
+        order = np.lexsort((candidates, -scores[candidates]))[:k]
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
+
+
+class FederatedBM25:
+    """BM25 over several domain corpora at once, with domain-tagged postings.
+
+    Each term's postings are grouped per domain: term_ptr[t]:term_ptr[t + 1]
+    delimits the term's groups, group_domains[g] is the domain position of
+    group g and group_ptr[g]:group_ptr[g + 1] its documents (docs) and
+    precomputed BM25 term weights (weights). One walk over the query terms
+    therefore scores every domain, and each domain keeps its own IDF and
+    length normalization, so per-domain results match that domain's own
+    BM25.top_k() exactly. domains are the per-domain BM25 indexes, whose
+    query_terms() decide each domain's typo corrections from its own
+    vocabulary.
+    """
+
+    def __init__(self, domains: list, term_ids: dict, term_ptr, group_domains, group_ptr, docs, weights):
+        self.domains = domains
+        self.min_len = domains[0].min_len if domains else 3
+        self.term_ids = term_ids
+        self.term_ptr = term_ptr
+        self.group_domains = group_domains
+        self.group_ptr = group_ptr
+        self.docs = docs
+        self.weights = weights
+
+    @staticmethod
+    def term_weights(bm25: BM25):
+        """Yield (term, docs, weights) with the BM25 weight of every posting of bm25."""
+        k1, b, avgdl = bm25.k1, bm25.b, bm25.avgdl
+        doc_lengths = bm25.doc_lengths
+        for term, postings in bm25.postings.items():
+            idf = bm25.idf[term]
+            docs, weights = [], []
+            for idx, tf in postings:
+                denominator = tf + k1 * (1 - b + b * doc_lengths[idx] / avgdl)
+                docs.append(idx)
+                weights.append(idf * (tf * (k1 + 1)) / denominator)
+            yield term, docs, weights
+
+    def _groups(self, term) -> dict:
+        """{domain position: (start, end)} postings spans of term."""
+        i = self.term_ids.get(term)
+        if i is None:
+            return {}
+        return {self.group_domains[g]: (self.group_ptr[g], self.group_ptr[g + 1])
+                for g in range(self.term_ptr[i], self.term_ptr[i + 1])}
+
+    def top_k(self, query, k: int) -> list:
+        """The k best (doc_idx, score) pairs of every domain, in domain order."""
+        scores = [defaultdict(float) for _ in self.domains]
+        docs, weights = self.docs, self.weights
+
+        def add(domain_scores, span, weight):
+            for i in range(*span):
+                domain_scores[docs[i]] += weights[i] * weight
+
+        groups = {}
+        for pos, bm25 in enumerate(self.domains if k > 0 else []):
+            # Each domain corrects unknown terms with its own vocabulary
+            for term, weight in bm25.query_terms(query):
+                if term not in groups:
+                    groups[term] = self._groups(term)
+                add(scores[pos], groups[term][pos], weight)
+
+        return [_best(domain_scores, k) for domain_scores in scores]
+
+
+def make_scorer(bm25: BM25, backend: str = "python"):
+    """Return a top_k scorer for bm25.
+
+    backend is "python", "numpy" or "auto"; NumPy backends fall back to the
+    pure-Python postings scorer when NumPy is not installed.
+    """
+    if backend in ("numpy", "auto") and NUMPY_AVAILABLE and bm25.N:
+        return VectorBM25(bm25)
+    return bm25
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Columnar, memory-mapped storage for compiled skill CSV data.
+
+A store is one file of named typed arrays ("sections") followed by a JSON
+meta block:
+
+    header:   magic, meta offset, meta length
+    sections: 8-byte aligned array data (array.array typecodes)
+    meta:     {"header": [...], "rows": N, "sections": {name: [offset, typecode, nbytes]}, ...}
+
+Every CSV column is kept as its own pair of sections, "col<i>.ptr" (N + 1
+uint32 byte offsets) and "col<i>" (the concatenated UTF-8 values), so
+reading one column or the output columns of a few rows never decodes the
+rest of the file. Stores are opened with mmap and sliced with memoryview,
+so opening one costs only the meta block.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+MAGIC = b"HTCOLS\x00\x01"
+_HEADER = struct.Struct("<8sQQ")
+
+
+def pack(meta: dict, sections: dict) -> bytes:
+    """Serialize named arrays plus a JSON meta block into one buffer."""
+    parts = [b"\0" * _HEADER.size]
+    pos = _HEADER.size
+    table = {}
+    for name, data in sections.items():
+        typecode = getattr(data, "typecode", None) or getattr(data, "format", "B")
+        raw = data.tobytes() if hasattr(data, "tobytes") else bytes(data)
+        pad = -pos % 8
+        parts.append(b"\0" * pad)
+        pos += pad
+        table[name] = [pos, typecode, len(raw)]
+        parts.append(raw)
+        pos += len(raw)
+
+    meta = dict(meta, sections=table, byteorder=sys.byteorder)
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode('utf-8')
+    parts[0] = _HEADER.pack(MAGIC, pos, len(meta_bytes))
+    parts.append(meta_bytes)
+    return b"".join(parts)
+
+
+def pack_columns(header: list, rows: list) -> tuple:
+    """Columnar sections for rows (lists aligned with header; None marks a missing value).
+
+    Returns (sections, nulls) where nulls maps column position to the rows
+    whose value is None, as csv.DictReader yields for short rows.
+    """
+    sections = {}
+    nulls = {}
+    for i in range(len(header)):
+        ptr = array('I', [0])
+        data = bytearray()
+        for row_idx, row in enumerate(rows):
+            value = row[i]
+            if value is None:
+                nulls.setdefault(str(i), []).append(row_idx)
+            else:
+                data += value.encode('utf-8')
+            ptr.append(len(data))
+        sections[f"col{i}.ptr"] = ptr
+        sections[f"col{i}"] = data
+    return sections, nulls
+
+
+class ColumnStore:
+    """Read-only view over a packed store held in an mmap or bytes buffer."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        magic, meta_offset, meta_length = _HEADER.unpack_from(self.view)
+        if magic != MAGIC:
+            raise ValueError("Not a column store")
+        self.meta = json.loads(bytes(self.view[meta_offset:meta_offset + meta_length]))
+        if self.meta.get("byteorder") != sys.byteorder:
+            raise ValueError("Column store was written with another byte order")
+
+        self.header = self.meta.get("header", [])
+        self.n_rows = self.meta.get("rows", 0)
+        # Duplicate column names resolve to the last one, as with csv.DictReader
+        self._positions = {name: i for i, name in enumerate(self.header)}
+        self._nulls = {int(i): set(rows) for i, rows in self.meta.get("nulls", {}).items()}
+        self._columns = {}
+
+    @classmethod
+    def open(cls, path: Path) -> "ColumnStore":
+        """Memory-map a store file."""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def section(self, name: str) -> memoryview:
+        """Typed view of one section."""
+        offset, typecode, nbytes = self.meta["sections"][name]
+        view = self.view[offset:offset + nbytes]
+        return view if typecode == "B" else view.cast(typecode)
+
+    def repack(self, meta: dict) -> bytes:
+        """Serialize the same sections with updated meta."""
+        sections = {name: self.section(name) for name in self.meta["sections"]}
+        meta = {key: value for key, value in meta.items() if key not in ("sections", "byteorder")}
+        return pack(meta, sections)
+
+    def _column(self, position: int) -> tuple:
+        """(offsets, data) views of one column."""
+        if position not in self._columns:
+            self._columns[position] = (self.section(f"col{position}.ptr"), self.section(f"col{position}"))
+        return self._columns[position]
+
+    def _value(self, position: int, row: int):
+        if row in self._nulls.get(position, ()):
+            return None
+        ptr, data = self._column(position)
+        return str(data[ptr[row]:ptr[row + 1]], 'utf-8')
+
+    def column(self, name: str) -> list:
+        """All values of one column (None where the column is missing)."""
+        position = self._positions.get(name)
+        if position is None:
+            return [None] * self.n_rows
+        return [self._value(position, row) for row in range(self.n_rows)]
+
+    def rows(self, indices: list, columns: list = None) -> list:
+        """Rows as dicts of the requested columns (default: all), like csv.DictReader."""
+        names = self.header if columns is None else [c for c in columns if c in self._positions]
+        positions = [(name, self._positions[name]) for name in names]
+        return [{name: self._value(position, row) for name, position in positions} for row in indices]
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""Compiled on-disk BM25 indexes for skill CSV knowledge bases.
+
+Each CSV is compiled once into <data_dir>/.index/<name>.idx, a columnar
+memory-mapped store (see column_store.py) holding every column's values,
+the BM25 postings as CSR arrays, doc lengths and IDF. The index is reused
+until the source CSV's mtime changes and its content hash no longer
+matches. A query maps the index, walks only the postings of its terms and
+decodes only the output columns of the rows it returns. Loaded indexes and
+scorers are also kept per process (revalidated with one stat per query),
+so long-lived callers such as the search daemon never reload them.
+
+Searches over every domain of a skill use a federated index
+(<data_dir>/.index/federated-<hash>.idx) merging the per-CSV postings
+with a domain tag and precomputed term weights, so one walk over the
+query terms yields every domain's top hits.
+
+search_many() is the search() / search_many() of every skill core: it
+routes queries over a core's CSV_CONFIG domains with its KeywordMatcher and
+batches all searches of a domain into one search_csv_many() call.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+from array import array
+from pathlib import Path
+
+from .bm25 import BM25, ArrayMapping, CSRPostings, FederatedBM25, make_scorer
+from .column_store import ColumnStore, pack, pack_columns
+
+INDEX_DIRNAME = ".index"
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 3
+
+# In-process caches: (index path, search cols, min_len, backend) -> (csv stat, index, scorer)
+# and (corpora, min_len) -> (csv stats, indexes, federated scorer)
+_LOADED = {}
+_FEDERATED = {}
+
+
+def file_hash(filepath: Path) -> str:
+    """SHA-256 of a file's contents."""
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+
+def index_path(data_dir: Path, filepath: Path) -> Path:
+    """Location of the compiled index for a data file."""
+    name = filepath.relative_to(data_dir).with_suffix("").as_posix().replace("/", "--")
+    return data_dir / INDEX_DIRNAME / f"{name}{INDEX_SUFFIX}"
+
+
+def read_csv(raw: bytes) -> tuple:
+    """Parse CSV bytes into (header, rows) exactly as csv.DictReader over the text file would.
+
+    Blank lines are skipped and short rows are padded with None; rows stay
+    positional so duplicate column names keep all their values.
+    """
+    text = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None) or []
+    rows = []
+    for row in reader:
+        if not row:
+            continue
+        rows.append(row[:len(header)] + [None] * (len(header) - len(row)))
+    return header, rows
+
+
+def pack_bm25(bm25: BM25, sections: dict) -> dict:
+    """Add a fitted index's postings as CSR sections; returns its meta for load_bm25()."""
+    terms = list(bm25.postings)
+    term_ptr, docs, tfs = array('I', [0]), array('I'), array('I')
+    for term in terms:
+        for idx, tf in bm25.postings[term]:
+            docs.append(idx)
+            tfs.append(tf)
+        term_ptr.append(len(docs))
+
+    sections.update({
+        "idf": array('d', [bm25.idf[term] for term in terms]),
+        "term_ptr": term_ptr,
+        "post_docs": docs,
+        "post_tfs": tfs,
+        "doc_lengths": array('I', bm25.doc_lengths),
+    })
+    return {"k1": bm25.k1, "b": bm25.b, "min_len": bm25.min_len,
+            "N": bm25.N, "avgdl": bm25.avgdl, "terms": terms}
+
+
+def build_index(filepath: Path, search_cols: list, min_len: int = 3) -> ColumnStore:
+    """Parse a CSV once and compile its columns and BM25 postings."""
+    stat = filepath.stat()
+    raw = filepath.read_bytes()
+    header, rows = read_csv(raw)
+
+    # Documents are built from the row dicts DictReader would return
+    documents = []
+    for values in rows:
+        row = dict(zip(header, values))
+        documents.append(" ".join(str(row.get(col, "")) for col in search_cols))
+
+    bm25 = BM25(min_len=min_len)
+    bm25.fit(documents)
+
+    sections, nulls = pack_columns(header, rows)
+    params = pack_bm25(bm25, sections)
+    meta = {
+        "version": INDEX_VERSION,
+        "source": {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+        },
+        "search_cols": list(search_cols),
+        "header": header,
+        "rows": len(rows),
+        "nulls": nulls,
+        "bm25": params,
+    }
+    return ColumnStore(pack(meta, sections))
+
+
+def load_bm25(index: ColumnStore) -> BM25:
+    """BM25 scorer reading postings straight from a compiled index."""
+    params = index.meta["bm25"]
+    term_ids = {term: i for i, term in enumerate(params["terms"])}
+    return BM25.from_dict({
+        "k1": params["k1"],
+        "b": params["b"],
+        "min_len": params["min_len"],
+        "N": params["N"],
+        "avgdl": params["avgdl"],
+        "doc_lengths": index.section("doc_lengths"),
+        "idf": ArrayMapping(term_ids, index.section("idf")),
+        "postings": CSRPostings(term_ids, index.section("term_ptr"),
+                                index.section("post_docs"), index.section("post_tfs")),
+    })
+
+
+def write_index(path: Path, data: bytes) -> None:
+    """Atomically persist an index; read-only installs just skip caching."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_index(data_dir: Path, filepath: Path, search_cols: list, min_len: int = 3) -> ColumnStore:
+    """Map the compiled index for a CSV, rebuilding it when the CSV changed."""
+    path = index_path(data_dir, filepath)
+    try:
+        index = ColumnStore.open(path)
+    except (OSError, ValueError, KeyError):
+        index = None
+
+    if (index and index.meta.get("version") == INDEX_VERSION
+            and index.meta.get("search_cols") == list(search_cols)
+            and index.meta["bm25"].get("min_len") == min_len):
+        stat = filepath.stat()
+        source = index.meta["source"]
+        if source["mtime_ns"] == stat.st_mtime_ns and source["size"] == stat.st_size:
+            return index
+        # Touched but not edited (checkout, copy): refresh mtime, keep index
+        if source["size"] == stat.st_size and file_hash(filepath) == source["sha256"]:
+            source["mtime_ns"] = stat.st_mtime_ns
+            write_index(path, index.repack(index.meta))
+            return index
+
+    index = build_index(filepath, search_cols, min_len)
+    write_index(path, index.buffer)
+    return index
+
+
+def federated_path(data_dir: Path, corpora: list) -> Path:
+    """Location of the federated index over (filepath, search_cols) corpora."""
+    key = json.dumps([[filepath.relative_to(data_dir).as_posix(), list(cols)] for filepath, cols in corpora])
+    return data_dir / INDEX_DIRNAME / f"federated-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}{INDEX_SUFFIX}"
+
+
+def _federated_sources(indexes: list) -> list:
+    """What a federated index was built from: each part's source hash and search columns."""
+    return [[index.meta["source"]["sha256"], index.meta["search_cols"]] for index in indexes]
+
+
+def build_federated(indexes: list, min_len: int = 3) -> ColumnStore:
+    """Merge per-CSV compiled indexes into one index of domain-tagged postings."""
+    merged = {}
+    for pos, index in enumerate(indexes):
+        for term, docs, weights in FederatedBM25.term_weights(load_bm25(index)):
+            merged.setdefault(term, []).append((pos, docs, weights))
+
+    terms = list(merged)
+    term_ptr, group_domains, group_ptr = array('I', [0]), array('H'), array('I', [0])
+    docs, weights = array('I'), array('d')
+    for term in terms:
+        for pos, term_docs, term_weights in merged[term]:
+            group_domains.append(pos)
+            docs.extend(term_docs)
+            weights.extend(term_weights)
+            group_ptr.append(len(docs))
+        term_ptr.append(len(group_domains))
+
+    meta = {
+        "version": INDEX_VERSION,
+        "federated": _federated_sources(indexes),
+        "min_len": min_len,
+        "terms": terms,
+    }
+    return ColumnStore(pack(meta, {
+        "term_ptr": term_ptr,
+        "group_domains": group_domains,
+        "group_ptr": group_ptr,
+        "post_docs": docs,
+        "post_weights": weights,
+    }))
+
+
+def load_federated(data_dir: Path, corpora: list, indexes: list, min_len: int = 3) -> ColumnStore:
+    """Map the federated index of corpora, rebuilding it when any part changed."""
+    path = federated_path(data_dir, corpora)
+    try:
+        federated = ColumnStore.open(path)
+    except (OSError, ValueError, KeyError):
+        federated = None
+
+    if (federated and federated.meta.get("version") == INDEX_VERSION
+            and federated.meta.get("min_len") == min_len
+            and federated.meta.get("federated") == _federated_sources(indexes)):
+        return federated
+
+    federated = build_federated(indexes, min_len)
+    write_index(path, federated.buffer)
+    return federated
+
+
+def get_scorer(data_dir: Path, filepath: Path, search_cols: list,
+               min_len: int = 3, backend: str = "python") -> tuple:
+    """Return (index, scorer) for a CSV, reusing this process's copy while the CSV is unchanged."""
+    stat = filepath.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = (str(index_path(data_dir, filepath)), tuple(search_cols), min_len, backend)
+    cached = _LOADED.get(key)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
+
+    index = load_index(data_dir, filepath, search_cols, min_len)
+    scorer = make_scorer(load_bm25(index), backend)
+    _LOADED[key] = (signature, index, scorer)
+    return index, scorer
+
+
+def get_federated(data_dir: Path, corpora: list, min_len: int = 3) -> tuple:
+    """Return (indexes, FederatedBM25) searching all (filepath, search_cols) corpora in one pass."""
+    signature = tuple((stat.st_mtime_ns, stat.st_size) for stat in (filepath.stat() for filepath, _ in corpora))
+    key = (tuple((str(filepath), tuple(cols)) for filepath, cols in corpora), min_len)
+    cached = _FEDERATED.get(key)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
+
+    # The postings scorers are shared with single-CSV searches, so term expansions are cached once
+    loaded = [get_scorer(data_dir, filepath, cols, min_len) for filepath, cols in corpora]
+    indexes = [index for index, _ in loaded]
+    domains = [scorer for _, scorer in loaded]
+    federated = load_federated(data_dir, corpora, indexes, min_len)
+    term_ids = {term: i for i, term in enumerate(federated.meta["terms"])}
+    scorer = FederatedBM25(domains, term_ids, federated.section("term_ptr"),
+                           federated.section("group_domains"), federated.section("group_ptr"),
+                           federated.section("post_docs"), federated.section("post_weights"))
+    _FEDERATED[key] = (signature, indexes, scorer)
+    return indexes, scorer
+
+
+def search_csv(data_dir: Path, filepath: Path, search_cols: list, output_cols: list,
+               query: str, max_results: int, min_len: int = 3, backend: str = "python") -> list:
+    """BM25 search over a CSV's compiled index, returning output columns of top hits.
+
+    backend selects the scorer (see bm25.make_scorer); "auto" uses NumPy
+    vectorized scoring when it is installed.
+    """
+    if not filepath.exists():
+        return []
+
+    return search_csv_many(data_dir, filepath, search_cols, output_cols,
+                           [(query, max_results)], min_len, backend)[0]
+
+
+def search_csv_many(data_dir: Path, filepath: Path, search_cols: list, output_cols: list,
+                    requests: list, min_len: int = 3, backend: str = "python") -> list:
+    """Run several (query, max_results) searches against one CSV.
+
+    The index is resolved once and the output columns of all hit rows are
+    decoded together; returns one result list per request, in order.
+    """
+    if not filepath.exists():
+        return [[] for _ in requests]
+
+    index, scorer = get_scorer(data_dir, filepath, search_cols, min_len, backend)
+    hits = [[idx for idx, _ in scorer.top_k(query, max_results)] for query, max_results in requests]
+
+    # Decode only the output columns of rows some request returns
+    unique = sorted({idx for request_hits in hits for idx in request_hits})
+    rows = dict(zip(unique, index.rows(unique, output_cols)))
+
+    return [[dict(rows[idx]) for idx in request_hits] for request_hits in hits]
+
+
+def search_csv_federated(data_dir: Path, corpora: list, query: str, max_results: int,
+                         min_len: int = 3) -> list:
+    """Search several CSVs with one federated index walk.
+
+    corpora are (filepath, search_cols, output_cols) triples; returns one
+    result list per corpus, in order, each identical to what search_csv
+    would return for that CSV alone. Missing CSVs yield empty lists.
+    """
+    present = [i for i, (filepath, _, _) in enumerate(corpora) if filepath.exists()]
+    results = [[] for _ in corpora]
+    if not present:
+        return results
+
+    indexes, scorer = get_federated(data_dir, [corpora[i][:2] for i in present], min_len)
+    for i, index, hits in zip(present, indexes, scorer.top_k(query, max_results)):
+        results[i] = index.rows([idx for idx, _ in hits], corpora[i][2])
+    return results
+
+
+def search_many(config: dict, queries: list, data_dir: Path, matcher, domain: str = None,
+                max_results: int = 3, min_len: int = 3, backend: str = "python") -> list:
+    """Run a skill core's searches over its CSV_CONFIG domains, loading each index once.
+
+    Each query is a string or a (query, domain[, max_results]) tuple; domain
+    and max_results are the defaults for entries that omit them. Entries
+    without a domain are routed by matcher.route_search() as a single
+    search is, "confidence" and "related" results included; unknown domains
+    search matcher.default. Returns one result dict per query, in order.
+    """
+    entries = []
+    for item in queries:
+        if isinstance(item, str):
+            item = (item,)
+        entries.append((item[0], (item[1] if len(item) > 1 else None) or domain,
+                        item[2] if len(item) > 2 else max_results))
+
+    # First pass: every one-domain search the routes ask for, grouped by domain
+    requests = {}
+
+    def plan(query, item_domain, item_max):
+        requests.setdefault(item_domain, {})[(query, item_max)] = None
+        return {}
+
+    for entry in entries:
+        matcher.route_search(plan, *entry)
+
+    hits = {}
+    for item_domain, pending in requests.items():
+        domain_config = config.get(item_domain, config[matcher.default])
+        filepath = data_dir / domain_config["file"]
+        if filepath.exists():
+            hits[item_domain] = dict(zip(pending, search_csv_many(
+                data_dir, filepath, domain_config["search_cols"], domain_config["output_cols"],
+                list(pending), min_len, backend)))
+
+    # Second pass: the same routes, answered from the batched hits
+    def answer(query, item_domain, item_max):
+        domain_config = config.get(item_domain, config[matcher.default])
+        if item_domain not in hits:
+            return {"error": f"File not found: {data_dir / domain_config['file']}", "domain": item_domain}
+        rows = [dict(row) for row in hits[item_domain][(query, item_max)]]
+        return {
+            "domain": item_domain,
+            "query": query,
+            "file": domain_config["file"],
+            "count": len(rows),
+            "results": rows
+        }
+
+    return [matcher.route_search(answer, *entry) for entry in entries]
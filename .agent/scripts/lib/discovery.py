@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Workflow and skill discovery for Antigravity-HTKit help system."""
 
+import json
+import os
 import re
 from pathlib import Path
 
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "ht-help-manifest.json"
+
 
 def parse_frontmatter(file_path: Path) -> dict:
     """Parse YAML frontmatter from a markdown file."""
@@ -30,59 +35,131 @@ def parse_frontmatter(file_path: Path) -> dict:
     return result
 
 
-def discover_workflows(workflows_dir: Path) -> list:
+class Manifest:
+    """Catalog entries cached on disk, revalidated per file by mtime and size.
+
+    Each scanned directory keeps {name: [signature, entry]}; an entry is
+    rebuilt only when its signature changed, and the file is rewritten only
+    when something did.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.dirty = False
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = {}
+        self.sections = data.get("sections", {}) if data.get("version") == MANIFEST_VERSION else {}
+
+    def entries(self, directory: Path, items: list, build) -> list:
+        """Entries for (name, signature, path) items in order, building changed ones with build(path)."""
+        key = str(directory.resolve())
+        cached = self.sections.get(key, {})
+        section = {}
+        result = []
+        for name, signature, path in items:
+            signature = list(signature)
+            hit = cached.get(name)
+            if hit and hit[0] == signature:
+                entry = hit[1]
+            else:
+                entry = build(path)
+                self.dirty = True
+            section[name] = [signature, entry]
+            if entry is not None:
+                result.append(entry)
+        if section.keys() != cached.keys():
+            self.dirty = True
+        self.sections[key] = section
+        return result
+
+    def save(self) -> None:
+        """Write the manifest atomically if it changed; read-only installs skip caching."""
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"version": MANIFEST_VERSION, "sections": self.sections}),
+                                encoding='utf-8')
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
+def _workflow_entry(md_file: Path):
+    """Catalog entry for one workflow file, or None without a description."""
+    fm = parse_frontmatter(md_file)
+    description = fm.get('description', '')
+
+    if not description:
+        return None
+
+    name = md_file.stem
+    clean_desc = re.sub(r'^[⚡\s]+', '', description).strip()
+
+    # Count power level (⚡ count)
+    power_level = description.count('⚡')
+
+    return {
+        "name": f"/{name}",
+        "description": clean_desc,
+        "power_level": power_level,
+        "filename": md_file.name,
+    }
+
+
+def _skill_entry(skill_dir: Path) -> dict:
+    """Catalog entry for one skill directory."""
+    fm = parse_frontmatter(skill_dir / "SKILL.md")
+    description = fm.get('description', '')
+
+    return {
+        "name": skill_dir.name,
+        "description": description[:120],
+        "has_scripts": (skill_dir / "scripts").exists(),
+        "has_references": (skill_dir / "references").exists(),
+    }
+
+
+def discover_workflows(workflows_dir: Path, manifest: Manifest = None) -> list:
     """Scan .agent/workflows/ and build workflow catalog."""
-    workflows = []
-
     if not workflows_dir.exists():
-        return workflows
-
-    for md_file in sorted(workflows_dir.glob("*.md")):
-        fm = parse_frontmatter(md_file)
-        description = fm.get('description', '')
-
-        if not description:
-            continue
-
-        name = md_file.stem
-        clean_desc = re.sub(r'^[⚡\s]+', '', description).strip()
-
-        # Count power level (⚡ count)
-        power_level = description.count('⚡')
+        return []
 
-        workflows.append({
-            "name": f"/{name}",
-            "description": clean_desc,
-            "power_level": power_level,
-            "filename": md_file.name,
-        })
+    if manifest is None:
+        entries = (_workflow_entry(md_file) for md_file in sorted(workflows_dir.glob("*.md")))
+        return [entry for entry in entries if entry]
 
-    return workflows
+    # One scandir pass yields every workflow's name, mtime and size
+    with os.scandir(workflows_dir) as it:
+        items = [(entry.name, (entry.stat().st_mtime_ns, entry.stat().st_size), Path(entry.path))
+                 for entry in it if entry.name.endswith(".md")]
+    return manifest.entries(workflows_dir, sorted(items), _workflow_entry)
 
 
-def discover_skills(skills_dir: Path) -> list:
+def discover_skills(skills_dir: Path, manifest: Manifest = None) -> list:
     """Scan .agent/skills/ and build skill catalog."""
-    skills = []
-
     if not skills_dir.exists():
-        return skills
-
-    for skill_dir in sorted(skills_dir.iterdir()):
-        if not skill_dir.is_dir():
-            continue
-
-        skill_md = skill_dir / "SKILL.md"
-        if not skill_md.exists():
-            continue
-
-        fm = parse_frontmatter(skill_md)
-        description = fm.get('description', '')
-
-        skills.append({
-            "name": skill_dir.name,
-            "description": description[:120],
-            "has_scripts": (skill_dir / "scripts").exists(),
-            "has_references": (skill_dir / "references").exists(),
-        })
-
-    return skills
+        return []
+
+    if manifest is None:
+        return [_skill_entry(skill_dir) for skill_dir in sorted(skills_dir.iterdir())
+                if skill_dir.is_dir() and (skill_dir / "SKILL.md").exists()]
+
+    # A skill directory's mtime changes when scripts/ or references/ come or go;
+    # SKILL.md's own stat catches in-place edits
+    items = []
+    with os.scandir(skills_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            try:
+                skill_md = os.stat(os.path.join(entry.path, "SKILL.md"))
+            except OSError:
+                continue
+            signature = (entry.stat().st_mtime_ns, skill_md.st_mtime_ns, skill_md.st_size)
+            items.append((entry.name, signature, Path(entry.path)))
+    return manifest.entries(skills_dir, sorted(items), _skill_entry)
@@ -1,9 +1,7 @@
 #!/usr/bin/env python3
 """Display formatters for Antigravity-HTKit help system."""
 
-import re
-from .guides import CATEGORY_GUIDES, TASK_MAPPINGS, expand_synonyms
-from .fuzzy import fuzzy_match
+from .guides import CATEGORY_GUIDES, expand_synonyms, task_scorer, vocabulary_index
 
 # Disambiguation threshold
 DISAMBIGUATION_THRESHOLD = 0.5
@@ -43,6 +41,7 @@ def show_overview(workflows: list, skills: list) -> None:
     print("**Usage:**")
     print("- `/ht-help <workflow>` - Hướng dẫn workflow cụ thể")
     print("- `/ht-help <task description>` - Gợi ý workflow phù hợp")
+    print("- `/ht-help --search <terms>` - Tìm trong nội dung skills, references và workflows")
     print()
     print("**Tips:**")
     print("- Dùng `/vn` cho dự án Việt Nam")
@@ -65,10 +64,8 @@ def show_category_guide(category: str, workflows: list) -> None:
 
     # Fuzzy match for typos
     if not cat_key:
-        for key in CATEGORY_GUIDES.keys():
-            if fuzzy_match(category_lower, key.lower()):
-                cat_key = key
-                break
+        matches = vocabulary_index().matches(category_lower)
+        cat_key = next((key for key in CATEGORY_GUIDES.keys() if key.lower() in matches), None)
 
     if not cat_key:
         available = ", ".join(f"`{c}`" for c in sorted(CATEGORY_GUIDES.keys()))
@@ -111,6 +108,7 @@ def do_search(term: str, workflows: list, skills: list) -> None:
         print()
         available = ", ".join(f"`{c}`" for c in sorted(CATEGORY_GUIDES.keys()))
         print(f"Try browsing: {available}")
+        print(f"Or search file contents: `/ht-help --search {term}`")
         return
 
     print(f"# Search: {term}")
@@ -121,64 +119,32 @@ def do_search(term: str, workflows: list, skills: list) -> None:
         print(f"- {prefix} `{name}` — {desc}")
 
 
+def show_fulltext_results(term: str, results: list) -> None:
+    """Display ranked full-text matches with snippets."""
+    emit_output_type("search-results")
+
+    if not results:
+        print(f"No documents mention '{term}'.")
+        print()
+        print("Try fewer or broader terms, or `/ht-help <keyword>` to browse the catalog.")
+        return
+
+    icons = {"workflow": "📋", "skill": "🔧", "reference": "📄"}
+    print(f"# Full-text search: {term}")
+    print()
+    print(f"Top {len(results)} documents:")
+    for result in results:
+        print(f"- {icons.get(result['kind'], '📄')} `{result['name']}` — {result['title']}")
+        print(f"  `{result['path']}`")
+        if result["snippet"]:
+            print(f"  > {result['snippet']}")
+
+
 def recommend_task(task: str, workflows: list) -> None:
     """Recommend workflows for a task description."""
     emit_output_type("task-recommendations")
 
-    task_expanded = expand_synonyms(task)
-    task_lower = task_expanded
-    words = task_lower.split()
-
-    ACTION_VERBS = {
-        "fix", "debug", "test", "create", "build", "implement", "deploy",
-        "plan", "design", "review", "check", "verify", "find", "search",
-    }
-
-    first_word_is_action = words[0] in ACTION_VERBS if words else False
-
-    scores = {}
-    for cat, keywords in TASK_MAPPINGS.items():
-        score = 0.0
-        for kw in keywords:
-            if ' ' in kw:
-                if kw in task_lower:
-                    score += 3.0
-            else:
-                matched_pos = -1
-                is_fuzzy = False
-
-                match = re.search(r'\b' + re.escape(kw) + r'\b', task_lower)
-                if match:
-                    char_count = 0
-                    for i, word in enumerate(words):
-                        if char_count <= match.start() < char_count + len(word):
-                            matched_pos = i
-                            break
-                        char_count += len(word) + 1
-                else:
-                    for i, word in enumerate(words):
-                        if fuzzy_match(word, kw):
-                            matched_pos = i
-                            is_fuzzy = True
-                            break
-
-                if matched_pos >= 0:
-                    if len(words) > 1:
-                        if first_word_is_action and matched_pos == 0:
-                            weight = 2.5
-                        elif first_word_is_action:
-                            weight = 1.0
-                        else:
-                            weight = 1.0 + (matched_pos / (len(words) - 1))
-                    else:
-                        weight = 2.0
-
-                    if is_fuzzy:
-                        weight *= 0.8
-
-                    score += weight
-        if score > 0:
-            scores[cat] = score
+    scores = task_scorer().score(expand_synonyms(task))
 
     if not scores:
         available = ", ".join(f"`/{c}`" for c in sorted(CATEGORY_GUIDES.keys()))
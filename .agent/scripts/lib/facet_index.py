@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Facet bitsets and prefix completion over compiled CSV columns.
+
+A FacetIndex maps every distinct (lowercased) value of a column to a
+bitset of the rows holding it, stored as a Python int. Filters become
+bitwise unions and intersections, and a bitset can be tested against BM25
+hits row by row without rescanning the column. A PrefixIndex keeps
+(key, row) pairs sorted, so a prefix is answered with two binary searches
+(a flattened trie that costs no per-node objects).
+
+Both are built from a ColumnStore's columns on first use and kept for as
+long as that index object is alive; a rebuilt index gets fresh ones.
+"""
+
+import bisect
+import weakref
+
+# index -> {(kind, columns): FacetIndex | PrefixIndex}
+_BUILT = weakref.WeakKeyDictionary()
+
+
+def bitset_rows(bits: int, limit: int = None) -> list:
+    """Row numbers set in bits, ascending, at most limit of them."""
+    rows = []
+    while bits and (limit is None or len(rows) < limit):
+        low = bits & -bits
+        rows.append(low.bit_length() - 1)
+        bits ^= low
+    return rows
+
+
+class FacetIndex:
+    """Row bitsets per distinct value of one column (case-insensitive)."""
+
+    def __init__(self, values: list):
+        self.bitsets = {}
+        for row, value in enumerate(values):
+            key = (value or "").lower()
+            self.bitsets[key] = self.bitsets.get(key, 0) | (1 << row)
+
+    def equals(self, value: str) -> int:
+        """Rows whose value equals value."""
+        return self.bitsets.get(value.lower(), 0)
+
+    def containing(self, text: str) -> int:
+        """Rows whose value contains text."""
+        text = text.lower()
+        bits = 0
+        for key, rows in self.bitsets.items():
+            if text in key:
+                bits |= rows
+        return bits
+
+
+class PrefixIndex:
+    """Sorted (key, row) pairs of one or more columns for prefix lookups."""
+
+    def __init__(self, columns: list):
+        pairs = sorted((value.lower(), row) for values in columns
+                       for row, value in enumerate(values) if value)
+        self.keys = [key for key, _ in pairs]
+        self.rows = [row for _, row in pairs]
+
+    def _span(self, prefix: str) -> tuple:
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.keys, prefix)
+        # Every key with the prefix sorts before prefix followed by the highest code point
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start)
+        return start, end
+
+    def complete(self, prefix: str, limit: int = None) -> list:
+        """Distinct rows having a key that starts with prefix, in key order."""
+        start, end = self._span(prefix)
+        rows, seen = [], set()
+        for row in self.rows[start:end]:
+            if limit is not None and len(rows) >= limit:
+                break
+            if row not in seen:
+                seen.add(row)
+                rows.append(row)
+        return rows
+
+    def lookup(self, key: str) -> list:
+        """Rows whose key equals key, ascending."""
+        key = key.lower()
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_right(self.keys, key, start)
+        return sorted(self.rows[start:end])
+
+
+def _built(index, kind: str, columns: tuple, factory):
+    cache = _BUILT.setdefault(index, {})
+    if (kind, columns) not in cache:
+        cache[kind, columns] = factory([index.column(name) for name in columns])
+    return cache[kind, columns]
+
+
+def facet_index(index, column: str) -> FacetIndex:
+    """FacetIndex of one column of a compiled index."""
+    return _built(index, "facet", (column,), lambda values: FacetIndex(values[0]))
+
+
+def prefix_index(index, columns: list) -> PrefixIndex:
+    """PrefixIndex over the values of columns of a compiled index."""
+    return _built(index, "prefix", tuple(columns), PrefixIndex)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Full-text search over workflow, skill and reference markdown for ht-help.
+
+Indexed documents are workflows/*.md, skills/*/SKILL.md and every markdown
+file under skills/*/references/. Two caches live in .agent/.cache/:
+
+    ht-help-fulltext.json   per-file title and term counts, in a Manifest
+                            (see discovery.py) revalidated by mtime and size
+    ht-help-fulltext.idx    the compiled BM25 index (a ColumnStore, see
+                            csv_index.py), tagged with a digest of every
+                            file's name and signature
+
+A search stats the files and maps the compiled index while the digest
+matches. Otherwise only the changed files are re-read, their counts merged
+with the cached ones and the index recompiled. Snippets are cut from the
+few top-ranked files at query time.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from .bm25 import BM25, term_counts, tokenize
+from .column_store import ColumnStore, pack, pack_columns
+from .csv_index import load_bm25, pack_bm25, write_index
+from .discovery import Manifest
+
+FULLTEXT_VERSION = 1
+FULLTEXT_MANIFEST = "ht-help-fulltext.json"
+FULLTEXT_INDEX = "ht-help-fulltext.idx"
+
+COLUMNS = ["kind", "name", "title", "path"]
+
+SNIPPET_WIDTH = 160
+
+_HEADING = re.compile(r'^#{1,6}\s+(.+?)\s*#*\s*$', re.MULTILINE)
+_SPACES = re.compile(r'\s+')
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return ""
+
+
+def _body(text: str) -> str:
+    """Text without its YAML frontmatter."""
+    if text.startswith('---'):
+        end_idx = text.find('\n---', 3)
+        if end_idx != -1:
+            return text[end_idx + 4:]
+    return text
+
+
+def _document_entry(path: Path) -> dict:
+    """Title and term counts of one markdown file."""
+    text = _read(path)
+    heading = _HEADING.search(_body(text))
+    return {
+        "title": heading.group(1) if heading else path.stem,
+        "counts": term_counts(tokenize(text)),
+    }
+
+
+def _markdown_files(directory: str, prefix: str, items: list, recursive: bool = True) -> None:
+    """Append (name, signature, path) for the .md files below directory."""
+    try:
+        it = os.scandir(directory)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            name = f"{prefix}{entry.name}"
+            if entry.is_dir():
+                if recursive:
+                    _markdown_files(entry.path, f"{name}/", items)
+            elif entry.name.endswith(".md"):
+                stat = entry.stat()
+                items.append((name, (stat.st_mtime_ns, stat.st_size), Path(entry.path)))
+
+
+def _skill_items(skills_dir: Path) -> list:
+    """(name, signature, path) of each SKILL.md and reference file, named by path below skills/."""
+    items = []
+    try:
+        it = os.scandir(skills_dir)
+    except OSError:
+        return items
+    with it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            try:
+                stat = os.stat(os.path.join(entry.path, "SKILL.md"))
+            except OSError:
+                continue
+            items.append((f"{entry.name}/SKILL.md", (stat.st_mtime_ns, stat.st_size),
+                          Path(entry.path) / "SKILL.md"))
+            _markdown_files(os.path.join(entry.path, "references"), f"{entry.name}/references/", items)
+    return items
+
+
+def _best_line(text: str, terms: set) -> str:
+    """The first body line holding the most query terms, or ""."""
+    best, best_hits = "", 0
+    for line in _body(text).splitlines():
+        hits = len(terms.intersection(tokenize(line)))
+        if hits > best_hits:
+            best, best_hits = line, hits
+    return best
+
+
+def snippet(text: str, terms: set, width: int = SNIPPET_WIDTH) -> str:
+    """A window of the best matching line, about width characters around its first hit."""
+    line = _SPACES.sub(' ', _best_line(text, terms)).strip().lstrip('#>-*| ').strip()
+    if len(line) <= width:
+        return line
+    lower = line.lower()
+    first = min((pos for pos in (lower.find(term) for term in terms) if pos >= 0), default=0)
+    start = max(0, min(first - width // 4, len(line) - width))
+    end = start + width
+    # Cut at spaces so the window never starts or ends mid-word
+    if start > 0:
+        space = line.find(' ', start, first)
+        start = space + 1 if space != -1 else start
+    if end < len(line):
+        space = line.rfind(' ', start, end)
+        end = space if space > first else end
+    window = line[start:end].strip()
+    return ("…" if start > 0 else "") + window + ("…" if end < len(line) else "")
+
+
+def _sources(agent_dir: Path) -> list:
+    """(directory, items) to index, items being sorted (name, signature, path) triples."""
+    workflow_items = []
+    _markdown_files(str(agent_dir / "workflows"), "", workflow_items, recursive=False)
+    return [(agent_dir / "workflows", sorted(workflow_items)),
+            (agent_dir / "skills", sorted(_skill_items(agent_dir / "skills")))]
+
+
+def _digest(sources: list) -> str:
+    listing = [[directory.name, name, list(signature)] for directory, items in sources
+               for name, signature, _ in items]
+    return hashlib.sha1(json.dumps(listing).encode('utf-8')).hexdigest()
+
+
+def build_fulltext(agent_dir: Path, sources: list, manifest: Manifest) -> ColumnStore:
+    """Compile the index from manifest entries, re-reading only changed files."""
+    rows, counts = [], []
+    for directory, items in sources:
+        entries = manifest.entries(directory, items, _document_entry)
+        for (name, _, path), entry in zip(items, entries):
+            if directory.name == "workflows":
+                kind, name = "workflow", "/" + name[:-3]
+            elif name.endswith("/SKILL.md"):
+                kind, name = "skill", name[:-len("/SKILL.md")]
+            else:
+                kind = "reference"
+            rows.append([kind, name, entry["title"], path.relative_to(agent_dir.parent).as_posix()])
+            counts.append(entry["counts"])
+
+    bm25 = BM25()
+    bm25.fit_counts(counts)
+    sections, nulls = pack_columns(COLUMNS, rows)
+    meta = {
+        "version": FULLTEXT_VERSION,
+        "digest": _digest(sources),
+        "header": COLUMNS,
+        "rows": len(rows),
+        "nulls": nulls,
+        "bm25": pack_bm25(bm25, sections),
+    }
+    return ColumnStore(pack(meta, sections))
+
+
+def load_fulltext(agent_dir: Path, cache_dir: Path) -> ColumnStore:
+    """The compiled full-text index, brought up to date with the markdown on disk."""
+    sources = _sources(agent_dir)
+    path = cache_dir / FULLTEXT_INDEX
+    try:
+        index = ColumnStore.open(path)
+    except (OSError, ValueError, KeyError):
+        index = None
+    if index and index.meta.get("version") == FULLTEXT_VERSION and index.meta.get("digest") == _digest(sources):
+        return index
+
+    manifest = Manifest(cache_dir / FULLTEXT_MANIFEST)
+    index = build_fulltext(agent_dir, sources, manifest)
+    write_index(path, index.buffer)
+    manifest.save()
+    return index
+
+
+class FullTextIndex:
+    """Ranked search with snippets over a compiled full-text index."""
+
+    def __init__(self, agent_dir: Path, cache_dir: Path):
+        self.root = agent_dir.parent
+        self.index = load_fulltext(agent_dir, cache_dir)
+        self.bm25 = load_bm25(self.index)
+
+    def search(self, query: str, max_results: int = 10) -> list:
+        """Ranked matches as dicts with kind, name, title, path, score and snippet."""
+        terms = {term for term, _ in self.bm25.query_terms(query)}
+        hits = self.bm25.top_k(query, max_results)
+        results = self.index.rows([idx for idx, _ in hits], COLUMNS)
+        for result, (_, score) in zip(results, hits):
+            result["score"] = round(score, 4)
+            result["snippet"] = snippet(_read(self.root / result["path"]), terms)
+        return results
@@ -1,5 +1,16 @@
 #!/usr/bin/env python3
-"""Fuzzy matching utilities for Antigravity-HTKit help system."""
+"""Fuzzy matching utilities for Antigravity-HTKit help system.
+
+fuzzy_match() compares one word against one target. FuzzyIndex answers
+the same question against a whole vocabulary at once: its words sit in a
+BK-tree (each child keyed by its edit distance to the parent), so by the
+triangle inequality a query only descends into children whose key lies
+within the threshold of its own distance to the node. Distances are
+computed in a band around the diagonal and stop as soon as they exceed
+what the search can use.
+"""
+
+from .bm25 import bounded_edit_distance
 
 
 def levenshtein_distance(s1: str, s2: str) -> int:
@@ -37,4 +48,68 @@ def fuzzy_match(word: str, target: str, threshold: int = 2) -> bool:
     if max_edits < 1:
         return word == target
 
-    return levenshtein_distance(word, target) <= max_edits
+    return bounded_edit_distance(word, target, max_edits) <= max_edits
+
+
+class BKTree:
+    """Burkhard-Keller tree over a vocabulary under Levenshtein distance."""
+
+    def __init__(self, words=()):
+        # Node: [word, {distance: child node}, largest child distance]
+        self.root = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        if self.root is None:
+            self.root = [word, {}, 0]
+            return
+        node = self.root
+        while True:
+            distance = levenshtein_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}, 0]
+                node[2] = max(node[2], distance)
+                return
+            node = child
+
+    def search(self, word: str, radius: int) -> list:
+        """(word, distance) for every vocabulary word within radius of word."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            term, children, widest = stack.pop()
+            # Past radius + widest neither this node nor any child can match
+            distance = bounded_edit_distance(word, term, radius + widest)
+            if distance <= radius:
+                found.append((term, distance))
+            for edge in range(max(1, distance - radius), min(widest, distance + radius) + 1):
+                child = children.get(edge)
+                if child is not None:
+                    stack.append(child)
+        return found
+
+
+class FuzzyIndex:
+    """A vocabulary answering fuzzy_match() for all of its words in one query."""
+
+    def __init__(self, words, threshold: int = 2):
+        self.words = set(words)
+        self.threshold = threshold
+        self.tree = BKTree(sorted(self.words))
+        self._matched = {}
+
+    def matches(self, word: str) -> set:
+        """Vocabulary words t for which fuzzy_match(word, t, threshold) holds."""
+        if word not in self._matched:
+            if len(word) < 3:
+                found = {word} & self.words
+            else:
+                found = {target for target, distance in self.tree.search(word, self.threshold)
+                         if abs(len(word) - len(target)) <= 1
+                         and distance <= min(self.threshold, len(target) // 3)}
+            self._matched[word] = found
+        return self._matched[word]
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """Category guides and intent data for Antigravity-HTKit help system."""
 
+import functools
 import re
-from .fuzzy import fuzzy_match
+from .fuzzy import FuzzyIndex
+from .intent import IntentScorer
 
 # Synonym mappings for normalization (term → canonical)
 SYNONYMS = {
@@ -125,14 +127,37 @@ CATEGORY_GUIDES = {
 }
 
 
+# Single-word task keywords; phrases are only ever matched literally
+FUZZY_KEYWORDS = {kw for keywords in TASK_MAPPINGS.values() for kw in keywords if ' ' not in kw}
+
+# Workflow names -> FuzzyIndex over them, the categories and FUZZY_KEYWORDS
+_VOCABULARY = {}
+
+
+def vocabulary_index(workflow_names: list = ()) -> FuzzyIndex:
+    """Fuzzy index over every category, workflow name and task keyword (built once per name set)."""
+    key = frozenset(w.lower() for w in workflow_names)
+    if key not in _VOCABULARY:
+        _VOCABULARY[key] = FuzzyIndex(key | {c.lower() for c in CATEGORY_GUIDES} | FUZZY_KEYWORDS)
+    return _VOCABULARY[key]
+
+
+@functools.lru_cache(maxsize=None)
+def task_scorer() -> IntentScorer:
+    """TASK_MAPPINGS compiled for recommend_task (built once per process)."""
+    return IntentScorer(TASK_MAPPINGS, vocabulary_index())
+
+
+# Every synonym in one alternation, longest first so "ci/cd" wins over "ci"
+SYNONYM_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(re.escape(synonym) for synonym in sorted(SYNONYMS, key=lambda x: -len(x))) + r')\b',
+    re.IGNORECASE,
+)
+
+
 def expand_synonyms(text: str) -> str:
     """Replace synonyms with canonical terms."""
-    result = text.lower()
-    sorted_synonyms = sorted(SYNONYMS.items(), key=lambda x: -len(x[0]))
-    for synonym, canonical in sorted_synonyms:
-        pattern = r'\b' + re.escape(synonym) + r'\b'
-        result = re.sub(pattern, canonical, result, flags=re.IGNORECASE)
-    return result
+    return SYNONYM_PATTERN.sub(lambda match: SYNONYMS[match.group(0).lower()], text.lower())
 
 
 def detect_intent(input_str: str, workflow_names: list) -> str:
@@ -155,16 +180,14 @@ def detect_intent(input_str: str, workflow_names: list) -> str:
     if input_lower in [c.lower() for c in CATEGORY_GUIDES.keys()]:
         return "category"
 
-    # Fuzzy match against categories
+    # One fuzzy lookup covers categories and task keywords alike
+    matches = vocabulary_index(workflow_names).matches(input_lower)
+
     all_categories = set(w.lower() for w in workflow_names) | set(c.lower() for c in CATEGORY_GUIDES.keys())
-    for cat in all_categories:
-        if fuzzy_match(input_lower, cat):
-            return "category"
-
-    # Fuzzy match against task keywords
-    for cat, keywords in TASK_MAPPINGS.items():
-        for kw in keywords:
-            if ' ' not in kw and fuzzy_match(input_lower, kw):
-                return "task"
+    if matches & all_categories:
+        return "category"
+
+    if matches & FUZZY_KEYWORDS:
+        return "task"
 
     return "search"
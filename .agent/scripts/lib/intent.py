@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Compiled task-intent scoring for Antigravity-HTKit help system.
+
+Every TASK_MAPPINGS keyword contributes to its category's score:
+
+    phrase (contains a space): 3.0 when it occurs anywhere in the task
+    single word:               a positional weight when it occurs as a whole
+                               word, or 0.8 of that weight when a task word
+                               fuzzy-matches it instead
+
+A word's weight is 2.0 for one-word tasks; otherwise 2.5 for an action verb
+in first position, 1.0 elsewhere after one, and 1.0 rising to 2.0 towards
+the end of the task when the task does not start with an action verb.
+
+IntentScorer inverts the keyword table once (keyword -> (category, slot)
+pairs), so a task is tokenized in a single pass and each of its words costs
+one dict lookup plus one fuzzy-index query. Contributions are summed in the
+table's keyword order, so scores are bit-for-bit those of scanning every
+keyword.
+"""
+
+import bisect
+import re
+
+ACTION_VERBS = {
+    "fix", "debug", "test", "create", "build", "implement", "deploy",
+    "plan", "design", "review", "check", "verify", "find", "search",
+}
+
+FUZZY_PENALTY = 0.8
+
+_WORD = re.compile(r'\w+')
+
+
+class IntentScorer:
+    """TASK_MAPPINGS compiled for scoring task descriptions."""
+
+    def __init__(self, task_mappings: dict, fuzzy_index):
+        self.categories = list(task_mappings)
+        self.fuzzy = fuzzy_index
+
+        self.words = {}    # single-word keyword -> [(category, slot)]
+        self.phrases = []  # (category, slot, phrase)
+        for cat, keywords in task_mappings.items():
+            for slot, kw in enumerate(keywords):
+                if ' ' in kw:
+                    self.phrases.append((cat, slot, kw))
+                else:
+                    self.words.setdefault(kw, []).append((cat, slot))
+
+        # Keywords that are not one \w+ run cannot be found by tokenizing
+        self.patterns = [(re.compile(r'\b' + re.escape(kw) + r'\b'), kw)
+                         for kw in self.words if not _WORD.fullmatch(kw)]
+
+    @staticmethod
+    def weights(words: list) -> list:
+        """Positional weight of every word of a task."""
+        first_word_is_action = words[0] in ACTION_VERBS if words else False
+        if len(words) == 1:
+            return [2.0]
+        weights = []
+        for pos in range(len(words)):
+            if first_word_is_action and pos == 0:
+                weights.append(2.5)
+            elif first_word_is_action:
+                weights.append(1.0)
+            else:
+                weights.append(1.0 + (pos / (len(words) - 1)))
+        return weights
+
+    def score(self, task: str) -> dict:
+        """Category -> score for every category with a keyword hit, in table order."""
+        words = task.split()
+        weights = self.weights(words)
+
+        # Word i is assumed to start where single-space joining would put it
+        starts = []
+        offset = 0
+        for word in words:
+            starts.append(offset)
+            offset += len(word) + 1
+
+        def word_at(char_pos: int) -> int:
+            i = bisect.bisect_right(starts, char_pos) - 1
+            return i if i >= 0 and char_pos < starts[i] + len(words[i]) else -1
+
+        # First occurrence of each whole-word keyword
+        found = {}
+        for run in _WORD.finditer(task):
+            kw = run.group()
+            if kw in self.words and kw not in found:
+                found[kw] = run.start()
+        for pattern, kw in self.patterns:
+            match = pattern.search(task)
+            if match:
+                found[kw] = match.start()
+
+        hits = {cat: {} for cat in self.categories}
+        for kw, char_pos in found.items():
+            pos = word_at(char_pos)
+            if pos >= 0:
+                for cat, slot in self.words[kw]:
+                    hits[cat][slot] = weights[pos]
+
+        # Keywords absent as whole words score at the first word fuzzy-matching them
+        for pos, word in enumerate(words):
+            for kw in self.fuzzy.matches(word):
+                if kw in self.words and kw not in found:
+                    found[kw] = None
+                    for cat, slot in self.words[kw]:
+                        hits[cat][slot] = weights[pos] * FUZZY_PENALTY
+
+        for cat, slot, phrase in self.phrases:
+            if phrase in task:
+                hits[cat][slot] = 3.0
+
+        scores = {}
+        for cat in self.categories:
+            score = 0.0
+            for slot in sorted(hits[cat]):
+                score += hits[cat][slot]
+            if score > 0:
+                scores[cat] = score
+        return scores
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Single-pass keyword matching for skill domain detection.
+
+Every keyword of every domain is compiled once into an Aho-Corasick
+automaton, so scoring a query walks its characters once no matter how many
+keywords the tables hold. A domain's score is the number of its keywords
+occurring anywhere in the lowercased query (overlapping matches included),
+which is exactly what the per-keyword substring tests it replaces counted.
+"""
+
+from collections import deque
+
+# A runner-up domain scoring at least this fraction of the best one makes
+# the query ambiguous, so it is searched as well
+AMBIGUOUS_RATIO = 0.5
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping keyword hits to per-domain scores."""
+
+    def __init__(self, domain_keywords: dict, default: str):
+        self.domains = list(domain_keywords)
+        self.default = default
+
+        # Keyword -> domain positions, with repeats counted as in the tables
+        owners = {}
+        for pos, keywords in enumerate(domain_keywords.values()):
+            for keyword in keywords:
+                owners.setdefault(keyword.lower(), []).append(pos)
+        self.keywords = list(owners)
+        self.owners = [owners[kw] for kw in self.keywords]
+
+        # Trie: goto[node] = {char: node}; out[node] = keyword ids ending here
+        self.goto = [{}]
+        self.out = [[]]
+        for kw_id, keyword in enumerate(self.keywords):
+            node = 0
+            for char in keyword:
+                nxt = self.goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][char] = nxt
+                    self.goto.append({})
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(kw_id)
+
+        # Failure links (breadth first); outputs inherit their suffix's outputs
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self.goto[node].items():
+                queue.append(nxt)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[nxt] = self.goto[state].get(char, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def matches(self, text: str) -> set:
+        """Ids of the keywords occurring in text."""
+        found = set()
+        node = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def scores(self, text: str) -> dict:
+        """Number of each domain's keywords present in text, in table order."""
+        counts = [0] * len(self.domains)
+        for kw_id in self.matches(text):
+            for pos in self.owners[kw_id]:
+                counts[pos] += 1
+        return dict(zip(self.domains, counts))
+
+    def rank(self, text: str) -> list:
+        """(domain, confidence) for every matching domain, best first.
+
+        Confidence is the domain's share of all keyword hits; ties keep the
+        keyword table order.
+        """
+        scores = self.scores(text)
+        total = sum(scores.values())
+        ranked = sorted((d for d in self.domains if scores[d]), key=lambda d: -scores[d])
+        return [(domain, scores[domain] / total) for domain in ranked]
+
+    def detect(self, text: str) -> str:
+        """Best matching domain, or the default when no keyword matches."""
+        ranked = self.rank(text)
+        return ranked[0][0] if ranked else self.default
+
+    def route(self, text: str, max_domains: int = 2) -> list:
+        """Domains to search for text as (domain, confidence) pairs.
+
+        The best domain comes first; runner-ups scoring at least
+        AMBIGUOUS_RATIO of it follow, up to max_domains. With no keyword
+        hit the default domain is returned with confidence 0.
+        """
+        ranked = self.rank(text)
+        if not ranked:
+            return [(self.default, 0.0)]
+        best = ranked[0][1]
+        return [ranked[0]] + [(domain, confidence) for domain, confidence in ranked[1:max_domains]
+                              if confidence >= best * AMBIGUOUS_RATIO]
+
+    def route_search(self, search_domain, query: str, domain: str = None, max_results: int = 3) -> dict:
+        """search_domain(query, domain, max_results), routed when domain is None.
+
+        A routed query is searched in its best domain and the result gains
+        that route's "confidence"; an ambiguous runner-up domain's result is
+        nested under "related". Error results are returned as they are.
+        """
+        if domain is not None:
+            return search_domain(query, domain, max_results)
+        routes = self.route(query)
+        result = search_domain(query, routes[0][0], max_results)
+        if "error" not in result:
+            result["confidence"] = round(routes[0][1], 2)
+            if len(routes) > 1:
+                result["related"] = search_domain(query, routes[1][0], max_results)
+        return result
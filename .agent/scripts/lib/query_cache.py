@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Persistent cross-process cache of skill search results.
+
+Results of search()-style calls are stored in SQLite at
+<data_dir>/.index/query-cache.sqlite, keyed by the function, its
+normalized query and remaining arguments, a hash of the core's CSV_CONFIG
+and a hash of every CSV in the data directory. Editing any CSV or the
+config changes the key, so stale entries are never served; they simply
+age out. The cache is evicted least recently used first once it grows
+past MAX_CACHE_BYTES.
+
+A process hashes the CSVs once and reuses that hash until the mtime of
+the data directory (or a subdirectory) changes, i.e. a CSV is added,
+removed or replaced; an in-place edit is seen by the next process.
+
+Set HT_SEARCH_CACHE=0 to disable it.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from .csv_index import INDEX_DIRNAME, file_hash
+
+CACHE_FILENAME = "query-cache.sqlite"
+MAX_CACHE_BYTES = 4 * 1024 * 1024
+# Part of every key; bump when the shape of search results changes
+RESULT_VERSION = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY, value TEXT, size INTEGER, last_used REAL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def enabled() -> bool:
+    """Whether caching is on (HT_SEARCH_CACHE=0 turns it off)."""
+    return os.environ.get("HT_SEARCH_CACHE", "1") != "0"
+
+
+def normalize_query(query) -> str:
+    """Case- and padding-insensitive form of a query (search lowercases anyway)."""
+    return str(query).strip().lower()
+
+
+class QueryCache:
+    """LRU result cache for one skill data directory."""
+
+    def __init__(self, data_dir: Path, max_bytes: int = MAX_CACHE_BYTES):
+        self.data_dir = Path(data_dir)
+        self.max_bytes = max_bytes
+        path = self.data_dir / INDEX_DIRNAME / CACHE_FILENAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path), timeout=1.0, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+        self._stamp = None
+        self._hash = None
+
+    def _dir_stamp(self) -> tuple:
+        """mtime of the data directory and each subdirectory, compiled indexes excluded."""
+        stamp = []
+        for root, dirs, _ in os.walk(self.data_dir):
+            dirs[:] = sorted(d for d in dirs if d != INDEX_DIRNAME)
+            stamp.append((root, os.stat(root).st_mtime_ns))
+        return tuple(stamp)
+
+    def data_hash(self) -> str:
+        """Hash over every CSV's content, memoized until the directory mtime changes."""
+        stamp = self._dir_stamp()
+        if stamp != self._stamp:
+            self._hash = self._hash_files()
+            self._stamp = stamp
+        return self._hash
+
+    def _hash_files(self) -> str:
+        """Hash over every CSV's content, rehashing only files whose stat changed."""
+        known = {path: (mtime_ns, size, sha) for path, mtime_ns, size, sha
+                 in self.db.execute("SELECT path, mtime_ns, size, sha256 FROM files")}
+        digest = hashlib.sha256()
+        for filepath in sorted(self.data_dir.rglob("*.csv")):
+            rel = filepath.relative_to(self.data_dir).as_posix()
+            stat = filepath.stat()
+            entry = known.get(rel)
+            if entry and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                sha = entry[2]
+            else:
+                sha = file_hash(filepath)
+                self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                (rel, stat.st_mtime_ns, stat.st_size, sha))
+            digest.update(f"{rel}:{sha}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Cached value for key, or None; a hit refreshes its LRU position."""
+        row = self.db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value) -> None:
+        """Store value and evict least recently used entries past max_bytes."""
+        payload = json.dumps(value, ensure_ascii=False)
+        self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                        (key, payload, len(payload), time.time()))
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for old_key, size in self.db.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if total <= self.max_bytes or old_key == key:
+                break
+            stale.append((old_key,))
+            total -= size
+        self.db.executemany("DELETE FROM results WHERE key = ?", stale)
+
+
+_CACHES = {}
+
+
+def get_cache(data_dir: Path):
+    """This process's cache for a data directory, or None when it cannot be opened."""
+    key = str(data_dir)
+    if key not in _CACHES:
+        try:
+            _CACHES[key] = QueryCache(data_dir)
+        except (OSError, sqlite3.Error):
+            _CACHES[key] = None
+    return _CACHES[key]
+
+
+def _with_query(result, query):
+    """Put the caller's query text back into a cached result."""
+    if isinstance(result, dict):
+        if "query" in result:
+            result["query"] = query
+        for value in result.values():
+            if isinstance(value, dict) and "query" in value:
+                value["query"] = query
+    return result
+
+
+def config_hash(config) -> str:
+    """Hash of a core's CSV config (files, search and output columns)."""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cached(data_dir: Path, func, config=None):
+    """Wrap a search function taking a query first so results persist across processes.
+
+    config is the CSV config func searches with; changing it invalidates the cache.
+    """
+    config_key = config_hash(config)
+
+    @functools.wraps(func)
+    def wrapper(query, *args, **kwargs):
+        cache = get_cache(data_dir) if enabled() else None
+        if cache is None:
+            return func(query, *args, **kwargs)
+        try:
+            key = json.dumps([RESULT_VERSION, func.__name__, config_key, cache.data_hash(),
+                              normalize_query(query), args, sorted(kwargs.items())])
+            hit = cache.get(key)
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            return func(query, *args, **kwargs)
+        if hit is not None:
+            return _with_query(hit, query)
+
+        result = func(query, *args, **kwargs)
+        try:
+            cache.put(key, result)
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
+        return result
+    return wrapper
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Indexed category lookup for skill reasoning rules.
+
+Reasoning CSVs (ui-reasoning.csv, creative-reasoning.csv) map a category
+to design rules. A category is resolved in three stages, each taking the
+first rule in file order that matches:
+
+    1. exact:   the rule's category equals the category
+    2. partial: either one contains the other
+    3. keyword: a word of the rule's category (split on space, "/", "-")
+                occurs inside the category
+
+All lowercasing and splitting happens once when the rules are loaded: an
+exact-match dict answers stage 1, and stage 3 walks a keyword -> first
+rule map instead of every rule's keywords. Resolved categories are
+memoized, so repeated lookups are a single dict hit.
+"""
+
+import csv
+from pathlib import Path
+
+# In-process cache: (path, key col) -> ((mtime_ns, size), RuleIndex)
+_LOADED = {}
+
+
+class RuleIndex:
+    """Reasoning rules indexed by their lowercased category column."""
+
+    def __init__(self, rules: list, key_col: str):
+        self.rules = rules
+        self.categories = [(rule.get(key_col) or "").lower() for rule in rules]
+
+        self.exact = {}
+        self.keywords = {}
+        for pos, category in enumerate(self.categories):
+            self.exact.setdefault(category, pos)
+            for keyword in category.replace("/", " ").replace("-", " ").split():
+                self.keywords.setdefault(keyword, pos)
+        self._resolved = {}
+
+    def _position(self, category: str):
+        pos = self.exact.get(category)
+        if pos is not None:
+            return pos
+
+        for pos, rule_category in enumerate(self.categories):
+            if rule_category in category or category in rule_category:
+                return pos
+
+        return min((pos for keyword, pos in self.keywords.items() if keyword in category), default=None)
+
+    def find(self, category: str) -> dict:
+        """The rule matching category, or {} when none does."""
+        category = category.lower()
+        if category not in self._resolved:
+            self._resolved[category] = self._position(category)
+        pos = self._resolved[category]
+        return self.rules[pos] if pos is not None else {}
+
+
+def load_rule_index(filepath: Path, key_col: str) -> RuleIndex:
+    """RuleIndex of a reasoning CSV, parsed once per process while the file is unchanged."""
+    if not filepath.exists():
+        return RuleIndex([], key_col)
+    stat = filepath.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = (str(filepath), key_col)
+    cached = _LOADED.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        index = RuleIndex(list(csv.DictReader(f)), key_col)
+    _LOADED[key] = (signature, index)
+    return index
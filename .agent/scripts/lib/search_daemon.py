@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Long-lived search daemon for skill CSV knowledge bases.
+
+The daemon imports every skill search core once, warms all of their
+compiled indexes, and answers queries over a Unix domain socket using
+newline-delimited JSON:
+
+    request:  {"skill": "ui-ux", "func": "search", "args": [...], "kwargs": {...}}
+              {"op": "ping"} | {"op": "shutdown"}
+    response: {"ok": true, "result": ...} | {"ok": false, "error": "..."}
+
+Skill CLIs wrap their core functions with routed(); a wrapped call is sent
+to the daemon when it is running and runs in-process otherwise.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .skill_cores import SKILL_CORES, core_corpora, load_core
+
+AGENT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+CONNECT_TIMEOUT = 0.05
+REQUEST_TIMEOUT = 10.0
+
+
+def socket_path() -> Path:
+    """Socket location (override with HT_SEARCH_SOCKET).
+
+    Sockets live in a directory only this user can enter: $XDG_RUNTIME_DIR,
+    else ht-search-<uid> (mode 0700) in the temp dir. One socket per
+    install: the name carries a hash of AGENT_ROOT, so a project-local and
+    a global install never answer each other's queries.
+    """
+    env_path = os.environ.get("HT_SEARCH_SOCKET")
+    if env_path:
+        return Path(env_path)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        directory = Path(runtime_dir)
+    else:
+        uid = os.getuid() if hasattr(os, "getuid") else "user"
+        directory = Path(tempfile.gettempdir()) / f"ht-search-{uid}"
+    root = hashlib.sha256(str(AGENT_ROOT).encode("utf-8")).hexdigest()[:12]
+    return directory / f"ht-search-{root}.sock"
+
+
+def _owned(path: Path, kind) -> bool:
+    """Whether path is a kind (stat.S_ISSOCK, ...) owned by this user, symlinks not followed."""
+    try:
+        info = path.lstat()
+    except OSError:
+        return False
+    return kind(info.st_mode) and (not hasattr(os, "getuid") or info.st_uid == os.getuid())
+
+
+def _private_dir(directory: Path) -> None:
+    """Create the socket directory (0700) or check an existing one is this user's alone."""
+    try:
+        directory.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        pass
+    if not _owned(directory, stat.S_ISDIR):
+        raise RuntimeError(f"Socket directory {directory} is not a directory owned by this user")
+    if directory.lstat().st_mode & 0o022:
+        raise RuntimeError(f"Socket directory {directory} is writable by other users")
+
+
+# ============ CLIENT ============
+def _request(message: dict, timeout: float = REQUEST_TIMEOUT):
+    """Send one request to the daemon; return the decoded response or None.
+
+    Only a socket owned by this user is trusted, so another local user
+    cannot answer searches by planting one at the expected path.
+    """
+    path = socket_path()
+    if not hasattr(socket, "AF_UNIX") or not _owned(path, stat.S_ISSOCK):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(message).encode('utf-8') + b"\n")
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def call(skill: str, func: str, *args, **kwargs):
+    """Run a core function in the daemon; None when it is not running or fails."""
+    response = _request({"skill": skill, "func": func, "args": args, "kwargs": kwargs})
+    if response and response.get("ok"):
+        return response.get("result")
+    return None
+
+
+def routed(skill: str, func):
+    """Wrap a core search function so calls go to the daemon when it is running."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = call(skill, func.__name__, *args, **kwargs)
+        return func(*args, **kwargs) if result is None else result
+    return wrapper
+
+
+def ping():
+    """Daemon status dict, or None when it is not running."""
+    response = _request({"op": "ping"}, timeout=1.0)
+    return response.get("result") if response and response.get("ok") else None
+
+
+def shutdown() -> bool:
+    """Ask a running daemon to exit."""
+    response = _request({"op": "shutdown"}, timeout=1.0)
+    return bool(response and response.get("ok"))
+
+
+# ============ SERVER ============
+def _warm(module) -> int:
+    """Load every compiled index a core searches; returns the number of corpora."""
+    corpora = core_corpora(module)
+    for path, search_cols, output_cols in corpora:
+        module._search_csv(path, search_cols, output_cols, "", 0)
+    return len(corpora)
+
+
+class SearchDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server holding every skill core and its warm indexes."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, skills: list = None):
+        self.started = time.time()
+        self.cores = {}
+        self.corpora = 0
+        for skill in skills or list(SKILL_CORES):
+            module = load_core(skill)
+            funcs = SKILL_CORES[skill][1]
+            self.corpora += _warm(module)
+            self.cores[skill] = {name: getattr(module, name) for name in funcs}
+        old_umask = os.umask(0o177)  # socket readable by this user only
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(path, 0o600)
+
+    def handle_message(self, message: dict) -> dict:
+        """Dispatch one decoded request."""
+        op = message.get("op")
+        if op == "ping":
+            return {"ok": True, "result": {
+                "pid": os.getpid(),
+                "uptime": round(time.time() - self.started, 1),
+                "skills": sorted(self.cores),
+                "corpora": self.corpora,
+            }}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True, "result": None}
+
+        func = self.cores.get(message.get("skill"), {}).get(message.get("func"))
+        if func is None:
+            return {"ok": False, "error": f"Unknown function: {message.get('skill')}.{message.get('func')}"}
+        try:
+            return {"ok": True, "result": func(*message.get("args", []), **message.get("kwargs", {}))}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON requests on one connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError("request is not a JSON object")
+            except ValueError as e:
+                response = {"ok": False, "error": f"Invalid request: {e}"}
+            else:
+                response = self.server.handle_message(message)
+            try:
+                data = json.dumps(response, ensure_ascii=False)
+            except (TypeError, ValueError) as e:
+                data = json.dumps({"ok": False, "error": f"Unserializable result: {e}"})
+            try:
+                self.wfile.write(data.encode('utf-8') + b"\n")
+                self.wfile.flush()
+            except OSError:
+                return  # client hung up
+
+
+def serve(skills: list = None) -> None:
+    """Run the daemon in the foreground until shutdown()."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Unix domain sockets are not supported on this platform")
+    path = socket_path()
+    if "HT_SEARCH_SOCKET" not in os.environ:
+        _private_dir(path.parent)
+    if path.exists() or path.is_symlink():
+        if ping() is not None:
+            raise RuntimeError(f"Search daemon already running at {path}")
+        path.unlink()  # stale socket from a crashed daemon
+
+    server = SearchDaemon(path, skills)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Registry of skill search cores and helpers shared by the search tools.
+
+The daemon, the index compiler and the benchmark all import skill cores
+by path and walk the CSVs they search; they do it through load_core()
+and core_corpora() so every tool sees the same corpora with the same
+tokenizer settings.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SKILLS_DIR = Path(__file__).resolve().parent.parent.parent / "skills"
+
+# skill -> (core module path relative to skills/, callable functions)
+SKILL_CORES = {
+    "ui-ux": ("ui-ux/scripts/core.py", ["search", "search_many", "search_stack"]),
+    "threejs": ("threejs/scripts/core.py", [
+        "search", "search_many", "search_by_complexity", "search_by_category",
+        "get_recommended_examples", "search_examples", "complete_examples"]),
+    "design-system": ("design-system/scripts/slide_search_core.py", [
+        "search", "search_many", "search_all", "search_with_context", "plan_deck", "get_layout_for_goal",
+        "get_typography_for_slide", "get_color_for_emotion", "get_background_config"]),
+    "logo-design": ("logo-design/scripts/core.py", ["search", "search_many", "search_all"]),
+    "creativity": ("creativity/scripts/core.py", ["search", "search_many"]),
+    "ai-artist": ("ai-artist/scripts/core.py", ["search", "search_many", "search_all_domains"]),
+}
+
+# Tokenizer minimum for cores that do not set MIN_TOKEN_LEN
+DEFAULT_MIN_TOKEN_LEN = 3
+
+
+def load_core(skill: str, data_dir: str = None):
+    """Import a skill core under a unique module name, optionally pointed at another data directory."""
+    rel_path, _ = SKILL_CORES[skill]
+    core_path = SKILLS_DIR / rel_path
+    if str(core_path.parent) not in sys.path:
+        sys.path.insert(0, str(core_path.parent))
+    spec = importlib.util.spec_from_file_location("ht_search_" + skill.replace("-", "_"), core_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if data_dir:
+        module.DATA_DIR = Path(data_dir)
+    return module
+
+
+def min_token_len(module) -> int:
+    """Shortest token a core indexes and queries."""
+    return getattr(module, "MIN_TOKEN_LEN", DEFAULT_MIN_TOKEN_LEN)
+
+
+def core_corpora(module) -> list:
+    """(csv path, search cols, output cols) of every existing CSV a core searches."""
+    corpora = [(module.DATA_DIR / c["file"], c["search_cols"], c["output_cols"])
+               for c in module.CSV_CONFIG.values()]
+    stack_cols = getattr(module, "_STACK_COLS", None)
+    for config in getattr(module, "STACK_CONFIG", {}).values():
+        corpora.append((module.DATA_DIR / config["file"], stack_cols["search_cols"], stack_cols["output_cols"]))
+    return [corpus for corpus in corpora if corpus[0].exists()]
@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 """
 Scan .agent/skills directory and extract skill metadata.
+
+Parsed metadata is cached per SKILL.md in .agent/.cache/scan_skills.json,
+keyed by a hash of the file's content, so a rescan only parses the skills
+that changed. Large batches of changed skills are parsed across a process
+pool on multi-core machines. skills_data.yaml is rewritten (atomically) only
+when its content changes, and not even rendered when neither the scanned
+metadata nor the file changed since the last run.
 """
 
+import hashlib
+import json
+import os
 import re
 from pathlib import Path
 from typing import Dict, List
@@ -12,6 +22,14 @@ try:
 except ImportError:
     HAS_YAML = False
 
+# Next to this install's .agent/, whatever directory the scan runs from
+CACHE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'scan_skills.json'
+CACHE_VERSION = 1
+
+# Fewer changed skills than this are parsed in-process: at well under a
+# millisecond per skill, a pool costs more to start than it saves
+PARALLEL_MIN = 100
+
 def extract_frontmatter(content: str) -> Dict:
     """Extract YAML frontmatter from markdown content."""
     match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
@@ -47,9 +65,111 @@ def extract_first_paragraph(content: str) -> str:
 
     return ' '.join(paragraph)[:200]
 
-def scan_skills(base_path: Path) -> List[Dict]:
-    """Scan all skill files and extract metadata."""
-    skills = []
+def parse_skill(skill_name: str, content: str) -> Dict:
+    """Description and category of one SKILL.md (runs in pool workers)."""
+    frontmatter = extract_frontmatter(content)
+
+    description = frontmatter.get('description', '')
+    if not description:
+        description = extract_first_paragraph(content)
+
+    # Categorize based on content/name
+    category = categorize_skill(skill_name, description, content)
+    return {'description': description, 'category': category}
+
+def parse_batch(pending: List[tuple]) -> List:
+    """parse_skill() result, or the exception it raised, for each (name, content) pair."""
+    results = []
+    for name, content in pending:
+        try:
+            results.append(parse_skill(name, content))
+        except Exception as e:
+            results.append(e)
+    return results
+
+def parse_skills(pending: List[tuple]) -> List:
+    """parse_batch() over all pairs, split across worker processes when worthwhile."""
+    workers = os.cpu_count() or 1
+    if workers > 1 and len(pending) >= PARALLEL_MIN:
+        # Imported here: multiprocessing is the slowest import of a warm run
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        size = -(-len(pending) // workers)
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        try:
+            with ProcessPoolExecutor(workers) as pool:
+                return [result for batch in pool.map(parse_batch, chunks) for result in batch]
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass  # no usable process pool here: parse in-process
+    return parse_batch(pending)
+
+def load_cache(cache_path: Path) -> Dict:
+    """Scan cache: {'files': {skill file: {'sha256', 'parsed'}}, 'outputs': {path: digests}}."""
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        data = {}
+    if data.get('version') != CACHE_VERSION:
+        data = {}
+    return {'version': CACHE_VERSION, 'files': data.get('files', {}), 'outputs': data.get('outputs', {})}
+
+def save_cache(cache_path: Path, cache: Dict) -> None:
+    """Persist the scan cache; read-only checkouts and unserializable frontmatter skip caching."""
+    try:
+        write_if_changed(cache_path, json.dumps(cache, ensure_ascii=False))
+    except (OSError, TypeError, ValueError):
+        pass
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Atomically replace path with text unless it already holds exactly that."""
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding='utf-8')
+    os.replace(tmp_path, path)
+    return True
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents, or '' when it cannot be read."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ''
+
+def render_yaml(data) -> str:
+    """Catalog text as YAML."""
+    return yaml.dump(data, allow_unicode=True, default_flow_style=False)
+
+def render_json(data) -> str:
+    """Catalog text as JSON (when PyYAML is not installed)."""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+def write_catalog(output_path: Path, skills: List[Dict], render, cache: Dict) -> bool:
+    """Write render(skills) to output_path if it changed; True when the file was rewritten.
+
+    Rendering is skipped when the skills are those of the last run and the
+    file still holds what that run wrote.
+    """
+    skills_digest = hashlib.sha256(json.dumps(skills, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    last = cache['outputs'].get(str(output_path), {})
+    if last.get('skills') == skills_digest and last.get('sha256') == file_digest(output_path):
+        return False
+
+    changed = write_if_changed(output_path, render(skills))
+    cache['outputs'][str(output_path)] = {'skills': skills_digest, 'sha256': file_digest(output_path)}
+    return changed
+
+def scan_skills(base_path: Path, cache: Dict = None) -> List[Dict]:
+    """Scan all skill files and extract metadata, reparsing only skills changed since cache."""
+    cached = cache['files'] if cache else {}
+    files = {}
+    found = []    # (skill_file, skill_name, cache key)
+    pending = []  # (cache key, skill_name, content) still to parse
 
     for skill_file in sorted(base_path.rglob('SKILL.md')):
         # Get skill directory name
@@ -66,27 +186,44 @@ def scan_skills(base_path: Path) -> List[Dict]:
             skill_name = f"{parent_name}/{skill_name}"
 
         try:
-            content = skill_file.read_text()
-            frontmatter = extract_frontmatter(content)
-
-            description = frontmatter.get('description', '')
-            if not description:
-                description = extract_first_paragraph(content)
-
-            # Categorize based on content/name
-            category = categorize_skill(skill_name, description, content)
-
-            skills.append({
-                'name': skill_name,
-                'path': str(skill_file.relative_to(Path('.agent/skills'))),
-                'description': description,
-                'category': category,
-                'has_scripts': (skill_dir / 'scripts').exists(),
-                'has_references': (skill_dir / 'references').exists()
-            })
-        except Exception as e:
+            raw = skill_file.read_bytes()
+            content = raw.decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
             print(f"Error processing {skill_file}: {e}")
+            continue
+
+        key = skill_file.as_posix()
+        digest = hashlib.sha256(raw).hexdigest()
+        hit = cached.get(key)
+        if hit and hit.get('sha256') == digest:
+            files[key] = hit
+        else:
+            files[key] = {'sha256': digest}
+            pending.append((key, skill_name, content))
+        found.append((skill_file, skill_name, key))
 
+    for (key, _, _), parsed in zip(pending, parse_skills([(name, content) for _, name, content in pending])):
+        files[key]['parsed'] = parsed
+
+    skills = []
+    for skill_file, skill_name, key in found:
+        parsed = files[key]['parsed']
+        if isinstance(parsed, Exception):
+            print(f"Error processing {skill_file}: {parsed}")
+            del files[key]
+            continue
+        skill_dir = skill_file.parent
+        skills.append({
+            'name': skill_name,
+            'path': str(skill_file.relative_to(Path('.agent/skills'))),
+            'description': parsed['description'],
+            'category': parsed['category'],
+            'has_scripts': (skill_dir / 'scripts').exists(),
+            'has_references': (skill_dir / 'references').exists()
+        })
+
+    if cache is not None:
+        cache['files'] = files
     return skills
 
 def categorize_skill(name: str, description: str, content: str) -> str:
@@ -154,7 +291,8 @@ def main():
         return
 
     print("Scanning skills...")
-    skills = scan_skills(base_path)
+    cache = load_cache(CACHE_PATH)
+    skills = scan_skills(base_path, cache)
 
     print(f"\nFound {len(skills)} skills\n")
 
@@ -183,13 +321,16 @@ def main():
 
     # Output YAML for processing (generate_catalogs.py reads YAML)
     output_path = Path('.agent/scripts/skills_data.yaml')
-    if HAS_YAML:
-        output_path.write_text(yaml.dump(skills, allow_unicode=True, default_flow_style=False))
-    else:
-        import json
+    render = render_yaml
+    if not HAS_YAML:
         output_path = Path('.agent/scripts/skills_data.json')
-        output_path.write_text(json.dumps(skills, ensure_ascii=False, indent=2))
-    print(f"\n✓ Saved metadata to {output_path}")
+        render = render_json
+    changed = write_catalog(output_path, skills, render, cache)
+    save_cache(CACHE_PATH, cache)
+    if changed:
+        print(f"\n✓ Saved metadata to {output_path}")
+    else:
+        print(f"\n✓ Metadata unchanged: {output_path}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Skill Search Benchmark — measures every skill search core on a fixed query set.
+
+For each skill (ui-ux, threejs, design-system, logo-design, creativity,
+ai-artist) it reports cold-start time, index build time, p50/p95/p99 query
+latency, peak RSS and top-k result stability. Every skill runs in its own
+subprocess, so timings and memory are not shared between skills.
+
+Queries come from search_benchmark_queries.json (versioned). Save a result
+baseline before a change and compare against it afterwards to prove that
+rankings did not move:
+
+Usage:
+    python3 search-benchmark.py                           # All skills, real corpora
+    python3 search-benchmark.py --skills ui-ux threejs    # Selected skills
+    python3 search-benchmark.py --scale 10                # Corpora with 10x rows
+    python3 search-benchmark.py --save-baseline base.json # Record top-k results
+    python3 search-benchmark.py --baseline base.json      # Compare top-k results
+    python3 search-benchmark.py --json                    # Machine-readable output
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.csv_index import build_index
+from lib.skill_cores import SKILL_CORES, SKILLS_DIR, core_corpora, load_core, min_token_len
+
+QUERY_SET = Path(__file__).parent / "search_benchmark_queries.json"
+
+
+def load_query_set(path: Path = QUERY_SET) -> dict:
+    """Load the versioned benchmark query set."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def fingerprint(result) -> list:
+    """Stable per-row hashes of a search result, in rank order."""
+    if isinstance(result, dict) and "results" in result:
+        rows = result["results"]
+    elif isinstance(result, dict):
+        rows = [row for value in result.values() if isinstance(value, dict)
+                for row in value.get("results", [])]
+    else:
+        rows = result if isinstance(result, list) else [result]
+    return [hashlib.sha1(json.dumps(row, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+            for row in rows]
+
+
+# ============ CORPUS SCALING ============
+def scale_corpus(data_dir: Path, target: Path, factor: int) -> Path:
+    """Copy a skill data directory with every CSV's rows repeated factor times."""
+    for src in data_dir.rglob("*.csv"):
+        dst = target / src.relative_to(data_dir)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        with open(src, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        with open(dst, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(rows[0] if rows else [])
+            for _ in range(factor):
+                writer.writerows(rows[1:])
+    for src in data_dir.iterdir():
+        if src.is_file() and src.suffix != ".csv":
+            shutil.copy2(src, target / src.name)
+    return target
+
+
+# ============ WORKER (runs in a subprocess per skill) ============
+def _peak_rss_kb():
+    """Peak resident set size of this process in KB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_cold(skill: str, data_dir: str, queries: list) -> None:
+    """Import the core and answer the first query, as a fresh CLI call would."""
+    module = load_core(skill, data_dir)
+    func, *args = queries[0]
+    getattr(module, func)(*args)
+
+
+def run_worker(skill: str, data_dir: str, queries: list, repeat: int) -> dict:
+    """Measure one skill in this process; returns its report."""
+    module = load_core(skill, data_dir)
+    min_len = min_token_len(module)
+
+    build_ms = 0.0
+    rows = 0
+    for path, search_cols, _ in core_corpora(module):
+        start = time.perf_counter()
+        index = build_index(path, search_cols, min_len)
+        build_ms += (time.perf_counter() - start) * 1000
+        rows += index.n_rows
+
+    # First pass loads indexes and records results; timed passes follow
+    results = []
+    for func, *args in queries:
+        results.append(fingerprint(getattr(module, func)(*args)))
+
+    latencies = []
+    unstable = 0
+    for _ in range(repeat):
+        for (func, *args), expected in zip(queries, results):
+            start = time.perf_counter()
+            result = getattr(module, func)(*args)
+            latencies.append((time.perf_counter() - start) * 1000)
+            unstable += fingerprint(result) != expected
+
+    return {
+        "skill": skill,
+        "rows": rows,
+        "index_build_ms": round(build_ms, 2),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "peak_rss_kb": _peak_rss_kb(),
+        "unstable_repeats": unstable,
+        "results": results,
+    }
+
+
+# ============ DRIVER ============
+def _run_subprocess(args: list) -> tuple:
+    """Run this script with args; returns (wall seconds, stdout)."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, __file__] + args, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"benchmark worker failed: {args}")
+    return elapsed, proc.stdout
+
+
+def benchmark_skill(skill: str, queries: list, repeat: int, data_dir: Path = None) -> dict:
+    """Benchmark one skill in fresh subprocesses."""
+    common = ["--skills", skill, "--queries", json.dumps(queries)]
+    if data_dir:
+        common += ["--data-dir", str(data_dir)]
+    _, output = _run_subprocess(["--worker", "--repeat", str(repeat)] + common)
+    report = json.loads(output)
+    # Indexes are on disk now, so this is a typical first CLI query
+    cold, _ = _run_subprocess(["--cold"] + common)
+    report["cold_start_ms"] = round(cold * 1000, 1)
+    return report
+
+
+def compare(reports: list, baseline: dict, k: int = 3) -> None:
+    """Annotate reports with top-k agreement against a saved baseline."""
+    for report in reports:
+        expected = baseline.get("skills", {}).get(report["skill"])
+        if not expected:
+            continue
+        same = overlap = 0
+        for got, want in zip(report["results"], expected):
+            same += got == want
+            top_got, top_want = set(got[:k]), set(want[:k])
+            union = top_got | top_want
+            overlap += len(top_got & top_want) / len(union) if union else 1.0
+        count = max(len(expected), 1)
+        report["identical_results"] = f"{same}/{len(expected)}"
+        report[f"top{k}_overlap"] = round(overlap / count, 3)
+
+
+def format_table(reports: list, meta: dict) -> str:
+    """Human-readable benchmark summary."""
+    columns = [("skill", "Skill"), ("rows", "Rows"), ("cold_start_ms", "Cold ms"),
+               ("index_build_ms", "Build ms"), ("p50_ms", "p50 ms"), ("p95_ms", "p95 ms"),
+               ("p99_ms", "p99 ms"), ("peak_rss_kb", "Peak RSS KB"),
+               ("unstable_repeats", "Unstable")]
+    if any("identical_results" in r for r in reports):
+        columns += [("identical_results", "Identical"), ("top3_overlap", "Top-3 overlap")]
+
+    table = [[label for _, label in columns]]
+    table += [[str(r.get(key, "-")) for key, _ in columns] for r in reports]
+    widths = [max(len(row[i]) for row in table) for i in range(len(columns))]
+
+    lines = [f"Search benchmark — query set v{meta['query_set_version']}, "
+             f"scale {meta['scale']}x, {meta['repeat']} repeats", ""]
+    for i, row in enumerate(table):
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if i == 0:
+            lines.append("  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill search engines")
+    parser.add_argument("--skills", nargs="+", choices=list(SKILL_CORES),
+                        help="Only benchmark these skills (default: all)")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Synthesize corpora with N times the rows of the real CSVs")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the query set")
+    parser.add_argument("--query-set", type=Path, default=QUERY_SET, help="Query set JSON file")
+    parser.add_argument("--save-baseline", type=Path, help="Write top-k results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare top-k results with this file")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    # Internal: per-skill subprocess modes
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--cold", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--queries", help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker or args.cold:
+        skill, queries = args.skills[0], json.loads(args.queries)
+        if args.cold:
+            run_cold(skill, args.data_dir, queries)
+        else:
+            print(json.dumps(run_worker(skill, args.data_dir, queries, args.repeat)))
+        return
+
+    query_set = load_query_set(args.query_set)
+    meta = {"query_set_version": query_set["version"], "scale": args.scale, "repeat": args.repeat}
+    skills = args.skills or [s for s in SKILL_CORES if s in query_set["skills"]]
+
+    reports = []
+    with tempfile.TemporaryDirectory(prefix="ht-search-bench-") as tmp:
+        for skill in skills:
+            data_dir = None
+            if args.scale > 1:
+                real_dir = SKILLS_DIR / skill / "data"
+                data_dir = scale_corpus(real_dir, Path(tmp) / skill, args.scale)
+            try:
+                reports.append(benchmark_skill(skill, query_set["skills"][skill], args.repeat, data_dir))
+            except RuntimeError as e:
+                print(f"Error benchmarking {skill}: {e}", file=sys.stderr)
+                sys.exit(1)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if baseline.get("query_set_version") != meta["query_set_version"] or baseline.get("scale") != args.scale:
+            print("Error: baseline was recorded with a different query set version or scale", file=sys.stderr)
+            sys.exit(1)
+        compare(reports, baseline)
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps({
+            "query_set_version": meta["query_set_version"],
+            "scale": args.scale,
+            "skills": {r["skill"]: r["results"] for r in reports},
+        }, indent=2), encoding='utf-8')
+
+    if args.json:
+        print(json.dumps({"meta": meta, "skills": reports}, indent=2))
+    else:
+        print(format_table(reports, meta))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Skill Search Daemon — keeps every skill's search corpora warm in one process.
+
+The search CLIs (ui-ux, threejs, logo-design, creativity, ai-artist and
+design-system search-slides.py) send their queries to the daemon when it is
+running and search in-process otherwise, so starting it is purely opt-in.
+
+Usage:
+    python3 search-daemon.py start     # Start in the background
+    python3 search-daemon.py serve     # Run in the foreground
+    python3 search-daemon.py status    # Show pid, uptime and loaded skills
+    python3 search-daemon.py stop      # Stop a running daemon
+
+The socket is ht-search-<install hash>.sock (one per .agent install) in
+$XDG_RUNTIME_DIR, or else in a private $TMPDIR/ht-search-<uid> directory.
+Set HT_SEARCH_SOCKET to use another path.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.search_daemon import SKILL_CORES, ping, serve, shutdown, socket_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill search daemon")
+    parser.add_argument("command", choices=["start", "serve", "status", "stop"])
+    parser.add_argument("--skills", nargs="+", choices=list(SKILL_CORES),
+                        help="Only load these skills (default: all)")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        status = ping()
+        if status is None:
+            print("Search daemon is not running")
+            sys.exit(1)
+        print(f"Search daemon running (pid {status['pid']}, up {status['uptime']}s)")
+        print(f"Socket: {socket_path()}")
+        print(f"Skills: {', '.join(status['skills'])} ({status['corpora']} corpora)")
+    elif args.command == "stop":
+        if not shutdown():
+            print("Search daemon is not running")
+            sys.exit(1)
+        print("Search daemon stopped")
+    elif args.command == "serve":
+        try:
+            serve(args.skills)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    else:
+        if ping() is not None:
+            print(f"Search daemon already running at {socket_path()}")
+            return
+        cmd = [sys.executable, str(Path(__file__).resolve()), "serve"]
+        if args.skills:
+            cmd += ["--skills"] + args.skills
+        subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+        for _ in range(100):
+            time.sleep(0.1)
+            if ping() is not None:
+                print(f"Search daemon started at {socket_path()}")
+                return
+        print("Error: search daemon did not start (try 'serve' to see errors)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
 #!/usr/bin/env python3
 """Tests for Antigravity-HTKit help system v1.1.0."""
 
+import os
 import sys
 import subprocess
+import tempfile
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from lib.discovery import Manifest, discover_workflows, discover_skills
+from lib.fulltext import FULLTEXT_INDEX, FullTextIndex
+from lib.fuzzy import FuzzyIndex, fuzzy_match
+from lib.guides import expand_synonyms, task_scorer
+
 
 def run_help(args: str = "") -> str:
     """Run ht-help.py and return output."""
@@ -108,6 +117,112 @@ def test_no_legacy():
     return errors
 
 
+def test_manifest_cache():
+    """Test: cached catalog matches a fresh scan and picks up edits."""
+    errors = []
+    agent_dir = Path(__file__).resolve().parent.parent
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_path = Path(tmp) / "manifest.json"
+        manifest = Manifest(manifest_path)
+        cached = discover_skills(agent_dir / "skills", manifest)
+        manifest.save()
+        if cached != discover_skills(agent_dir / "skills"):
+            errors.append("Cached skills differ from fresh scan")
+        if not manifest_path.exists():
+            errors.append("Manifest not written")
+
+        workflows_dir = Path(tmp) / "workflows"
+        workflows_dir.mkdir()
+        workflow = workflows_dir / "demo.md"
+        workflow.write_text("---\ndescription: ⚡ First\n---\n", encoding='utf-8')
+        manifest = Manifest(manifest_path)
+        discover_workflows(workflows_dir, manifest)
+        manifest.save()
+
+        manifest = Manifest(manifest_path)
+        discover_workflows(workflows_dir, manifest)
+        if manifest.dirty:
+            errors.append("Unchanged workflows marked manifest dirty")
+
+        workflow.write_text("---\ndescription: ⚡⚡ Second\n---\n", encoding='utf-8')
+        os.utime(workflow, ns=(1, 1))
+        result = discover_workflows(workflows_dir, Manifest(manifest_path))
+        if result != [{"name": "/demo", "description": "Second", "power_level": 2, "filename": "demo.md"}]:
+            errors.append("Edited workflow not rescanned")
+    return errors
+
+
+def test_fuzzy_index():
+    """Test: BK-tree lookups agree with pairwise fuzzy matching."""
+    errors = []
+    vocabulary = ["fix", "plan", "debug", "deploy", "status", "watzup", "bootstrap",
+                  "error", "broken", "research", "verify", "review", "release"]
+    index = FuzzyIndex(vocabulary)
+    for word in ["fxi", "pln", "debgu", "deplyo", "staus", "eror", "brokn", "reviw", "relase", "xyz", "fi"]:
+        expected = {target for target in vocabulary if fuzzy_match(word, target)}
+        if index.matches(word) != expected:
+            errors.append(f"'{word}' matched {sorted(index.matches(word))}, expected {sorted(expected)}")
+    return errors
+
+
+def test_intent_scoring():
+    """Test: compiled intent engine keeps the keyword scoring rules."""
+    errors = []
+    if expand_synonyms("Fix CI/CD and auth in the repo") != "fix github actions and authentication in the repository":
+        errors.append("Synonyms not expanded")
+    if expand_synonyms("ci/cdx") != "github actions/cdx":
+        errors.append("Synonym matched inside a longer word")
+    cases = [
+        ("debug login error", {"fix": 1.0, "debug": 2.5}),       # action verb first
+        ("deplyo to production", {"deploy": 2.8}),               # fuzzy 0.8 + last-position 2.0
+        ("how to fix github actions", {"fix": 1.5, "plan": 3.0}),  # phrase + positional weight
+        ("crash", {"fix": 2.0}),                                  # single word
+    ]
+    for task, expected in cases:
+        scores = task_scorer().score(task)
+        if scores != expected:
+            errors.append(f"'{task}' scored {scores}, expected {expected}")
+    return errors
+
+
+def test_fulltext_search():
+    """Test: full-text index ranks references and follows file edits."""
+    errors = []
+    output = run_help("--search webhook signature")
+    if "Full-text search:" not in output:
+        errors.append("Missing full-text header")
+    if "payment-integration/references/" not in output:
+        errors.append("Missing payment reference result")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        agent_dir = Path(tmp) / ".agent"
+        cache_dir = agent_dir / ".cache"
+        (agent_dir / "workflows").mkdir(parents=True)
+        (agent_dir / "workflows" / "deploy.md").write_text("---\ndescription: Deploy\n---\nShip the build.\n", encoding='utf-8')
+        references = agent_dir / "skills" / "payments" / "references" / "stripe"
+        references.mkdir(parents=True)
+        (agent_dir / "skills" / "payments" / "SKILL.md").write_text("# Payments\nCheckout flows.\n", encoding='utf-8')
+        reference = references / "webhooks.md"
+        reference.write_text("# Stripe Webhooks\nVerify the webhook signature header.\n", encoding='utf-8')
+
+        results = FullTextIndex(agent_dir, cache_dir).search("webhook signature")
+        if not results or results[0]["name"] != "payments/references/stripe/webhooks.md":
+            errors.append(f"Reference not ranked first: {results}")
+        elif results[0]["title"] != "Stripe Webhooks" or "signature" not in results[0]["snippet"]:
+            errors.append(f"Wrong title or snippet: {results[0]}")
+        if not (cache_dir / FULLTEXT_INDEX).exists():
+            errors.append("Compiled index not written")
+
+        reference.write_text("# Stripe Webhooks\nRetry failed deliveries.\n", encoding='utf-8')
+        os.utime(reference, ns=(1, 1))
+        index = FullTextIndex(agent_dir, cache_dir)
+        if index.search("signature"):
+            errors.append("Edited reference still matches old content")
+        if [r["name"] for r in index.search("retry deliveries")] != ["payments/references/stripe/webhooks.md"]:
+            errors.append("Edited reference not reindexed")
+    return errors
+
+
 def main():
     """Run all tests."""
     tests = [
@@ -118,6 +233,10 @@ def main():
         ("Version", test_version),
         ("All categories", test_all_categories),
         ("No legacy refs", test_no_legacy),
+        ("Manifest cache", test_manifest_cache),
+        ("Fuzzy index", test_fuzzy_index),
+        ("Intent scoring", test_intent_scoring),
+        ("Full-text search", test_fulltext_search),
     ]
 
     total_errors = 0
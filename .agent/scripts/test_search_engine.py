@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared skill search engine (lib/bm25.py, lib/csv_index.py).
+
+Run with: pytest test_search_engine.py -v
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.bm25 import BM25, FUZZY_MIXED_DISCOUNT, NUMPY_AVAILABLE, bounded_edit_distance, make_scorer, tokenize
+from lib.column_store import ColumnStore, pack
+from lib.csv_index import (federated_path, index_path, load_bm25, load_index, search_csv,
+                            search_csv_federated, search_csv_many, search_many)
+from lib.facet_index import FacetIndex, PrefixIndex, bitset_rows, facet_index, prefix_index
+from lib.keyword_matcher import KeywordMatcher
+from lib.rule_index import RuleIndex, load_rule_index
+from lib import query_cache, search_daemon, skill_cores
+
+
+DOCS = [
+    "glassmorphism frosted glass blur",
+    "dark mode dashboard saas",
+    "minimalism clean flat design",
+    "saas landing page pricing",
+    "dark glassmorphism dashboard",
+]
+
+
+def write_csv(path: Path, rows: list) -> None:
+    """Write rows (first row is the header) to a CSV file."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+
+class TestTokenize:
+    """Test tokenization rules shared by all skills."""
+
+    def test_drops_short_words_and_punctuation(self):
+        assert tokenize("UI/UX is a Dark-Mode app") == ["dark", "mode", "app"]
+
+    def test_min_len(self):
+        assert tokenize("3d vr xr", min_len=2) == ["3d", "vr", "xr"]
+
+
+class TestBM25:
+    """Test postings-based BM25 scoring."""
+
+    def test_postings_hold_term_frequencies(self):
+        bm25 = BM25()
+        bm25.fit(["dark dark mode", "light mode"])
+        assert bm25.postings["dark"] == [[0, 2]]
+        assert bm25.postings["mode"] == [[0, 1], [1, 1]]
+
+    def test_only_matching_documents_scored(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        assert {idx for idx, _ in bm25.score("glassmorphism")} == {0, 4}
+
+    def test_top_k_matches_full_sort(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        for query in ["dark dashboard", "saas", "glassmorphism dark", "nothing"]:
+            assert bm25.top_k(query, 2) == bm25.score(query)[:2]
+
+    def test_top_k_zero(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        assert bm25.top_k("dark", 0) == []
+
+    def test_top_k_scores_only_allowed_documents(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        allowed = {1, 4}
+        for query in ["dark dashboard", "glassmorphism dark", "nothing"]:
+            ranked = [(idx, score) for idx, score in bm25.score(query) if idx in allowed]
+            assert bm25.top_k(query, 1, allowed) == ranked[:1]
+        assert bm25.top_k("dark", 3, set()) == []
+
+    def test_round_trip(self):
+        bm25 = BM25(min_len=2)
+        bm25.fit(DOCS)
+        restored = BM25.from_dict(bm25.to_dict())
+        assert restored.score("dark saas") == bm25.score("dark saas")
+
+
+class TestTypoTolerance:
+    """Test trigram expansion of misspelled query terms."""
+
+    def test_bounded_edit_distance(self):
+        assert bounded_edit_distance("glasmorphism", "glassmorphism", 2) == 1
+        assert bounded_edit_distance("kitten", "sitting", 3) == 3
+        assert bounded_edit_distance("kitten", "sitting", 2) == 3
+        assert bounded_edit_distance("dark", "darkmode", 2) == 3
+
+    def test_misspelled_term_expands(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        assert bm25.expand_term("glasmorphism") == [("glassmorphism", 0.5)]
+        assert {idx for idx, _ in bm25.top_k("glasmorphism", 5)} == {0, 4}
+
+    def test_expanded_terms_are_discounted(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        exact = dict(bm25.score("dashboard"))
+        fuzzy = dict(bm25.score("dashbord"))
+        assert fuzzy.keys() == exact.keys()
+        assert all(fuzzy[idx] < exact[idx] for idx in exact)
+
+    def test_known_and_short_terms_not_expanded(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        assert bm25.query_terms("dark drk") == [("dark", 1.0)]
+        assert bm25.expand_term("zzzzzzzz") == []
+
+    def test_typo_next_to_known_term_expanded_at_reduced_weight(self):
+        bm25 = BM25()
+        bm25.fit(DOCS)
+        assert bm25.query_terms("dashbord") == [("dashboard", 0.5)]
+        assert bm25.query_terms("dark dashbord") == [("dark", 1.0), ("dashboard", 0.5 * FUZZY_MIXED_DISCOUNT)]
+        assert bm25.top_k("glasmorphism dark", 1)[0][0] == 4
+
+    def test_real_words_not_corrected(self):
+        bm25 = BM25()
+        bm25.fit(["law form lead", "educational app", "sans serif"])
+        assert bm25.expand_term("firm") == []
+        assert bm25.expand_term("saas") == []
+        assert bm25.expand_term("education") == []
+
+    def test_benchmark_rankings_pinned(self):
+        """Every benchmark query ranks as recorded in search_benchmark_baseline.json.
+
+        Regenerate the baseline with search-benchmark.py --save-baseline
+        after reviewing an intended ranking change.
+        """
+        here = Path(__file__).parent
+        spec = importlib.util.spec_from_file_location("search_benchmark", here / "search-benchmark.py")
+        benchmark = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(benchmark)
+        query_set = benchmark.load_query_set()
+        baseline = json.loads((here / "search_benchmark_baseline.json").read_text(encoding="utf-8"))
+        assert baseline["query_set_version"] == query_set["version"]
+        for skill, queries in query_set["skills"].items():
+            core = skill_cores.load_core(skill)
+            for (func, *args), expected in zip(queries, baseline["skills"][skill]):
+                assert benchmark.fingerprint(getattr(core, func)(*args)) == expected, (skill, args)
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+class TestVectorBM25:
+    """Test the NumPy CSR backend against the postings scorer."""
+
+    def test_matches_python_scores(self):
+        bm25 = BM25()
+        bm25.fit(DOCS * 7)
+        vector = make_scorer(bm25, "auto")
+        assert vector is not bm25
+        for query in ["dark dashboard", "saas saas pricing", "glassmorphism", "glasmorphism dashbord", "nothing"]:
+            for k in (1, 3, 10, 100):
+                assert vector.top_k(query, k) == bm25.top_k(query, k)
+                assert vector.top_k(query, k, {1, 4, 30}) == bm25.top_k(query, k, {1, 4, 30})
+
+    def test_compiled_index_matches_python(self, tmp_path):
+        data = tmp_path / "docs.csv"
+        write_csv(data, [["Text"]] + [[doc] for doc in DOCS * 7])
+        bm25 = load_bm25(load_index(tmp_path, data, ["Text"]))
+        vector = make_scorer(bm25, "numpy")
+        for query in ["dark dashboard", "saas saas pricing", "glasmorphism"]:
+            assert vector.top_k(query, 5) == bm25.top_k(query, 5)
+
+    def test_empty_corpus_uses_python(self):
+        bm25 = BM25()
+        bm25.fit([])
+        assert make_scorer(bm25, "numpy") is bm25
+
+
+class TestKeywordMatcher:
+    """Test the Aho-Corasick domain keyword matcher."""
+
+    KEYWORDS = {
+        "style": ["style", "glass", "dark mode", "minimal"],
+        "color": ["color", "palette", "dark", "blue"],
+        "icons": ["icon", "icons", "con"],
+    }
+
+    def test_scores_match_substring_counts(self):
+        matcher = KeywordMatcher(self.KEYWORDS, default="style")
+        for query in ["Dark Mode palette", "glassmorphism icons", "blue iconography", "", "nothing here"]:
+            expected = {d: sum(1 for kw in kws if kw in query.lower()) for d, kws in self.KEYWORDS.items()}
+            assert matcher.scores(query) == expected
+
+    def test_detect_ties_and_default(self):
+        matcher = KeywordMatcher(self.KEYWORDS, default="color")
+        assert matcher.detect("dark mode") == "style"
+        assert matcher.detect("icons") == "icons"
+        assert matcher.detect("unrelated") == "color"
+
+    def test_route_adds_ambiguous_runner_up(self):
+        matcher = KeywordMatcher(self.KEYWORDS, default="style")
+        assert matcher.route("minimal glass blue palette") == [("style", 0.5), ("color", 0.5)]
+        assert matcher.route("minimal glass style blue") == [("style", 0.75)]
+        assert matcher.route("unrelated") == [("style", 0.0)]
+
+    def test_route_search(self):
+        matcher = KeywordMatcher(self.KEYWORDS, default="style")
+
+        def search_domain(query, domain, max_results):
+            return {"domain": domain, "count": max_results}
+        assert matcher.route_search(search_domain, "blue palette", "style", 2) == {"domain": "style", "count": 2}
+        assert matcher.route_search(search_domain, "minimal glass blue palette", None, 2) == \
+            {"domain": "style", "count": 2, "confidence": 0.5, "related": {"domain": "color", "count": 2}}
+        assert matcher.route_search(lambda *args: {"error": "missing"}, "glass", None, 2) == {"error": "missing"}
+
+
+class TestFacetIndex:
+    """Test facet bitsets and prefix completion."""
+
+    def test_bitsets_match_column_scans(self):
+        values = ["webgl", "WebGPU (wip)", None, "webgl / advanced", "webgl"]
+        facets = FacetIndex(values)
+        assert bitset_rows(facets.equals("WEBGL")) == [0, 4]
+        assert bitset_rows(facets.containing("webgl"), 2) == [0, 3]
+        assert bitset_rows(facets.containing("")) == [0, 1, 2, 3, 4]
+        assert facets.equals("missing") == 0
+
+    def test_prefix_completion(self):
+        prefixes = PrefixIndex([["loader / gltf", "loader / gcode", None, "lights"],
+                                ["webgl_loader_gltf.html", "webgl_loader_gcode.html", "", "webgl_lights.html"]])
+        assert prefixes.complete("webgl_loader_g") == [1, 0]
+        assert prefixes.complete("LOADER", 1) == [1]
+        assert prefixes.complete("l") == [3, 1, 0]
+        assert prefixes.complete("zzz") == []
+        assert prefixes.lookup("webgl_lights.html") == [3]
+
+    def test_built_once_per_index(self, tmp_path):
+        data = tmp_path / "examples.csv"
+        write_csv(data, [["Name", "Level"], ["aurora", "low"], ["borealis", "high"]])
+        index = load_index(tmp_path, data, ["Name"])
+        assert facet_index(index, "Level") is facet_index(index, "Level")
+        assert bitset_rows(facet_index(index, "Level").equals("high")) == [1]
+        assert prefix_index(index, ["Name"]).complete("bor") == [1]
+
+
+class TestRuleIndex:
+    """Test indexed reasoning rule lookup."""
+
+    RULES = [{"Category": "SaaS (General)"}, {"Category": "Micro SaaS"},
+             {"Category": "E-commerce Luxury"}, {"Category": "Fintech/Crypto"}]
+
+    def test_match_stages(self):
+        rules = RuleIndex(self.RULES, "Category")
+        assert rules.find("micro saas") is self.RULES[1]
+        assert rules.find("Luxury") is self.RULES[2]
+        assert rules.find("crypto coins") is self.RULES[3]
+        assert rules.find("commerce app") is self.RULES[2]
+        assert rules.find("gaming") == {}
+
+    def test_loaded_once_per_process(self, tmp_path):
+        data = tmp_path / "reasoning.csv"
+        write_csv(data, [["Category", "Pattern"], ["Education", "Course grid"]])
+        first = load_rule_index(data, "Category")
+        assert load_rule_index(data, "Category") is first
+        assert first.find("education")["Pattern"] == "Course grid"
+        assert load_rule_index(tmp_path / "missing.csv", "Category").find("education") == {}
+
+
+class TestCsvIndex:
+    """Test the compiled on-disk CSV index."""
+
+    def test_search_reads_back_rows(self, tmp_path):
+        data = tmp_path / "styles.csv"
+        write_csv(data, [["Name", "Keywords", "Notes"],
+                         ["Glass", "glassmorphism blur", "multi\nline"],
+                         ["Flat", "minimal flat", "plain"]])
+        results = search_csv(tmp_path, data, ["Name", "Keywords"], ["Name", "Notes"], "glassmorphism", 3)
+        assert results == [{"Name": "Glass", "Notes": "multi\nline"}]
+        assert index_path(tmp_path, data).exists()
+
+    def test_rows_match_dict_reader(self, tmp_path):
+        data = tmp_path / "rows.csv"
+        write_csv(data, [["A", "B", "A"], ["1", "x\r\ny", "dup"], [], ["2"], ["3", "z", "w", "extra"]])
+        index = load_index(tmp_path, data, ["A"])
+        with open(data, encoding='utf-8') as f:
+            expected = [{k: v for k, v in row.items() if k is not None} for row in csv.DictReader(f)]
+        assert index.rows([2, 0, 1]) == [expected[2], expected[0], expected[1]]
+        assert index.column("B") == [row["B"] for row in expected]
+
+    def test_index_is_memory_mapped(self, tmp_path):
+        data = tmp_path / "styles.csv"
+        write_csv(data, [["Name", "Notes"], ["aurora", "soft"]])
+        search_csv(tmp_path, data, ["Name"], ["Name"], "aurora", 1)
+        index = ColumnStore.open(index_path(tmp_path, data))
+        assert index.meta["rows"] == 1
+        assert index.rows([0], ["Notes", "Missing"]) == [{"Notes": "soft"}]
+
+    def test_store_round_trip(self):
+        store = ColumnStore(pack({"header": []}, {"empty": b"", "ints": memoryview(b"\x01\x00\x00\x00").cast("I")}))
+        assert list(store.section("ints")) == [1]
+        assert bytes(store.section("empty")) == b""
+
+    def test_search_many_matches_single_searches(self, tmp_path):
+        data = tmp_path / "styles.csv"
+        write_csv(data, [["Name"]] + [[doc] for doc in DOCS])
+        requests = [("dark dashboard", 2), ("glassmorphism", 1), ("nothing", 3), ("saas", 0)]
+        assert search_csv_many(tmp_path, data, ["Name"], ["Name"], requests) == \
+            [search_csv(tmp_path, data, ["Name"], ["Name"], q, k) for q, k in requests]
+
+    def test_search_many_routes_like_search(self, tmp_path):
+        write_csv(tmp_path / "styles.csv", [["Name"]] + [[doc] for doc in DOCS])
+        write_csv(tmp_path / "colors.csv", [["Palette"], ["dark blue"], ["glass teal"]])
+        config = {
+            "style": {"file": "styles.csv", "search_cols": ["Name"], "output_cols": ["Name"]},
+            "color": {"file": "colors.csv", "search_cols": ["Palette"], "output_cols": ["Palette"]},
+            "icons": {"file": "missing.csv", "search_cols": ["Name"], "output_cols": ["Name"]},
+        }
+        matcher = KeywordMatcher(TestKeywordMatcher.KEYWORDS, default="style")
+
+        def one(query, domain, max_results):
+            domain_config = config.get(domain, config["style"])
+            if domain == "icons":
+                return {"error": f"File not found: {tmp_path / 'missing.csv'}", "domain": domain}
+            rows = search_csv(tmp_path, tmp_path / domain_config["file"], domain_config["search_cols"],
+                              domain_config["output_cols"], query, max_results)
+            return {"domain": domain, "query": query, "file": domain_config["file"],
+                    "count": len(rows), "results": rows}
+
+        queries = ["minimal glass blue palette", ("dark glass", "color"), ("dark", None, 1),
+                   "minimal glass blue palette", ("glass", "nowhere"), ("glass", "icons")]
+        expected = [matcher.route_search(one, "minimal glass blue palette", None, 2),
+                    one("dark glass", "color", 2), matcher.route_search(one, "dark", None, 1),
+                    matcher.route_search(one, "minimal glass blue palette", None, 2),
+                    one("glass", "nowhere", 2), one("glass", "icons", 2)]
+        assert search_many(config, queries, tmp_path, matcher, max_results=2) == expected
+        assert "related" in expected[0] and "confidence" in expected[2]
+
+    def test_rebuilds_when_csv_changes(self, tmp_path):
+        data = tmp_path / "styles.csv"
+        write_csv(data, [["Name"], ["aurora"]])
+        assert search_csv(tmp_path, data, ["Name"], ["Name"], "aurora", 3)
+        write_csv(data, [["Name"], ["brutalism"]])
+        os.utime(data, ns=(1, 1))
+        assert search_csv(tmp_path, data, ["Name"], ["Name"], "aurora", 3) == []
+        assert search_csv(tmp_path, data, ["Name"], ["Name"], "brutalism", 3) == [{"Name": "brutalism"}]
+
+    def test_touch_keeps_index(self, tmp_path):
+        data = tmp_path / "styles.csv"
+        write_csv(data, [["Name"], ["aurora"]])
+        first = load_index(tmp_path, data, ["Name"])
+        os.utime(data, ns=(1, 1))
+        second = load_index(tmp_path, data, ["Name"])
+        assert second.meta["source"]["sha256"] == first.meta["source"]["sha256"]
+        assert second.meta["source"]["mtime_ns"] == 1
+        assert load_index(tmp_path, data, ["Name"]).meta["source"]["mtime_ns"] == 1
+
+
+    def test_federated_matches_per_csv_searches(self, tmp_path):
+        styles, pages = tmp_path / "styles.csv", tmp_path / "pages" / "pages.csv"
+        pages.parent.mkdir()
+        write_csv(styles, [["Name", "Notes"]] + [[doc, str(i)] for i, doc in enumerate(DOCS)])
+        write_csv(pages, [["Page"], ["saas pricing page"], ["dashboard analytics"], ["glass hero"]])
+        corpora = [(styles, ["Name"], ["Notes"]), (tmp_path / "missing.csv", ["Name"], ["Name"]),
+                   (pages, ["Page"], ["Page"])]
+        for query in ["dark dashboard", "saas pricing", "glasmorphism dashbord", "frosted dashbord", "nothing", ""]:
+            for k in (0, 1, 3):
+                assert search_csv_federated(tmp_path, corpora, query, k) == \
+                    [search_csv(tmp_path, path, cols, out, query, k) for path, cols, out in corpora]
+        assert federated_path(tmp_path, [(styles, ["Name"]), (pages, ["Page"])]).exists()
+
+    def test_federated_rebuilds_when_part_changes(self, tmp_path):
+        styles, pages = tmp_path / "styles.csv", tmp_path / "pages.csv"
+        write_csv(styles, [["Name"], ["aurora"]])
+        write_csv(pages, [["Page"], ["landing"]])
+        corpora = [(styles, ["Name"], ["Name"]), (pages, ["Page"], ["Page"])]
+        assert search_csv_federated(tmp_path, corpora, "aurora landing", 3) == \
+            [[{"Name": "aurora"}], [{"Page": "landing"}]]
+        write_csv(pages, [["Page"], ["aurora"]])
+        os.utime(pages, ns=(1, 1))
+        assert search_csv_federated(tmp_path, corpora, "aurora landing", 3) == \
+            [[{"Name": "aurora"}], [{"Page": "aurora"}]]
+
+
+class TestQueryCache:
+    """Test the persistent search result cache."""
+
+    @pytest.fixture
+    def counted_search(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(query_cache, "_CACHES", {})
+        data = tmp_path / "styles.csv"
+        write_csv(data, [["Name"], ["aurora"], ["brutalism"]])
+        calls = []
+
+        def search(query, max_results=3):
+            calls.append(query)
+            return {"query": query, "results": search_csv(tmp_path, data, ["Name"], ["Name"], query, max_results)}
+        return query_cache.cached(tmp_path, search), calls, data
+
+    def test_hit_skips_search(self, counted_search):
+        search, calls, _ = counted_search
+        first = search("aurora")
+        assert search(" Aurora ") == {"query": " Aurora ", "results": first["results"]}
+        assert calls == ["aurora"]
+        search("aurora", max_results=1)
+        assert len(calls) == 2
+
+    def test_csv_change_invalidates(self, counted_search):
+        search, calls, data = counted_search
+        assert search("brutalism")["results"]
+        write_csv(data, [["Name"], ["aurora"]])
+        os.utime(data, ns=(1, 1))
+        query_cache._CACHES.clear()  # the next CLI call is a fresh process
+        assert search("brutalism")["results"] == []
+        assert len(calls) == 2
+
+    def test_data_hash_memoized_until_directory_changes(self, counted_search, tmp_path, monkeypatch):
+        search, calls, _ = counted_search
+        search("aurora")
+        cache = query_cache.get_cache(tmp_path)
+        first = cache.data_hash()
+        rehashed = []
+        hash_files = cache._hash_files
+        monkeypatch.setattr(cache, "_hash_files", lambda: rehashed.append(1) or hash_files())
+        assert cache.data_hash() == first and not rehashed
+        write_csv(tmp_path / "pages.csv", [["Page"], ["pricing"]])
+        assert cache.data_hash() != first and len(rehashed) == 1
+
+    def test_config_change_invalidates(self, counted_search, tmp_path):
+        search, calls, _ = counted_search
+        search("aurora")
+        assert query_cache.cached(tmp_path, search.__wrapped__, {"style": ["Name"]})("aurora")
+        assert len(calls) == 2
+
+    def test_disabled(self, counted_search, monkeypatch):
+        search, calls, _ = counted_search
+        monkeypatch.setenv("HT_SEARCH_CACHE", "0")
+        search("aurora")
+        search("aurora")
+        assert len(calls) == 2
+
+    def test_lru_eviction(self, tmp_path):
+        cache = query_cache.QueryCache(tmp_path, max_bytes=30)
+        cache.put("a", "x" * 10)
+        cache.put("b", "x" * 10)
+        assert cache.get("a") is not None  # "a" is now the most recent
+        cache.put("c", "x" * 10)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+class TestSearchDaemon:
+    """Test the warm search daemon and CLI routing."""
+
+    @pytest.fixture
+    def daemon(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HT_SEARCH_SOCKET", str(tmp_path / "search.sock"))
+        server = search_daemon.SearchDaemon(search_daemon.socket_path(), ["logo-design"])
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def test_socket_per_install(self, monkeypatch):
+        monkeypatch.delenv("HT_SEARCH_SOCKET", raising=False)
+        local = search_daemon.socket_path()
+        monkeypatch.setattr(search_daemon, "AGENT_ROOT", Path("/opt/global/.agent"))
+        assert search_daemon.socket_path() != local
+        assert search_daemon.socket_path().parent == local.parent
+
+    def test_socket_private_to_user(self, daemon):
+        assert stat.S_IMODE(search_daemon.socket_path().stat().st_mode) == 0o600
+
+    def test_foreign_socket_ignored(self, daemon, monkeypatch):
+        owner = search_daemon.socket_path().stat().st_uid
+        monkeypatch.setattr(os, "getuid", lambda: owner + 1)
+        assert search_daemon.ping() is None
+
+    def test_non_socket_ignored(self, tmp_path, monkeypatch):
+        planted = tmp_path / "planted.sock"
+        planted.write_text("")
+        monkeypatch.setenv("HT_SEARCH_SOCKET", str(planted))
+        assert search_daemon.ping() is None
+
+    def test_private_dir_rejects_shared_directory(self, tmp_path):
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        shared.chmod(0o777)
+        with pytest.raises(RuntimeError):
+            search_daemon._private_dir(shared)
+        search_daemon._private_dir(tmp_path / "private")
+        assert stat.S_IMODE((tmp_path / "private").stat().st_mode) == 0o700
+
+    def test_unserializable_result_reported(self, daemon):
+        daemon.cores["logo-design"]["search"] = lambda *args: object()
+        response = search_daemon._request({"skill": "logo-design", "func": "search", "args": ["x"]})
+        assert response["ok"] is False and "Unserializable" in response["error"]
+        assert search_daemon.ping() is not None
+
+    def test_not_running(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HT_SEARCH_SOCKET", str(tmp_path / "missing.sock"))
+        assert search_daemon.ping() is None
+        assert search_daemon.call("logo-design", "search", "vintage") is None
+
+    def test_ping(self, daemon):
+        status = search_daemon.ping()
+        assert status["skills"] == ["logo-design"]
+        assert status["corpora"] == 3
+
+    def test_matches_in_process_search(self, daemon):
+        local = daemon.cores["logo-design"]["search"]
+        assert search_daemon.call("logo-design", "search", "vintage coffee", "style", 2) == \
+            local("vintage coffee", "style", 2)
+
+    def test_unknown_function_falls_back(self, daemon):
+        assert search_daemon.call("logo-design", "_load_csv", "/etc/passwd") is None
+
+    def test_routed_uses_local_when_daemon_errors(self, daemon):
+        def search(query):
+            return {"local": query}
+        assert search_daemon.routed("no-such-skill", search)("x") == {"local": "x"}
@@ -11,7 +11,18 @@ Platforms: midjourney, dalle, sd, flux, nano-banana
 
 import argparse
 import sys
-from core import CSV_CONFIG, MAX_RESULTS, search, search_all_domains
+from core import CSV_CONFIG, MAX_RESULTS, DATA_DIR, search, search_many, search_all_domains
+from lib.query_cache import cached
+from lib.search_daemon import routed
+
+# Answer from the warm search daemon when it is running (see .agent/scripts/search-daemon.py)
+search = routed("ai-artist", search)
+search_many = routed("ai-artist", search_many)
+search_all_domains = routed("ai-artist", search_all_domains)
+
+# Reuse results of identical queries across sessions (see .agent/scripts/lib/query_cache.py)
+search = cached(DATA_DIR, search, CSV_CONFIG)
+search_all_domains = cached(DATA_DIR, search_all_domains, CSV_CONFIG)
 
 # Fix Windows cp1252 encoding: hardcoded emojis can't encode on Windows.
 # Reconfigure stdout to UTF-8 with replacement (Python 3.7+).
@@ -39,6 +50,10 @@ def format_output(result):
             output.append(f"- **{key}:** {value_str}")
         output.append("")
 
+    # Ambiguous auto-routed queries carry the runner-up domain's results too
+    if "related" in result:
+        output.append(format_output(result["related"]))
+
     return "\n".join(output)
 
 
@@ -52,10 +67,12 @@ def generate_prompt_system(query, platform=None):
     output.append("")
 
     # Search relevant domains
-    use_case = search(query, "use-case", 1)
-    style = search(query, "style", 2)
-    lighting = search(query, "lighting", 1)
-    technique = search(query, "technique", 2)
+    use_case, style, lighting, technique = search_many([
+        (query, "use-case", 1),
+        (query, "style", 2),
+        (query, "lighting", 1),
+        (query, "technique", 2)
+    ])
 
     # Use case / Template
     if use_case.get("count", 0) > 0:
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for long batch runs.
+
+Every finished file's result is written as one JSON line and flushed at
+once, so a run killed halfway (OOM, Ctrl-C, exhausted keys) keeps what it
+already did. With resume, the journal is read back first: files whose
+latest entry is a success are reported as done and new results are
+appended; otherwise the journal starts empty.
+
+Files are keyed by their resolved absolute path, so a run resumed from
+another working directory still recognises them. A truncated last line,
+left by a run killed mid-write, is ignored.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# .agent/.cache/gemini-batch, next to the other local caches
+DEFAULT_JOURNAL_DIR = Path(__file__).resolve().parent.parent.parent.parent / '.cache' / 'gemini-batch'
+
+
+def journal_key(file_path: str) -> str:
+    """Resolved absolute path a file is journaled under."""
+    return str(Path(file_path).resolve())
+
+
+def default_journal_path(files: List[str], **settings: Any) -> Path:
+    """Journal of runs over these input files with these settings (prompt, model, ...).
+
+    Another input set or any changed setting starts a different journal,
+    so a run on one folder never truncates another folder's journal and
+    --resume never mixes results produced with another prompt or model.
+    """
+    material = {'files': sorted(journal_key(f) for f in files), 'settings': settings}
+    encoded = json.dumps(material, sort_keys=True, default=str).encode('utf-8')
+    return DEFAULT_JOURNAL_DIR / f"{hashlib.sha256(encoded).hexdigest()[:16]}.jsonl"
+
+
+def load_journal(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Absolute file path -> latest result recorded in a journal; {} if there is none."""
+    entries = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and 'path' in entry and isinstance(entry.get('result'), dict):
+                    entries[entry['path']] = entry['result']
+    except OSError:
+        pass
+    return entries
+
+
+class BatchJournal:
+    """JSONL journal of finished results, one {"path", "result"} line per file."""
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        if resume:
+            self.completed = {
+                file: result for file, result in load_journal(self.path).items()
+                if result.get('status') == 'success'
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def done(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """The journaled success for file_path, if a previous run finished it."""
+        return self.completed.get(journal_key(file_path))
+
+    def record(self, result: Dict[str, Any]) -> None:
+        """Append one result (keyed by its 'file') and flush it to disk."""
+        entry = {'path': journal_key(result['file']), 'result': result}
+        self._file.write(json.dumps(entry, default=str) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -36,6 +36,24 @@ try:
 except ImportError:
     load_dotenv = None
 
+sys.path.insert(0, str(Path(__file__).parent))
+from response_cache import ResponseCache
+from result_sinks import MarkdownSink
+
+
+# Default prompt for markdown conversion
+DEFAULT_PROMPT = """Convert this document to clean, well-formatted Markdown.
+
+Requirements:
+- Preserve all content, structure, and formatting
+- Convert tables to markdown table format
+- Maintain heading hierarchy (# ## ### etc)
+- Preserve lists, code blocks, and quotes
+- Extract text from images if present
+- Keep formatting consistent and readable
+
+Output only the markdown content without any preamble or explanation."""
+
 
 def find_api_key() -> Optional[str]:
     """Find Gemini API key using correct priority order.
@@ -171,21 +189,7 @@ def convert_to_markdown(
             file_size = file_path_obj.stat().st_size
             use_file_api = file_size > 20 * 1024 * 1024  # >20MB
 
-            # Default prompt for markdown conversion
-            if custom_prompt:
-                prompt = custom_prompt
-            else:
-                prompt = """Convert this document to clean, well-formatted Markdown.
-
-Requirements:
-- Preserve all content, structure, and formatting
-- Convert tables to markdown table format
-- Maintain heading hierarchy (# ## ### etc)
-- Preserve lists, code blocks, and quotes
-- Extract text from images if present
-- Keep formatting consistent and readable
-
-Output only the markdown content without any preamble or explanation."""
+            prompt = custom_prompt or DEFAULT_PROMPT
 
             # Upload or inline the file
             if use_file_api:
@@ -230,15 +234,34 @@ Output only the markdown content without any preamble or explanation."""
             time.sleep(wait_time)
 
 
+def render_extraction(number: int, result: Dict[str, Any]) -> str:
+    """Section of the combined markdown for one converted document."""
+    text = f"## {Path(result['file']).name}\n\n"
+    if result['status'] == 'success' and result.get('markdown'):
+        text += result['markdown'] + "\n\n"
+    elif result['status'] == 'success':
+        text += "**Note**: Conversion succeeded but no content was returned.\n\n"
+    else:
+        text += f"**Error**: {result.get('error', 'Unknown error')}\n\n"
+    return text + "---\n\n"
+
+
 def batch_convert(
     files: List[str],
     output_file: Optional[str] = None,
     auto_name: bool = False,
     model: str = 'gemini-2.5-flash',
     custom_prompt: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    cache: Optional[ResponseCache] = None
 ) -> List[Dict[str, Any]]:
-    """Batch convert multiple files to markdown."""
+    """Batch convert multiple files to markdown.
+
+    Each document's markdown is appended to the output file as soon as it is
+    converted; the returned results carry file, status and error only. With
+    a `cache`, files converted before with the same content, model and
+    prompt are taken from it instead of the API.
+    """
 
     api_key = find_api_key()
     if not api_key:
@@ -264,51 +287,61 @@ def batch_convert(
             output_file = str(output_dir / 'document-extraction.md')
 
     output_path = Path(output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Process each file
-    for i, file_path in enumerate(files, 1):
-        if verbose:
-            print(f"\n[{i}/{len(files)}] Converting: {file_path}")
-
-        result = convert_to_markdown(
-            client=client,
-            file_path=file_path,
-            model=model,
-            custom_prompt=custom_prompt,
-            verbose=verbose
-        )
-
-        results.append(result)
-
-        if verbose:
-            status = result.get('status', 'unknown')
-            print(f"  Status: {status}")
-
-    # Save combined markdown
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("# Document Extraction Results\n\n")
-        f.write(f"Converted {len(files)} document(s) to markdown.\n\n")
-        f.write("---\n\n")
-
-        for result in results:
-            f.write(f"## {Path(result['file']).name}\n\n")
-
-            if result['status'] == 'success' and result.get('markdown'):
-                f.write(result['markdown'])
-                f.write("\n\n")
-            elif result['status'] == 'success':
-                f.write("**Note**: Conversion succeeded but no content was returned.\n\n")
+    header = (
+        "# Document Extraction Results\n\n"
+        f"Converted {len(files)} document(s) to markdown.\n\n"
+        "---\n\n"
+    )
+    sink = MarkdownSink(str(output_path), header, render_extraction)
+
+    # Process each file, appending its markdown as soon as it is done
+    try:
+        for i, file_path in enumerate(files, 1):
+            if verbose:
+                print(f"\n[{i}/{len(files)}] Converting: {file_path}")
+
+            cache_key = None
+            if cache:
+                try:
+                    cache_key = cache.key(file_path, prompt=custom_prompt or DEFAULT_PROMPT,
+                                          model=model, task='markdown')
+                except OSError:
+                    pass  # unreadable file: let convert_to_markdown report it
+            result = cache.get(cache_key) if cache_key else None
+
+            if result:
+                result = dict(result, file=str(file_path), cached=True)
             else:
-                f.write(f"**Error**: {result.get('error', 'Unknown error')}\n\n")
+                result = convert_to_markdown(
+                    client=client,
+                    file_path=file_path,
+                    model=model,
+                    custom_prompt=custom_prompt,
+                    verbose=verbose
+                )
+                if cache_key:
+                    cache.put(cache_key, result)
+
+            sink.write(result)
+            result.pop('markdown', None)
+            results.append(result)
+
+            if verbose:
+                status = result.get('status', 'unknown')
+                print(f"  Status: {status}")
+    finally:
+        sink.close()
 
-            f.write("---\n\n")
+    if cache:
+        cache.prune()
 
     if verbose or True:  # Always show output location
         print(f"\n{'='*50}")
         print(f"Converted: {len(results)} file(s)")
         print(f"Success: {sum(1 for r in results if r['status'] == 'success')}")
         print(f"Failed: {sum(1 for r in results if r['status'] == 'error')}")
+        if cache and cache.hits:
+            print(f"From cache: {cache.hits}")
         print(f"Output saved to: {output_path}")
 
     return results
@@ -359,6 +392,8 @@ Default output: <project-root>/docs/assets/document-extraction.md
                        help='Gemini model to use (default: gemini-2.5-flash)')
     parser.add_argument('--prompt', '-p',
                        help='Custom prompt for conversion')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Convert every file through the API, ignoring and not updating the response cache')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
 
@@ -387,7 +422,8 @@ Default output: <project-root>/docs/assets/document-extraction.md
         auto_name=args.auto_name,
         model=args.model,
         custom_prompt=args.prompt,
-        verbose=args.verbose
+        verbose=args.verbose,
+        cache=None if args.no_cache else ResponseCache()
     )
 
 
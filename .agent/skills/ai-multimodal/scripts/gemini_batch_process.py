@@ -14,13 +14,14 @@ Supports all Gemini modalities:
 """
 
 import argparse
-import json
+import functools
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import csv
 import shutil
 
 # Import centralized environment resolver (works for both local and global installs)
@@ -37,17 +38,12 @@ except ImportError:
     except ImportError:
         load_dotenv = None
 
-# Import key rotation support
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'common'))
-try:
-    from api_key_rotator import KeyRotator, is_rate_limit_error
-    from api_key_helper import find_all_api_keys
-    KEY_ROTATION_AVAILABLE = True
-except ImportError:
-    KEY_ROTATION_AVAILABLE = False
-    KeyRotator = None
-    is_rate_limit_error = None
-    find_all_api_keys = None
+# Multi-key scheduling: per-key RPM/TPM buckets and rate limit cooldowns
+sys.path.insert(0, str(Path(__file__).parent))
+from key_scheduler import KeyScheduler, estimate_tokens, is_rate_limit_error
+from response_cache import ResponseCache
+from batch_journal import BatchJournal, default_journal_path
+from result_sinks import OrderedWriter, open_sink
 
 try:
     from google import genai
@@ -71,6 +67,10 @@ IMAGEN_MODELS = {
 }
 # Video models have no fallback - Veo always requires billing
 
+# --output extensions that receive the generated file itself rather than a report
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp'}
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.webm'}
+
 
 def find_api_key() -> Optional[str]:
     """Find Gemini API key using centralized resolver or fallback.
@@ -119,6 +119,33 @@ def find_api_key() -> Optional[str]:
     return None
 
 
+def find_all_api_keys() -> List[str]:
+    """Find the primary Gemini API key and any GEMINI_API_KEY_2, _3, ... after it.
+
+    Each key is resolved like GEMINI_API_KEY (see find_api_key). Numbering
+    stops at the first missing key; duplicates are dropped.
+    """
+    keys = []
+    api_key = find_api_key()
+    n = 2
+    while api_key:
+        if api_key not in keys:
+            keys.append(api_key)
+        name = f'GEMINI_API_KEY_{n}'
+        api_key = resolve_env(name, skill='ai-multimodal') if CENTRALIZED_RESOLVER_AVAILABLE else os.getenv(name)
+        n += 1
+    return keys
+
+
+def get_rate_limit(name: str) -> Optional[float]:
+    """Per-key rate limit from environment or .env (GEMINI_RPM_LIMIT, GEMINI_TPM_LIMIT), or None."""
+    value = resolve_env(name, skill='ai-multimodal') if CENTRALIZED_RESOLVER_AVAILABLE else os.getenv(name)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
 def get_default_model(task: str) -> str:
     """Get default model for task from environment or fallback.
 
@@ -417,7 +444,9 @@ def generate_image_imagen4(
             traceback.print_exc()
         return {
             'status': 'error',
-            'error': str(e)
+            'error': str(e),
+            # Flag for caller to handle rotation (zero free-tier quota won't resolve)
+            'rate_limited': is_rate_limit_error(e) and not _is_free_tier_quota_error(e)
         }
 
 
@@ -550,7 +579,9 @@ def generate_video_veo(
             traceback.print_exc()
         return {
             'status': 'error',
-            'error': str(e)
+            'error': str(e),
+            # Flag for caller to handle rotation (zero free-tier quota won't resolve)
+            'rate_limited': is_rate_limit_error(e) and not _is_free_tier_quota_error(e)
         }
 
 
@@ -564,13 +595,16 @@ def process_file(
     aspect_ratio: Optional[str] = None,
     image_size: Optional[str] = None,
     verbose: bool = False,
-    max_retries: int = 3
+    max_retries: int = 3,
+    retry_rate_limits: bool = True
 ) -> Dict[str, Any]:
     """Process a single file with retry logic.
 
     Args:
         image_size: Image size for Nano Banana models (1K, 2K, 4K). Must be uppercase K.
                     Note: Not all models support image_size - only pass when explicitly needed.
+        retry_rate_limits: When False, rate limit errors are returned at once (flagged
+                    'rate_limited') so the caller can move the request to another key.
     """
 
     for attempt in range(max_retries):
@@ -674,13 +708,9 @@ def process_file(
                 }
 
             # Check if this is a rate limit error (candidate for key rotation)
-            is_rate_limited = (
-                KEY_ROTATION_AVAILABLE and
-                is_rate_limit_error and
-                is_rate_limit_error(e)
-            )
+            is_rate_limited = is_rate_limit_error(e)
 
-            if attempt == max_retries - 1:
+            if attempt == max_retries - 1 or (is_rate_limited and not retry_rate_limits):
                 return {
                     'file': str(file_path) if file_path else 'generated',
                     'status': 'error',
@@ -694,6 +724,38 @@ def process_file(
             time.sleep(wait_time)
 
 
+def run_ordered(items: List[Any], work, concurrency: int = 1, on_result=None) -> List[Any]:
+    """Apply work(index, item) to every item, at most `concurrency` at a time.
+
+    Indexes are 1-based. Results are returned in input order whatever order
+    they finish in, and on_result(index, item, result) is called as each one
+    finishes. With concurrency 1 items run one after another in the calling
+    thread. On an exception or Ctrl-C, items not yet started are cancelled.
+    """
+    if concurrency <= 1 or len(items) <= 1:
+        results = []
+        for index, item in enumerate(items, 1):
+            result = work(index, item)
+            if on_result:
+                on_result(index, item, result)
+            results.append(result)
+        return results
+
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as pool:
+        futures = {pool.submit(work, index, item): index for index, item in enumerate(items, 1)}
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index - 1] = future.result()
+                if on_result:
+                    on_result(index, items[index - 1], results[index - 1])
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return results
+
+
 def batch_process(
     files: List[str],
     prompt: str,
@@ -707,32 +769,38 @@ def batch_process(
     reference_images: Optional[List[str]] = None,
     output_file: Optional[str] = None,
     verbose: bool = False,
-    dry_run: bool = False
+    dry_run: bool = False,
+    concurrency: int = 1,
+    rpm: Optional[float] = None,
+    tpm: Optional[float] = None,
+    cache: Optional[ResponseCache] = None,
+    journal: Optional[BatchJournal] = None
 ) -> List[Dict[str, Any]]:
-    """Batch process multiple files with automatic key rotation."""
-
-    # Initialize key rotator or fall back to single key
-    rotator = None
-    api_key = None
-
-    if KEY_ROTATION_AVAILABLE and find_all_api_keys:
-        all_keys = find_all_api_keys()
-        if all_keys:
-            if len(all_keys) > 1:
-                rotator = KeyRotator(keys=all_keys, verbose=verbose)
-                api_key = rotator.get_key()
-                if verbose:
-                    print(f"✓ Key rotation enabled with {len(all_keys)} keys", file=sys.stderr)
-            else:
-                api_key = all_keys[0]
-                if verbose:
-                    print(f"✓ Using single API key: {api_key[:8]}...", file=sys.stderr)
+    """Batch process multiple files with automatic key rotation.
+
+    Up to `concurrency` files are in flight at once (upload, polling and
+    generation all overlap); results keep the order of `files`. Each file
+    goes to the API key with the most headroom under the per-key `rpm` and
+    `tpm` limits (None: unlimited), and rate-limited keys cool down while
+    the others carry on (see key_scheduler.py); prompt-only generation is
+    scheduled the same way. With a `cache`, files whose
+    content and request settings were answered before are not sent again.
+    With a `journal`, each result is appended to it as soon as it finishes,
+    and files it already holds a success for are not processed again.
+
+    A report `output_file` for input files is written as results come in
+    (see result_sinks.py); the returned results then leave out the response
+    text, which is in the file, so memory stays flat on large batches.
+    """
 
-    # Fallback to original single-key lookup
-    if not api_key:
-        api_key = find_api_key()
+    all_keys = find_all_api_keys()
+    if all_keys and verbose:
+        if len(all_keys) > 1:
+            print(f"✓ Key rotation enabled with {len(all_keys)} keys", file=sys.stderr)
+        else:
+            print(f"✓ Using single API key: {all_keys[0][:8]}...", file=sys.stderr)
 
-    if not api_key:
+    if not all_keys:
         print("Error: GEMINI_API_KEY not found")
         print("\nSetup options:")
         print("1. Run setup checker: python scripts/check_setup.py")
@@ -751,53 +819,72 @@ def batch_process(
         print(f"Model: {model}")
         print(f"Task: {task}")
         print(f"Prompt: {prompt}")
-        if rotator:
-            print(f"API keys available: {rotator.key_count}")
+        if concurrency > 1:
+            print(f"Concurrency: {concurrency}")
+        if len(all_keys) > 1:
+            print(f"API keys available: {len(all_keys)}")
+        if rpm or tpm:
+            print(f"Rate limits per key: {rpm or 'unlimited'} RPM, {tpm or 'unlimited'} TPM")
         return []
 
-    # Create client with current key
-    client = genai.Client(api_key=api_key)
-    results = []
+    scheduler = KeyScheduler(all_keys, rpm=rpm, tpm=tpm, verbose=verbose)
+    clients = {}
+    clients_lock = threading.Lock()
+
+    def client_for(key: str) -> genai.Client:
+        with clients_lock:
+            if key not in clients:
+                clients[key] = genai.Client(api_key=key)
+            return clients[key]
+
+    # Every key once, plus two more tries after cooldowns
+    max_attempts = scheduler.key_count + 2
+
+    def with_rotation(tokens: int, call) -> Dict[str, Any]:
+        """Run call(client=...) on the key with the most headroom, moving to another key on rate limits."""
+        result = None
+        for attempt in range(max_attempts):
+            key = scheduler.acquire(tokens)
+            result = call(client=client_for(key))
+            if not result.get('rate_limited'):
+                break
+            scheduler.report_rate_limit(key, Exception(result.get('error', '')))
+            if attempt < max_attempts - 1:
+                if verbose:
+                    print(f"  Retrying with rotated key...")
+            else:
+                if verbose:
+                    print(f"  ⚠ All API keys exhausted (on cooldown)", file=sys.stderr)
+                result['error'] = "All API keys exhausted (rate limited). Try again later."
+        return result
 
-    def get_client_with_rotation(error: Optional[Exception] = None) -> Optional[genai.Client]:
-        """Get client, rotating key if rate limited."""
-        nonlocal client, api_key
-
-        if error and rotator and is_rate_limit_error and is_rate_limit_error(error):
-            # Try to rotate to next key
-            if rotator.mark_rate_limited(str(error)):
-                new_key = rotator.get_key()
-                if new_key:
-                    api_key = new_key
-                    client = genai.Client(api_key=api_key)
-                    return client
-            # All keys exhausted
-            return None
-        return client
+    results = []
+    writer = None
 
     # For generation tasks without input files, process once
     if task == 'generate' and not files:
         if verbose:
             print(f"\nGenerating image from prompt...")
+        tokens = estimate_tokens(prompt)
 
         # Use Imagen 4 API for imagen models
         if model.startswith('imagen-') or model in IMAGEN_MODELS:
-            result = generate_image_imagen4(
-                client=client,
+            result = with_rotation(tokens, functools.partial(
+                generate_image_imagen4,
                 prompt=prompt,
                 model=model,
                 num_images=num_images,
                 aspect_ratio=aspect_ratio or '1:1',
                 size=size or '1K',  # Default to 1K for Imagen models
                 verbose=verbose
-            )
+            ))
 
             # Silent fallback to cheaper model if Imagen billing required
             if result.get('status') == 'billing_required':
                 if verbose:
                     print(f"  Falling back to: {IMAGE_MODEL_FALLBACK}")
-                result = process_file(
-                    client=client,
+                result = with_rotation(tokens, functools.partial(
+                    process_file,
                     file_path=None,
                     prompt=prompt,
                     model=IMAGE_MODEL_FALLBACK,
@@ -805,8 +892,9 @@ def batch_process(
                     format_output=format_output,
                     aspect_ratio=aspect_ratio,
                     image_size=size,
-                    verbose=verbose
-                )
+                    verbose=verbose,
+                    retry_rate_limits=False
+                ))
                 # Check if free tier (zero quota) - stop immediately with clear message
                 error_str = result.get('error', '')
                 if result.get('status') == 'error':
@@ -819,8 +907,8 @@ def batch_process(
                         )
         else:
             # Nano Banana (Flash/Pro) or other models via generate_content API
-            result = process_file(
-                client=client,
+            result = with_rotation(tokens, functools.partial(
+                process_file,
                 file_path=None,
                 prompt=prompt,
                 model=model,
@@ -828,8 +916,9 @@ def batch_process(
                 format_output=format_output,
                 aspect_ratio=aspect_ratio,
                 image_size=size,
-                verbose=verbose
-            )
+                verbose=verbose,
+                retry_rate_limits=False
+            ))
             # Check for free tier error
             if result.get('status') == 'error':
                 error_str = result.get('error', '')
@@ -846,15 +935,15 @@ def batch_process(
         if verbose:
             print(f"\nGenerating video from prompt...")
 
-        result = generate_video_veo(
-            client=client,
+        result = with_rotation(estimate_tokens(prompt), functools.partial(
+            generate_video_veo,
             prompt=prompt,
             model=model,
             resolution=resolution,
             aspect_ratio=aspect_ratio or '16:9',
             reference_images=reference_images,
             verbose=verbose
-        )
+        ))
 
         # Check for free tier error - video gen has NO free tier access
         if result.get('status') == 'error':
@@ -868,62 +957,101 @@ def batch_process(
             status = result.get('status', 'unknown')
             print(f"  Status: {status}")
     else:
-        # Process input files with key rotation support
-        for i, file_path in enumerate(files, 1):
+        # Process input files, each on the key with the most headroom
+        done = {}
+        if journal:
+            done = {f: journal.done(f) for f in files if journal.done(f)}
+            if done:
+                print(f"Resuming: {len(done)} of {len(files)} file(s) already done ({journal.path})")
+        pending = [f for f in files if f not in done]
+        positions = [i for i, f in enumerate(files, 1) if f not in done]
+        output_lock = threading.Lock()
+
+        if output_file and Path(output_file).suffix.lower() not in IMAGE_EXTENSIONS | VIDEO_EXTENSIONS:
+            writer = OrderedWriter(open_sink(output_file, format_output))
+
+        def stream(position: int, result: Dict[str, Any]) -> None:
+            """Hand a result to the output file and keep only its summary in memory."""
+            if writer:
+                writer.put(position, dict(result))
+                result.pop('response', None)
+
+        for position, f in enumerate(files, 1):
+            if f in done:
+                stream(position, done[f])
+
+        def process_with_rotation(i: int, file_path: str) -> Dict[str, Any]:
             if verbose:
-                print(f"\n[{i}/{len(files)}] Processing: {file_path}")
-
-            # Try processing with key rotation on rate limit
-            max_rotation_attempts = rotator.key_count if rotator else 1
-            result = None
-
-            for rotation_attempt in range(max_rotation_attempts):
-                result = process_file(
-                    client=client,
-                    file_path=file_path,
-                    prompt=prompt,
-                    model=model,
-                    task=task,
-                    format_output=format_output,
-                    aspect_ratio=aspect_ratio,
-                    image_size=size,
-                    verbose=verbose
-                )
-
-                # Check if rate limited and can rotate
-                if (result.get('rate_limited') and rotator and
-                    rotation_attempt < max_rotation_attempts - 1):
-                    new_client = get_client_with_rotation(Exception(result.get('error', '')))
-                    if new_client:
-                        client = new_client
-                        if verbose:
-                            print(f"  Retrying with rotated key...")
-                        continue
-                    else:
-                        # All keys exhausted - mark result with clear error
-                        if verbose:
-                            print(f"  ⚠ All API keys exhausted (on cooldown)", file=sys.stderr)
-                        result['error'] = "All API keys exhausted (rate limited). Try again later."
-                break
+                with output_lock:
+                    print(f"\n[{i}/{len(pending)}] Processing: {file_path}")
+
+            cache_key = None
+            if cache:
+                try:
+                    cache_key = cache.key(file_path, prompt=prompt, model=model, task=task,
+                                          format_output=format_output, aspect_ratio=aspect_ratio,
+                                          image_size=size)
+                except OSError:
+                    pass  # unreadable file: let process_file report it
+            if cache_key:
+                cached = cache.get(cache_key)
+                if cached:
+                    return dict(cached, file=str(file_path), cached=True)
+
+            result = with_rotation(estimate_tokens(prompt, file_path), functools.partial(
+                process_file,
+                file_path=file_path,
+                prompt=prompt,
+                model=model,
+                task=task,
+                format_output=format_output,
+                aspect_ratio=aspect_ratio,
+                image_size=size,
+                verbose=verbose,
+                retry_rate_limits=False
+            ))
 
-            results.append(result)
+            if cache_key:
+                cache.put(cache_key, result)
+            return result
 
+        def report(i: int, file_path: str, result: Dict[str, Any]) -> None:
+            if journal:
+                journal.record(result)
+            stream(positions[i - 1], result)
             if verbose:
                 status = result.get('status', 'unknown')
-                print(f"  Status: {status}")
+                with output_lock:
+                    if concurrency > 1:
+                        print(f"  [{i}/{len(pending)}] Status: {status} ({file_path})")
+                    else:
+                        print(f"  Status: {status}")
 
-    # Save results
-    if output_file:
+        try:
+            fresh = iter(run_ordered(pending, process_with_rotation, concurrency, report))
+        finally:
+            if writer:
+                writer.close()
+        results = [done[f] if f in done else next(fresh) for f in files]
+
+        if cache:
+            cache.prune()
+            if verbose and cache.hits:
+                print(f"\nCache: {cache.hits} of {len(pending)} file(s) answered from cache")
+
+    # Save results (input file reports were streamed above)
+    if output_file and not writer:
         save_results(results, output_file, format_output)
 
     return results
 
 
-def print_results(results: List[Dict[str, Any]], task: str) -> None:
+def print_results(results: List[Dict[str, Any]], task: str, output_file: Optional[str] = None) -> None:
     """Print results to stdout for LLM workflows.
 
     Always prints actual results (not just success/fail counts) so LLMs
-    can continue processing based on the output.
+    can continue processing based on the output. Responses streamed to
+    `output_file` are not held in results and are pointed to instead.
     """
     if not results:
         return
@@ -943,6 +1071,8 @@ def print_results(results: List[Dict[str, Any]], task: str) -> None:
                 response = result.get('response')
                 if response:
                     print(f"Result:\n{response}")
+                elif output_file:
+                    print(f"Result: saved to {output_file}")
 
             elif task == 'generate':
                 # Image generation
@@ -979,10 +1109,7 @@ def save_results(results: List[Dict[str, Any]], output_file: str, format_output:
     output_path = Path(output_file)
 
     # Special handling for image generation - if output has image extension, copy the generated image
-    image_extensions = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp'}
-    video_extensions = {'.mp4', '.mov', '.avi', '.webm'}
-
-    if output_path.suffix.lower() in image_extensions and len(results) == 1:
+    if output_path.suffix.lower() in IMAGE_EXTENSIONS and len(results) == 1:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -1004,7 +1131,7 @@ def save_results(results: List[Dict[str, Any]], output_file: str, format_output:
             output_path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
             print(f"Warning: Generation failed, saving error report to: {output_path}")
 
-    if output_path.suffix.lower() in video_extensions and len(results) == 1:
+    if output_path.suffix.lower() in VIDEO_EXTENSIONS and len(results) == 1:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -1017,32 +1144,9 @@ def save_results(results: List[Dict[str, Any]], output_file: str, format_output:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             print(f"Warning: Video generation failed, saving error report to: {output_path}")
 
-    if format_output == 'json':
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
-    elif format_output == 'csv':
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['file', 'status', 'response', 'error']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for result in results:
-                writer.writerow({
-                    'file': result.get('file', ''),
-                    'status': result.get('status', ''),
-                    'response': result.get('response', ''),
-                    'error': result.get('error', '')
-                })
-    else:  # markdown
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("# Batch Processing Results\n\n")
-            for i, result in enumerate(results, 1):
-                f.write(f"## {i}. {result.get('file', 'Unknown')}\n\n")
-                f.write(f"**Status**: {result.get('status', 'unknown')}\n\n")
-                if result.get('response'):
-                    f.write(f"**Response**:\n\n{result['response']}\n\n")
-                if result.get('error'):
-                    f.write(f"**Error**: {result['error']}\n\n")
-
+    with open_sink(str(output_path), format_output) as sink:
+        for result in results:
+            sink.write(result)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -1104,6 +1208,18 @@ Examples:
     parser.add_argument('--reference-images', nargs='+',
                        help='Reference images for video generation (max 3)')
 
+    parser.add_argument('--concurrency', type=int, default=1, metavar='N',
+                       help='Files processed in parallel (default: 1, one after another)')
+    parser.add_argument('--rpm', type=float, default=get_rate_limit('GEMINI_RPM_LIMIT'),
+                       help='Requests per minute allowed per API key (default: GEMINI_RPM_LIMIT, or unlimited)')
+    parser.add_argument('--tpm', type=float, default=get_rate_limit('GEMINI_TPM_LIMIT'),
+                       help='Tokens per minute allowed per API key (default: GEMINI_TPM_LIMIT, or unlimited)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Send every file to the API, ignoring and not updating the response cache')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip files the journal of an earlier run on the same files and settings already finished')
+    parser.add_argument('--journal', metavar='PATH',
+                       help='Checkpoint journal (JSONL) of finished files (default: .agent/.cache/gemini-batch/<files+settings>.jsonl)')
     parser.add_argument('--output', help='Output file for results')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
@@ -1137,6 +1253,12 @@ Examples:
     if args.task not in ['generate', 'generate-video'] and not args.files:
         parser.error("--files required for non-generation tasks")
 
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    if (args.rpm is not None and args.rpm <= 0) or (args.tpm is not None and args.tpm <= 0):
+        parser.error("--rpm and --tpm must be positive")
+
     if args.task in ['generate', 'generate-video'] and not args.prompt:
         parser.error("--prompt required for generation tasks")
 
@@ -1149,28 +1271,43 @@ Examples:
         elif args.task == 'extract':
             args.prompt = 'Extract key information'
 
-    # Process files
+    # Process files, journaling each result so an interrupted run can --resume
     files = args.files or []
-    results = batch_process(
-        files=files,
-        prompt=args.prompt,
-        model=args.model,
-        task=args.task,
-        format_output=args.format_output,
-        aspect_ratio=args.aspect_ratio,
-        num_images=args.num_images,
-        size=args.size,
-        resolution=args.resolution,
-        reference_images=args.reference_images,
-        output_file=args.output,
-        verbose=args.verbose,
-        dry_run=args.dry_run
-    )
+    journal = None
+    if files and not args.dry_run:
+        journal_path = args.journal or default_journal_path(
+            files, prompt=args.prompt, model=args.model, task=args.task, format_output=args.format_output,
+            aspect_ratio=args.aspect_ratio, size=args.size)
+        journal = BatchJournal(journal_path, resume=args.resume)
+    try:
+        results = batch_process(
+            files=files,
+            prompt=args.prompt,
+            model=args.model,
+            task=args.task,
+            format_output=args.format_output,
+            aspect_ratio=args.aspect_ratio,
+            num_images=args.num_images,
+            size=args.size,
+            resolution=args.resolution,
+            reference_images=args.reference_images,
+            output_file=args.output,
+            verbose=args.verbose,
+            dry_run=args.dry_run,
+            concurrency=args.concurrency,
+            rpm=args.rpm,
+            tpm=args.tpm,
+            cache=None if args.no_cache else ResponseCache(),
+            journal=journal
+        )
+    finally:
+        if journal:
+            journal.close()
 
     # Print results and summary
     if not args.dry_run and results:
         # Always print actual results for LLM workflows
-        print_results(results, args.task)
+        print_results(results, args.task, args.output)
 
         # Print summary
         success = sum(1 for r in results if r.get('status') == 'success')
@@ -1179,6 +1316,8 @@ Examples:
         print(f"Summary: {len(results)} processed, {success} success, {failed} failed")
         if args.output:
             print(f"Results saved to: {args.output}")
+        if failed and journal:
+            print("Re-run with --resume to retry only the files that did not succeed")
 
 
 if __name__ == '__main__':
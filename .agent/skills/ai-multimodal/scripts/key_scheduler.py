@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Spread Gemini requests over several API keys without tripping rate limits.
+
+Each key gets two token buckets, one for requests per minute (RPM) and one
+for tokens per minute (TPM). A bucket holds one minute of quota and refills
+continuously, so a key can burst up to its limit and then settles at the
+steady rate. A limit of None leaves that bucket unbounded.
+
+acquire() hands out the key with the most headroom: the one whose fullest
+bucket is least drained, least recently used on ties. When no key has room
+it sleeps only until the first one does, so requests flow at the combined
+quota of all keys instead of waiting on one.
+
+A 429 / RESOURCE_EXHAUSTED reply is fed back with report_rate_limit(): the
+key's buckets are emptied and it cools down for the server's Retry-After
+(or retryDelay) when the error carries one, otherwise for DEFAULT_COOLDOWN
+seconds. Other keys keep serving requests meanwhile.
+"""
+
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_COOLDOWN = 60.0
+
+# Rough token cost of media sent with a request: Gemini bills images and
+# PDF pages at 258 tokens, audio and video by duration, which compressed
+# files come to about one token per 400 bytes
+MEDIA_MIN_TOKENS = 258
+MEDIA_BYTES_PER_TOKEN = 400
+
+_RETRY_AFTER_PATTERNS = [
+    re.compile(r"retry-after['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)", re.IGNORECASE),
+    re.compile(r"retrydelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", re.IGNORECASE),
+    re.compile(r"retry in (\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+]
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check if error is a rate limit (429 / RESOURCE_EXHAUSTED) reply."""
+    if getattr(error, 'code', None) == 429:
+        return True
+    error_str = str(error)
+    lowered = error_str.lower()
+    return (
+        '429' in error_str or
+        'RESOURCE_EXHAUSTED' in error_str or
+        'rate limit' in lowered or
+        'too many requests' in lowered
+    )
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked to wait before retrying, if it said."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers:
+        try:
+            value = headers.get('Retry-After') or headers.get('retry-after')
+            if value:
+                return float(value)
+        except (TypeError, ValueError):
+            pass
+
+    error_str = str(error)
+    for pattern in _RETRY_AFTER_PATTERNS:
+        match = pattern.search(error_str)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def estimate_tokens(prompt: str, file_path: Optional[str] = None) -> int:
+    """Rough token count of a request, for the TPM bucket."""
+    tokens = len(prompt) // 4 + 1
+    if file_path:
+        try:
+            size = Path(file_path).stat().st_size
+        except OSError:
+            size = 0
+        tokens += max(MEDIA_MIN_TOKENS, size // MEDIA_BYTES_PER_TOKEN)
+    return tokens
+
+
+class TokenBucket:
+    """Per-minute quota refilled continuously; limit None means unlimited."""
+
+    def __init__(self, limit: Optional[float], now: float):
+        self.limit = limit
+        self.level = float(limit) if limit else 0.0
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        if self.limit:
+            self.level = min(self.limit, self.level + (now - self.updated) * self.limit / 60.0)
+        self.updated = now
+
+    def wait(self, amount: float) -> float:
+        """Seconds until amount is available (after refill)."""
+        if not self.limit:
+            return 0.0
+        amount = min(amount, self.limit)  # oversized requests wait for a full bucket
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.limit
+
+    def take(self, amount: float) -> None:
+        if self.limit:
+            self.level -= min(amount, self.limit)
+
+    def headroom(self) -> float:
+        """Fraction of the bucket still available."""
+        return self.level / self.limit if self.limit else 1.0
+
+    def drain(self) -> None:
+        self.level = 0.0
+
+
+class KeyState:
+    """Buckets and cooldown of one API key."""
+
+    def __init__(self, key: str, rpm: Optional[float], tpm: Optional[float], now: float):
+        self.key = key
+        self.requests = TokenBucket(rpm, now)
+        self.tokens = TokenBucket(tpm, now)
+        self.cooldown_until = 0.0
+        self.last_used = 0  # acquire() sequence number, 0 = never
+
+    def wait(self, tokens: float, now: float) -> float:
+        return max(self.cooldown_until - now, self.requests.wait(1), self.tokens.wait(tokens))
+
+    def headroom(self) -> float:
+        return min(self.requests.headroom(), self.tokens.headroom())
+
+
+class KeyScheduler:
+    """Assign requests to API keys by RPM/TPM headroom, with per-key cooldowns.
+
+    Thread-safe: concurrent workers share one scheduler. `clock` and `sleep`
+    are injectable for tests.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        cooldown: float = DEFAULT_COOLDOWN,
+        verbose: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if not keys:
+            raise ValueError("KeyScheduler needs at least one API key")
+        self.cooldown = cooldown
+        self.verbose = verbose
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._sequence = 0
+        now = clock()
+        self.states: Dict[str, KeyState] = {}
+        for key in keys:
+            self.states.setdefault(key, KeyState(key, rpm, tpm, now))
+
+    @property
+    def key_count(self) -> int:
+        return len(self.states)
+
+    def _pick(self, tokens: float, now: float):
+        """(key state, 0) with the most headroom, or (None, seconds until one frees up)."""
+        best, soonest = None, None
+        for state in self.states.values():
+            state.requests.refill(now)
+            state.tokens.refill(now)
+            wait = state.wait(tokens, now)
+            if wait > 0:
+                soonest = wait if soonest is None else min(soonest, wait)
+            elif best is None or (state.headroom(), -state.last_used) > (best.headroom(), -best.last_used):
+                best = state
+        return best, soonest
+
+    def acquire(self, tokens: float = 0, timeout: Optional[float] = None) -> Optional[str]:
+        """Reserve one request of `tokens` tokens on the best key and return it.
+
+        Blocks until some key has room. Returns None if that would take
+        longer than `timeout` seconds.
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            with self._lock:
+                now = self.clock()
+                state, wait = self._pick(tokens, now)
+                if state:
+                    state.requests.take(1)
+                    state.tokens.take(tokens)
+                    self._sequence += 1
+                    state.last_used = self._sequence
+                    return state.key
+            if deadline is not None and now + wait > deadline:
+                return None
+            if self.verbose:
+                print(f"  All API keys at their limit, waiting {wait:.1f}s", file=sys.stderr)
+            self.sleep(wait)
+
+    def report_rate_limit(self, key: str, error: Optional[Exception] = None) -> float:
+        """Cool a key down after a rate limit reply; returns the cooldown in seconds."""
+        delay = (retry_after(error) if error is not None else None) or self.cooldown
+        with self._lock:
+            state = self.states[key]
+            state.requests.drain()
+            state.tokens.drain()
+            state.cooldown_until = max(state.cooldown_until, self.clock() + delay)
+        if self.verbose:
+            print(f"  ⚠ Key {key[:8]}... rate limited, cooling down {delay:.0f}s", file=sys.stderr)
+        return delay
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Local cache of Gemini responses, keyed by content.
+
+A key is the SHA-256 of the input file's bytes together with everything
+else that shapes the reply: prompt, model, task, output format and
+generation config. Renaming or moving a file still hits; editing one byte
+or changing the prompt misses.
+
+Each entry is a directory under the cache root holding result.json and a
+copy of any file the request produced (generated images or videos), which
+is put back in place on a hit if it has gone missing. Only successful
+results are stored.
+
+Entries expire after `ttl` seconds. prune() drops expired entries and then
+the least recently used ones until the cache fits in `max_bytes`, reading
+only file times: an empty `created` file marks when an entry was stored
+and result.json's mtime when it was last used.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_VERSION = 1
+
+# .agent/.cache/gemini-responses, next to the other local caches
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent.parent.parent / '.cache' / 'gemini-responses'
+DEFAULT_TTL = 7 * 24 * 3600  # one week
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+# Result fields holding paths of generated files
+ARTIFACT_FIELDS = ('generated_image', 'generated_images', 'generated_video')
+
+RESULT_FILE = 'result.json'
+CREATED_FILE = 'created'
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's bytes, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Content-addressed store of successful results and their artifacts."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self._lock = threading.Lock()  # get() runs from concurrent workers
+
+    def key(self, file_path: Optional[str], **params: Any) -> str:
+        """Cache key of a request on file_path (None: prompt only) with params."""
+        material = {
+            'version': CACHE_VERSION,
+            'file': file_digest(file_path) if file_path else None,
+            'params': params,
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The cached result for key, or None if absent or expired."""
+        entry = self._entry(key)
+        try:
+            with open(entry / RESULT_FILE, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - stored.get('created', 0) > self.ttl:
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        try:
+            for cached_name, original in stored.get('artifacts', {}).items():
+                if not Path(original).exists():
+                    Path(original).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(entry / cached_name, original)
+        except OSError:
+            return None
+
+        os.utime(entry / RESULT_FILE)  # mark as recently used for prune()
+        with self._lock:
+            self.hits += 1
+        return stored['result']
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a successful result and copies of the files it names."""
+        if result.get('status') != 'success':
+            return
+        entry = self._entry(key)
+        artifacts = {}
+        try:
+            entry.mkdir(parents=True, exist_ok=True)
+            for field in ARTIFACT_FIELDS:
+                paths = result.get(field)
+                for path in ([paths] if isinstance(paths, str) else paths or []):
+                    cached_name = f"artifact_{len(artifacts)}{Path(path).suffix}"
+                    shutil.copy2(path, entry / cached_name)
+                    artifacts[cached_name] = path
+
+            (entry / CREATED_FILE).touch()
+            tmp_path = entry / f"{RESULT_FILE}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'result': result, 'artifacts': artifacts}, f)
+            os.replace(tmp_path, entry / RESULT_FILE)
+        except OSError:
+            # A cache that cannot be written just means the next run asks again
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def prune(self) -> int:
+        """Drop expired entries, then least recently used ones beyond max_bytes.
+
+        Returns the number of entries removed.
+        """
+        now = time.time()
+        entries = []  # (last used, size, path)
+        removed = 0
+        for result_file in self.cache_dir.glob(f'*/*/{RESULT_FILE}'):
+            entry = result_file.parent
+            try:
+                used = result_file.stat().st_mtime
+                size = sum(p.stat().st_size for p in entry.iterdir())
+            except OSError:
+                continue
+            try:
+                created = (entry / CREATED_FILE).stat().st_mtime
+            except OSError:
+                created = used  # stored before creation times were kept
+            if now - created > self.ttl:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+            else:
+                entries.append((used, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
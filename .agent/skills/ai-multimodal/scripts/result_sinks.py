@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Write batch results to disk one at a time instead of all at the end.
+
+Every sink opens its file up front and flushes after each result, so
+finished results are on disk while the batch runs and nothing has to be
+kept in memory to write them later:
+
+    JSONLSink     one JSON object per line (.jsonl output)
+    JSONSink      a JSON array, same layout as json.dump(results, indent=2);
+                  the closing bracket is written by close()
+    CSVSink       file, status, response, error columns, flushed per row
+    MarkdownSink  a header, then one section per result from a render function
+
+OrderedWriter puts results that finish out of order (concurrent batches)
+back in input order before they reach a sink, holding only those that
+finished ahead of a slower earlier one.
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CSV_FIELDS = ['file', 'status', 'response', 'error']
+
+
+class ResultSink:
+    """Base class: an output file that results are appended to."""
+
+    def __init__(self, path: str, newline: Optional[str] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8', newline=newline)
+        self.count = 0
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self.count += 1
+        self._write(result)
+        self._file.flush()
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JSONLSink(ResultSink):
+    """One JSON object per line."""
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(result) + '\n')
+
+
+class JSONSink(ResultSink):
+    """A JSON array written element by element."""
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        item = json.dumps(result, indent=2).replace('\n', '\n  ')
+        self._file.write(('[\n  ' if self.count == 1 else ',\n  ') + item)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.write('\n]' if self.count else '[]')
+        super().close()
+
+
+class CSVSink(ResultSink):
+    """CSV rows of file, status, response and error."""
+
+    def __init__(self, path: str):
+        super().__init__(path, newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+        self._writer.writeheader()
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self._writer.writerow({field: result.get(field, '') for field in CSV_FIELDS})
+
+
+class MarkdownSink(ResultSink):
+    """A markdown header followed by render(number, result) for each result."""
+
+    def __init__(self, path: str, header: str, render: Callable[[int, Dict[str, Any]], str]):
+        super().__init__(path)
+        self.render = render
+        self._file.write(header)
+        self._file.flush()
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self._file.write(self.render(self.count, result))
+
+
+class OrderedWriter:
+    """Feed a sink in input order from results arriving in any order."""
+
+    def __init__(self, sink: ResultSink):
+        self.sink = sink
+        self.next_index = 1
+        self.pending: Dict[int, Dict[str, Any]] = {}
+
+    def put(self, index: int, result: Dict[str, Any]) -> None:
+        """Accept the result of 1-based item index; writes every result now in sequence."""
+        self.pending[index] = result
+        while self.next_index in self.pending:
+            self.sink.write(self.pending.pop(self.next_index))
+            self.next_index += 1
+
+    def close(self) -> None:
+        # Results after a gap (interrupted run) are still written, in order
+        for index in sorted(self.pending):
+            self.sink.write(self.pending.pop(index))
+        self.sink.close()
+
+
+def render_markdown_result(number: int, result: Dict[str, Any]) -> str:
+    """Markdown section of one batch_process result."""
+    text = f"## {number}. {result.get('file', 'Unknown')}\n\n"
+    text += f"**Status**: {result.get('status', 'unknown')}\n\n"
+    if result.get('response'):
+        text += f"**Response**:\n\n{result['response']}\n\n"
+    if result.get('error'):
+        text += f"**Error**: {result['error']}\n\n"
+    return text
+
+
+def open_sink(output_file: str, format_output: str) -> ResultSink:
+    """Sink for batch_process results: JSONL for .jsonl files, else by format."""
+    if Path(output_file).suffix.lower() == '.jsonl':
+        return JSONLSink(output_file)
+    if format_output == 'json':
+        return JSONSink(output_file)
+    if format_output == 'csv':
+        return CSVSink(output_file)
+    return MarkdownSink(output_file, "# Batch Processing Results\n\n", render_markdown_result)
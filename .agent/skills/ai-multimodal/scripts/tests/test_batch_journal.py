@@ -0,0 +1,79 @@
+"""
+Tests for batch_journal.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import batch_journal as bj
+
+
+class TestBatchJournal:
+    """Test journaling and resuming."""
+
+    def test_resume_keeps_latest_successes(self, tmp_path):
+        """Test only files whose latest entry succeeded count as done."""
+        path = tmp_path / 'run.jsonl'
+        with bj.BatchJournal(path) as journal:
+            journal.record({'file': 'a.mp3', 'status': 'success', 'response': 'A'})
+            journal.record({'file': 'b.mp3', 'status': 'error', 'error': 'boom'})
+            journal.record({'file': 'c.mp3', 'status': 'success', 'response': 'old'})
+            journal.record({'file': 'c.mp3', 'status': 'error', 'error': 'boom'})
+
+        with bj.BatchJournal(path, resume=True) as journal:
+            assert journal.done('a.mp3') == {'file': 'a.mp3', 'status': 'success', 'response': 'A'}
+            assert journal.done('./a.mp3') is not None
+            assert journal.done('b.mp3') is None
+            assert journal.done('c.mp3') is None
+            journal.record({'file': 'b.mp3', 'status': 'success', 'response': 'B'})
+
+        assert set(bj.load_journal(path)) == {bj.journal_key(f) for f in ['a.mp3', 'b.mp3', 'c.mp3']}
+
+    def test_resume_from_another_directory(self, tmp_path, monkeypatch):
+        """Test files journaled by relative path are found from another working directory."""
+        (tmp_path / 'audio').mkdir()
+        path = tmp_path / 'run.jsonl'
+        monkeypatch.chdir(tmp_path)
+        with bj.BatchJournal(path) as journal:
+            journal.record({'file': 'audio/a.mp3', 'status': 'success', 'response': 'A'})
+
+        monkeypatch.chdir(tmp_path / 'audio')
+        with bj.BatchJournal(path, resume=True) as journal:
+            assert journal.done('a.mp3')['response'] == 'A'
+            assert journal.done(str(tmp_path / 'audio' / 'a.mp3')) is not None
+
+    def test_truncated_line_ignored(self, tmp_path):
+        """Test a line cut off by a killed run does not break resuming."""
+        path = tmp_path / 'run.jsonl'
+        path.write_text('{"path": "/in/a.mp3", "result": {"file": "a.mp3", "status": "success"}}\n'
+                        '{"path": "/in/b.mp3", "result": {"file": "b.mp3", "sta', encoding='utf-8')
+
+        journal = bj.BatchJournal(path, resume=True)
+        journal.close()
+        assert list(journal.completed) == ['/in/a.mp3']
+
+    def test_fresh_run_starts_empty(self, tmp_path):
+        """Test a run without resume truncates the old journal."""
+        path = tmp_path / 'run.jsonl'
+        with bj.BatchJournal(path) as journal:
+            journal.record({'file': 'a.mp3', 'status': 'success'})
+        with bj.BatchJournal(path) as journal:
+            assert journal.done('a.mp3') is None
+        assert bj.load_journal(path) == {}
+
+    def test_default_path_depends_on_settings(self):
+        """Test runs with another prompt or model get another journal."""
+        base = bj.default_journal_path(['a.mp3'], prompt='p', model='m')
+        assert base == bj.default_journal_path(['a.mp3'], model='m', prompt='p')
+        assert base != bj.default_journal_path(['a.mp3'], prompt='q', model='m')
+        assert base.suffix == '.jsonl'
+
+    def test_default_path_depends_on_input_set(self, tmp_path, monkeypatch):
+        """Test another folder gets another journal, however its files are named."""
+        monkeypatch.chdir(tmp_path)
+        base = bj.default_journal_path(['a/1.mp3', 'a/2.mp3'], prompt='p')
+        assert base == bj.default_journal_path([str(tmp_path / 'a/2.mp3'), './a/1.mp3'], prompt='p')
+        assert base != bj.default_journal_path(['b/1.mp3', 'b/2.mp3'], prompt='p')
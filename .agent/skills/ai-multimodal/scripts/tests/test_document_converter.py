@@ -56,6 +56,33 @@ class TestMimeType:
         assert dc.get_mime_type('file.unknown') == 'application/octet-stream'
 
 
+class TestBatchConvert:
+    """Test batch conversion output."""
+
+    @patch('document_converter.find_api_key', return_value='test-key')
+    @patch('document_converter.genai.Client')
+    @patch('document_converter.convert_to_markdown')
+    def test_markdown_appended_per_document(self, mock_convert, mock_client, mock_find_key, tmp_path):
+        """Test each document is on disk as soon as it converts and not kept in results."""
+        output = tmp_path / 'out.md'
+        seen_on_disk = []
+
+        def fake_convert(**kwargs):
+            seen_on_disk.append(output.read_text(encoding='utf-8'))
+            name = Path(kwargs['file_path']).stem
+            return {'file': kwargs['file_path'], 'status': 'success', 'markdown': f'# {name}'}
+
+        mock_convert.side_effect = fake_convert
+        results = dc.batch_convert(files=['one.pdf', 'two.pdf'], output_file=str(output))
+
+        assert '# one' in seen_on_disk[1]
+        assert output.read_text(encoding='utf-8') == (
+            "# Document Extraction Results\n\nConverted 2 document(s) to markdown.\n\n---\n\n"
+            "## one.pdf\n\n# one\n\n---\n\n## two.pdf\n\n# two\n\n---\n\n"
+        )
+        assert results == [{'file': 'one.pdf', 'status': 'success'}, {'file': 'two.pdf', 'status': 'success'}]
+
+
 class TestIntegration:
     """Integration tests."""
 
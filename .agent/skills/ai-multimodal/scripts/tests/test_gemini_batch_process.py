@@ -276,6 +276,227 @@ class TestBatchProcessing:
         assert len(results) == 2
         assert all(r['status'] == 'success' for r in results)
 
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_concurrency_keeps_order(self, mock_client_class, mock_process, mock_find_key):
+        """Test concurrent batch overlaps requests but returns results in input order."""
+        import threading
+        import time as real_time
+
+        mock_find_key.return_value = 'test_key'
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def fake_process(**kwargs):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            # Earlier files finish last
+            real_time.sleep(0.01 * (5 - int(Path(kwargs['file_path']).stem[-1])))
+            with lock:
+                state['active'] -= 1
+            return {'file': kwargs['file_path'], 'status': 'success', 'response': 'ok'}
+
+        mock_process.side_effect = fake_process
+        files = [f'test{i}.jpg' for i in range(5)]
+
+        results = gbp.batch_process(
+            files=files,
+            prompt='Analyze',
+            model='gemini-2.5-flash',
+            task='analyze',
+            format_output='text',
+            verbose=False,
+            dry_run=False,
+            concurrency=3
+        )
+
+        assert [r['file'] for r in results] == files
+        assert 1 < state['peak'] <= 3
+
+    @patch('gemini_batch_process.find_all_api_keys')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_moves_rate_limited_file_to_other_key(self, mock_client_class, mock_process, mock_find_keys):
+        """Test a 429 on one key retries the file on the next key instead of sleeping."""
+        mock_find_keys.return_value = ['key_a', 'key_b']
+        mock_client_class.side_effect = lambda api_key: api_key
+        used = []
+
+        def fake_process(**kwargs):
+            used.append(kwargs['client'])
+            if kwargs['client'] == 'key_a':
+                return {'file': kwargs['file_path'], 'status': 'error',
+                        'error': '429 RESOURCE_EXHAUSTED', 'rate_limited': True}
+            return {'file': kwargs['file_path'], 'status': 'success', 'response': 'ok'}
+
+        mock_process.side_effect = fake_process
+
+        results = gbp.batch_process(
+            files=['test1.jpg', 'test2.jpg'],
+            prompt='Analyze',
+            model='gemini-2.5-flash',
+            task='analyze',
+            format_output='text',
+            verbose=False,
+            dry_run=False
+        )
+
+        assert all(r['status'] == 'success' for r in results)
+        # key_a cools down after its 429, so the second file goes straight to key_b
+        assert used == ['key_a', 'key_b', 'key_b']
+        assert all(call.kwargs['retry_rate_limits'] is False for call in mock_process.call_args_list)
+
+    @patch('gemini_batch_process.find_all_api_keys')
+    @patch('gemini_batch_process.generate_image_imagen4')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_generate_rotates_rate_limited_key(self, mock_client_class, mock_imagen, mock_find_keys):
+        """Test prompt-only generation goes through the key scheduler too."""
+        mock_find_keys.return_value = ['key_a', 'key_b']
+        mock_client_class.side_effect = lambda api_key: api_key
+        used = []
+
+        def fake_imagen(**kwargs):
+            used.append(kwargs['client'])
+            if kwargs['client'] == 'key_a':
+                return {'status': 'error', 'error': '429 RESOURCE_EXHAUSTED', 'rate_limited': True}
+            return {'status': 'success', 'generated_images': ['out.png']}
+
+        mock_imagen.side_effect = fake_imagen
+
+        results = gbp.batch_process(
+            files=[],
+            prompt='A lighthouse at dusk',
+            model='imagen-4.0-generate-001',
+            task='generate',
+            format_output='text',
+            verbose=False,
+            dry_run=False
+        )
+
+        assert results == [{'status': 'success', 'generated_images': ['out.png']}]
+        assert used == ['key_a', 'key_b']
+
+    def test_imagen_flags_rate_limit(self):
+        """Test Imagen rate limit errors are flagged for key rotation, zero quota is not."""
+        client = Mock()
+        client.models.generate_images.side_effect = Exception('429 RESOURCE_EXHAUSTED')
+        assert gbp.generate_image_imagen4(client, 'cat', 'imagen-4.0-generate-001')['rate_limited'] is True
+
+        client.models.generate_images.side_effect = Exception('RESOURCE_EXHAUSTED limit: 0')
+        assert gbp.generate_image_imagen4(client, 'cat', 'imagen-4.0-generate-001')['rate_limited'] is False
+
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_cache_skips_unchanged_files(self, mock_client_class, mock_process, mock_find_key, tmp_path):
+        """Test a second run over the same files is answered from the cache."""
+        mock_find_key.return_value = 'test_key'
+        mock_process.side_effect = lambda **kwargs: {
+            'file': kwargs['file_path'], 'status': 'success', 'response': 'ok'}
+        files = []
+        for name in ['a.pdf', 'b.pdf']:
+            (tmp_path / name).write_bytes(name.encode())
+            files.append(str(tmp_path / name))
+
+        def run():
+            return gbp.batch_process(
+                files=files,
+                prompt='Extract',
+                model='gemini-2.5-flash',
+                task='extract',
+                format_output='text',
+                cache=gbp.ResponseCache(tmp_path / 'cache')
+            )
+
+        run()
+        assert mock_process.call_count == 2
+        results = run()
+        assert mock_process.call_count == 2
+        assert [r['file'] for r in results] == files
+        assert all(r['cached'] for r in results)
+
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_resume_skips_journaled_successes(self, mock_client_class, mock_process, mock_find_key, tmp_path):
+        """Test each result is journaled and a resumed run only redoes unfinished files."""
+        mock_find_key.return_value = 'test_key'
+        journal_path = tmp_path / 'run.jsonl'
+        files = ['a.mp3', 'b.mp3', 'c.mp3']
+
+        def run(resume, fail=()):
+            mock_process.side_effect = lambda **kwargs: (
+                {'file': kwargs['file_path'], 'status': 'error', 'error': 'boom'}
+                if kwargs['file_path'] in fail else
+                {'file': kwargs['file_path'], 'status': 'success', 'response': 'ok'})
+            with gbp.BatchJournal(journal_path, resume=resume) as journal:
+                return gbp.batch_process(
+                    files=files,
+                    prompt='Transcribe',
+                    model='gemini-2.5-flash',
+                    task='transcribe',
+                    format_output='text',
+                    journal=journal
+                )
+
+        run(resume=False, fail={'b.mp3'})
+        assert len(journal_path.read_text().splitlines()) == 3
+
+        mock_process.reset_mock()
+        results = run(resume=True)
+        assert [call.kwargs['file_path'] for call in mock_process.call_args_list] == ['b.mp3']
+        assert [r['file'] for r in results] == files
+        assert all(r['status'] == 'success' for r in results)
+
+    @patch('gemini_batch_process.find_api_key')
+    @patch('gemini_batch_process.process_file')
+    @patch('gemini_batch_process.genai.Client')
+    def test_batch_process_streams_output_in_order(self, mock_client_class, mock_process, mock_find_key, tmp_path):
+        """Test results stream to the output file in input order and leave memory."""
+        import json
+        import time as real_time
+
+        mock_find_key.return_value = 'test_key'
+
+        def fake_process(**kwargs):
+            # Earlier files finish last
+            real_time.sleep(0.01 * (5 - int(Path(kwargs['file_path']).stem[-1])))
+            return {'file': kwargs['file_path'], 'status': 'success', 'response': 'text ' + kwargs['file_path']}
+
+        mock_process.side_effect = fake_process
+        files = [f'test{i}.mp3' for i in range(5)]
+        output = tmp_path / 'out.jsonl'
+
+        results = gbp.batch_process(
+            files=files,
+            prompt='Transcribe',
+            model='gemini-2.5-flash',
+            task='transcribe',
+            format_output='text',
+            output_file=str(output),
+            concurrency=3
+        )
+
+        lines = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+        assert [line['file'] for line in lines] == files
+        assert [line['response'] for line in lines] == ['text ' + f for f in files]
+        assert all('response' not in r and r['status'] == 'success' for r in results)
+
+    def test_run_ordered_reports_each_result(self):
+        """Test run_ordered returns input order and reports every finished item."""
+        finished = []
+        results = gbp.run_ordered(
+            ['a', 'b', 'c'],
+            lambda i, item: item.upper(),
+            concurrency=2,
+            on_result=lambda i, item, result: finished.append((i, item, result))
+        )
+
+        assert results == ['A', 'B', 'C']
+        assert sorted(finished) == [(1, 'a', 'A'), (2, 'b', 'B'), (3, 'c', 'C')]
+
     @patch('gemini_batch_process.find_api_key')
     def test_batch_process_no_api_key(self, mock_find_key):
         """Test batch processing without API key."""
@@ -314,18 +535,32 @@ class TestBatchProcessing:
 class TestResultsSaving:
     """Test results saving functionality."""
 
-    @patch('builtins.open', create=True)
-    @patch('json.dump')
-    def test_save_results_json(self, mock_json_dump, mock_open):
+    def test_save_results_json(self, tmp_path):
         """Test saving results as JSON."""
+        import json
         results = [
             {'file': 'test1.jpg', 'status': 'success', 'response': 'Test1'},
             {'file': 'test2.jpg', 'status': 'success', 'response': 'Test2'}
         ]
+        output = tmp_path / 'output.json'
+
+        gbp.save_results(results, str(output), 'json')
+
+        assert output.read_text(encoding='utf-8') == json.dumps(results, indent=2)
+
+    def test_save_results_jsonl(self, tmp_path):
+        """Test .jsonl output gets one result per line."""
+        import json
+        results = [
+            {'file': 'test1.jpg', 'status': 'success', 'response': 'Test1'},
+            {'file': 'test2.jpg', 'status': 'error', 'error': 'Failed'}
+        ]
+        output = tmp_path / 'output.jsonl'
 
-        gbp.save_results(results, 'output.json', 'json')
+        gbp.save_results(results, str(output), 'json')
 
-        mock_json_dump.assert_called_once()
+        lines = output.read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line) for line in lines] == results
 
     @patch('builtins.open', create=True)
     @patch('csv.DictWriter')
@@ -341,22 +576,21 @@ class TestResultsSaving:
         # Verify CSV writer was used
         mock_csv_writer.assert_called_once()
 
-    @patch('builtins.open', create=True)
-    def test_save_results_markdown(self, mock_open):
+    def test_save_results_markdown(self, tmp_path):
         """Test saving results as Markdown."""
-        mock_file = MagicMock()
-        mock_open.return_value.__enter__.return_value = mock_file
-
         results = [
             {'file': 'test1.jpg', 'status': 'success', 'response': 'Test1'},
             {'file': 'test2.jpg', 'status': 'error', 'error': 'Failed'}
         ]
+        output = tmp_path / 'output.md'
 
-        gbp.save_results(results, 'output.md', 'markdown')
-
-        # Verify write was called
-        assert mock_file.write.call_count > 0
+        gbp.save_results(results, str(output), 'markdown')
 
+        assert output.read_text(encoding='utf-8') == (
+            "# Batch Processing Results\n\n"
+            "## 1. test1.jpg\n\n**Status**: success\n\n**Response**:\n\nTest1\n\n"
+            "## 2. test2.jpg\n\n**Status**: error\n\n**Error**: Failed\n\n"
+        )
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--cov=gemini_batch_process', '--cov-report=term-missing'])
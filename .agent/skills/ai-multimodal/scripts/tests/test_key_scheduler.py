@@ -0,0 +1,101 @@
+"""
+Tests for key_scheduler.py
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import key_scheduler as ks
+
+
+class FakeClock:
+    """Manual clock whose sleep() just advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_scheduler(keys, **kwargs):
+    clock = FakeClock()
+    return ks.KeyScheduler(keys, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+class TestErrorParsing:
+    """Test rate limit detection and Retry-After parsing."""
+
+    def test_is_rate_limit_error(self):
+        """Test 429 and RESOURCE_EXHAUSTED replies are rate limits."""
+        assert ks.is_rate_limit_error(Exception("429 Too Many Requests"))
+        assert ks.is_rate_limit_error(Exception("RESOURCE_EXHAUSTED: quota exceeded"))
+        assert not ks.is_rate_limit_error(Exception("400 INVALID_ARGUMENT"))
+
+    def test_retry_after_from_message(self):
+        """Test retry delays embedded in the error text."""
+        assert ks.retry_after(Exception("429 ... {'retryDelay': '17s'}")) == 17.0
+        assert ks.retry_after(Exception("Please retry in 2.5s.")) == 2.5
+        assert ks.retry_after(Exception("RESOURCE_EXHAUSTED")) is None
+
+    def test_retry_after_from_header(self):
+        """Test the Retry-After header wins when the error carries a response."""
+        error = Exception("429")
+        error.response = Mock(headers={'Retry-After': '30'})
+        assert ks.retry_after(error) == 30.0
+
+
+class TestKeyScheduler:
+    """Test key assignment, buckets and cooldowns."""
+
+    def test_unlimited_keys_round_robin(self):
+        """Test keys without limits are used in turn."""
+        scheduler, _ = make_scheduler(['a', 'b', 'c'])
+        assert [scheduler.acquire() for _ in range(6)] == ['a', 'b', 'c', 'a', 'b', 'c']
+
+    def test_combined_rpm_across_keys(self):
+        """Test requests flow at the sum of all keys' RPM."""
+        scheduler, clock = make_scheduler(['a', 'b'], rpm=2)
+        keys = [scheduler.acquire() for _ in range(4)]
+        assert sorted(keys) == ['a', 'a', 'b', 'b']
+        assert clock.now == 0.0
+
+        # Fifth request waits for the first refill: 60s / 2 RPM
+        scheduler.acquire()
+        assert clock.now == 30.0
+
+    def test_most_headroom_wins(self):
+        """Test the key with the fullest token bucket is picked."""
+        scheduler, _ = make_scheduler(['a', 'b'], tpm=1000)
+        assert scheduler.acquire(tokens=600) == 'a'
+        assert scheduler.acquire(tokens=100) == 'b'
+        assert scheduler.acquire(tokens=100) == 'b'
+
+    def test_rate_limited_key_cools_down(self):
+        """Test a 429 moves traffic to the other keys until Retry-After passes."""
+        scheduler, clock = make_scheduler(['a', 'b'])
+        delay = scheduler.report_rate_limit('a', Exception("429 retry in 10s"))
+        assert delay == 10.0
+        assert [scheduler.acquire() for _ in range(3)] == ['b', 'b', 'b']
+
+        clock.now = 10.0
+        assert scheduler.acquire() == 'a'
+
+    def test_all_keys_cooling_waits_for_first(self):
+        """Test acquire sleeps until the earliest cooldown ends, or gives up at timeout."""
+        scheduler, clock = make_scheduler(['a', 'b'], cooldown=60)
+        scheduler.report_rate_limit('a')
+        scheduler.report_rate_limit('b', Exception("Retry-After: 5"))
+
+        assert scheduler.acquire(timeout=1) is None
+        assert scheduler.acquire() == 'b'
+        assert clock.now == 5.0
@@ -0,0 +1,115 @@
+"""
+Tests for response_cache.py
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import response_cache as rc
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestCacheKey:
+    """Test content-addressed keys."""
+
+    def test_key_follows_content_not_path(self, tmp_path):
+        """Test renamed copies share a key and edited files do not."""
+        cache = rc.ResponseCache(tmp_path / 'cache')
+        a = write(tmp_path / 'a.pdf', b'same bytes')
+        b = write(tmp_path / 'b.pdf', b'same bytes')
+        c = write(tmp_path / 'c.pdf', b'other bytes')
+
+        assert cache.key(a, prompt='p', model='m') == cache.key(b, prompt='p', model='m')
+        assert cache.key(a, prompt='p', model='m') != cache.key(c, prompt='p', model='m')
+
+    def test_key_follows_request_settings(self, tmp_path):
+        """Test prompt, model and config changes miss."""
+        cache = rc.ResponseCache(tmp_path / 'cache')
+        a = write(tmp_path / 'a.pdf', b'bytes')
+        base = cache.key(a, prompt='p', model='m', format_output='text')
+
+        assert base != cache.key(a, prompt='q', model='m', format_output='text')
+        assert base != cache.key(a, prompt='p', model='n', format_output='text')
+        assert base != cache.key(a, prompt='p', model='m', format_output='json')
+
+
+class TestResponseCache:
+    """Test storing, expiry and eviction."""
+
+    def test_round_trip_success_only(self, tmp_path):
+        """Test successful results are returned and errors are never stored."""
+        cache = rc.ResponseCache(tmp_path / 'cache')
+        cache.put('k1', {'file': 'a.pdf', 'status': 'success', 'response': 'hello'})
+        cache.put('k2', {'file': 'b.pdf', 'status': 'error', 'error': 'boom'})
+
+        assert cache.get('k1') == {'file': 'a.pdf', 'status': 'success', 'response': 'hello'}
+        assert cache.get('k2') is None
+        assert cache.hits == 1
+
+    def test_artifacts_restored(self, tmp_path):
+        """Test a generated image deleted after the run is put back on a hit."""
+        cache = rc.ResponseCache(tmp_path / 'cache')
+        image = write(tmp_path / 'photo_generated_0.png', b'\x89PNG data')
+        cache.put('k', {'file': 'photo.jpg', 'status': 'success', 'generated_image': image})
+
+        os.remove(image)
+        result = cache.get('k')
+        assert result['generated_image'] == image
+        assert Path(image).read_bytes() == b'\x89PNG data'
+
+    def test_expired_entries_miss(self, tmp_path):
+        """Test entries older than the TTL are dropped."""
+        cache = rc.ResponseCache(tmp_path / 'cache', ttl=60)
+        cache.put('k', {'status': 'success', 'response': 'old'})
+        cache.ttl = -1
+
+        assert cache.get('k') is None
+        assert not any((tmp_path / 'cache').glob('*/k'))
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        """Test prune keeps the cache under max_bytes, oldest use first."""
+        cache = rc.ResponseCache(tmp_path / 'cache')
+        for n, key in enumerate(['k1', 'k2', 'k3']):
+            cache.put(key, {'status': 'success', 'response': 'x' * 1000})
+            result_file = tmp_path / 'cache' / key[:2] / key / rc.RESULT_FILE
+            os.utime(result_file, (time.time() - 100 + n, time.time() - 100 + n))
+        cache.get('k1')  # k1 is now the most recently used
+
+        size = sum(p.stat().st_size for p in (tmp_path / 'cache').rglob('*') if p.is_file())
+        cache.max_bytes = size - 1  # evicting any one entry is enough
+        assert cache.prune() == 1
+        assert cache.get('k2') is None
+        assert cache.get('k1') and cache.get('k3')
+
+    def test_prune_expires_by_creation_time(self, tmp_path):
+        """Test prune drops entries stored longer ago than the TTL, even if used since."""
+        cache = rc.ResponseCache(tmp_path / 'cache', ttl=60)
+        cache.put('old', {'status': 'success', 'response': 'a'})
+        cache.put('new', {'status': 'success', 'response': 'b'})
+        created = tmp_path / 'cache' / 'ol' / 'old' / rc.CREATED_FILE
+        os.utime(created, (time.time() - 120, time.time() - 120))
+
+        assert cache.prune() == 1
+        assert not (tmp_path / 'cache' / 'ol' / 'old').exists()
+        assert cache.get('new')
+
+    def test_hits_counted_across_threads(self, tmp_path):
+        """Test concurrent workers do not lose hit counts."""
+        cache = rc.ResponseCache(tmp_path / 'cache')
+        cache.put('k', {'status': 'success', 'response': 'x'})
+        threads = [threading.Thread(target=lambda: [cache.get('k') for _ in range(50)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache.hits == 400
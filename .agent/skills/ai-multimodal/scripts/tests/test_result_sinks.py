@@ -0,0 +1,46 @@
+"""
+Tests for result_sinks.py
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import result_sinks as rs
+
+
+class TestSinks:
+    """Test incremental writers."""
+
+    def test_csv_rows_on_disk_before_close(self, tmp_path):
+        """Test each CSV row is flushed as it is written."""
+        output = tmp_path / 'out.csv'
+        sink = rs.CSVSink(str(output))
+        sink.write({'file': 'a.mp3', 'status': 'success', 'response': 'line one\nline two'})
+
+        with open(output, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert rows == [{'file': 'a.mp3', 'status': 'success', 'response': 'line one\nline two', 'error': ''}]
+        sink.close()
+
+    def test_empty_json_array(self, tmp_path):
+        """Test a JSON sink with no results still closes to valid JSON."""
+        output = tmp_path / 'out.json'
+        rs.JSONSink(str(output)).close()
+        assert output.read_text(encoding='utf-8') == '[]'
+
+    def test_ordered_writer(self, tmp_path):
+        """Test results arriving out of order reach the sink in input order."""
+        output = tmp_path / 'out.jsonl'
+        writer = rs.OrderedWriter(rs.JSONLSink(str(output)))
+        writer.put(2, {'file': 'b'})
+        assert output.read_text(encoding='utf-8') == ''
+        writer.put(1, {'file': 'a'})
+        writer.put(4, {'file': 'd'})
+        writer.close()
+
+        assert output.read_text(encoding='utf-8').splitlines() == [
+            '{"file": "a"}', '{"file": "b"}', '{"file": "d"}']
@@ -9,10 +9,10 @@ Usage:
     result = generate_creative_brief("SaaS product launch gen z", "My Campaign")
 """
 
-import csv
 import json
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, search_many, DATA_DIR
+from lib.rule_index import RuleIndex, load_rule_index
 
 
 # ============ CONFIGURATION ============
@@ -32,52 +32,29 @@ class CreativeBriefGenerator:
     """Generates creative direction recommendations from aggregated searches."""
 
     def __init__(self):
-        self.reasoning_data = self._load_reasoning()
+        self.reasoning_rules = self._load_reasoning()
+        self.reasoning_data = self.reasoning_rules.rules
 
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
+    def _load_reasoning(self) -> RuleIndex:
+        """Load reasoning rules from CSV, indexed by category."""
+        return load_rule_index(DATA_DIR / REASONING_FILE, "Category")
 
     def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+        """Execute searches across multiple domains in one batched call."""
+        requests = []
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                requests.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                requests.append((query, domain, config["max_results"]))
+        return dict(zip(SEARCH_CONFIG, search_many(requests)))
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            cat = rule.get("Category", "").lower()
-            if cat in category_lower or category_lower in cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            cat = rule.get("Category", "").lower()
-            keywords = cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        return self.reasoning_rules.find(category)
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
@@ -9,9 +9,17 @@ Domains: style, platform, voiceover, music, reasoning
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_DOMAINS, MAX_RESULTS, search
+from core import CSV_CONFIG, AVAILABLE_DOMAINS, MAX_RESULTS, DATA_DIR, search
+from lib.query_cache import cached
+from lib.search_daemon import routed
 from creative_brief import generate_creative_brief
 
+# Answer from the warm search daemon when it is running (see .agent/scripts/search-daemon.py)
+search = routed("creativity", search)
+
+# Reuse results of identical queries across sessions (see .agent/scripts/lib/query_cache.py)
+search = cached(DATA_DIR, search, CSV_CONFIG)
+
 
 def format_output(result):
     """Format results for AI consumption (token-optimized)"""
@@ -32,6 +40,10 @@ def format_output(result):
             output.append(f"- **{key}:** {value_str}")
         output.append("")
 
+    # Ambiguous auto-routed queries carry the runner-up domain's results too
+    if "related" in result:
+        output.append(format_output(result["related"]))
+
     return "\n".join(output)
 
 
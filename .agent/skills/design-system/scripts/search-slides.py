@@ -8,10 +8,22 @@ import sys
 import json
 import argparse
 from slide_search_core import (
-    search, search_all, AVAILABLE_DOMAINS,
-    search_with_context, get_layout_for_goal, get_typography_for_slide,
+    CSV_CONFIG, DATA_DIR, search, search_all, AVAILABLE_DOMAINS,
+    search_with_context, plan_deck, get_layout_for_goal, get_typography_for_slide,
     get_color_for_emotion, get_background_config
 )
+from lib.query_cache import cached
+from lib.search_daemon import routed
+
+# Answer from the warm search daemon when it is running (see .agent/scripts/search-daemon.py)
+search = routed("design-system", search)
+search_all = routed("design-system", search_all)
+search_with_context = routed("design-system", search_with_context)
+plan_deck = routed("design-system", plan_deck)
+
+# Reuse results of identical queries across sessions (see .agent/scripts/lib/query_cache.py)
+search = cached(DATA_DIR, search, CSV_CONFIG)
+search_all = cached(DATA_DIR, search_all, CSV_CONFIG)
 
 
 def format_result(result, domain):
@@ -105,6 +117,28 @@ def format_context(context):
     return "\n".join(output)
 
 
+def print_search_result(result):
+    """Print a single-domain search result"""
+    if result.get("error"):
+        print(f"Error: {result['error']}")
+        return
+
+    print(f"Domain: {result['domain']}")
+    print(f"Query: {result['query']}")
+    print(f"File: {result['file']}")
+    print(f"Results: {result['count']}")
+    print()
+
+    if result['count'] == 0:
+        print("No matching results found.")
+        return
+
+    for i, item in enumerate(result['results'], 1):
+        print(f"--- Result {i} ---")
+        print(format_result(item, result['domain']))
+        print()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Search slide design databases",
@@ -121,10 +155,11 @@ Examples:
 Contextual Search (Premium System):
   search-slides.py "problem slide" --context --position 2 --total 9
   search-slides.py "cta" --context --position 9 --total 9 --prev-emotion frustration
+  search-slides.py --deck "hook" "problem" "solution" "traction" "cta"  # Whole deck at once
         """
     )
 
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("-d", "--domain", choices=AVAILABLE_DOMAINS,
                         help="Specific domain to search (auto-detected if not specified)")
     parser.add_argument("-n", "--max-results", type=int, default=3,
@@ -143,9 +178,27 @@ Contextual Search (Premium System):
                         help="Total slides in deck (default: 9)")
     parser.add_argument("--prev-emotion", type=str, default=None,
                         help="Previous slide's emotion for contrast calculation")
+    parser.add_argument("--deck", nargs="+", metavar="QUERY",
+                        help="Plan a whole deck: one query per slide, in order")
 
     args = parser.parse_args()
 
+    # Whole-deck planning mode
+    if args.deck:
+        plan = plan_deck(args.deck, previous_emotion=args.prev_emotion)
+
+        if args.json:
+            print(json.dumps(plan, indent=2))
+        else:
+            for slide in plan:
+                context = slide['context']
+                print(f"\n##### SLIDE {context['slide_position']}/{context['total_slides']}: {slide['query']}")
+                print(format_context(context))
+        return
+
+    if not args.query:
+        parser.error("a search query is required unless --deck is given")
+
     # Contextual search mode
     if args.context:
         result = search_with_context(
@@ -194,24 +247,11 @@ Contextual Search (Premium System):
         if args.json:
             print(json.dumps(result, indent=2))
         else:
-            if result.get("error"):
-                print(f"Error: {result['error']}")
-                return
-
-            print(f"Domain: {result['domain']}")
-            print(f"Query: {result['query']}")
-            print(f"File: {result['file']}")
-            print(f"Results: {result['count']}")
-            print()
-
-            if result['count'] == 0:
-                print("No matching results found.")
-                return
-
-            for i, item in enumerate(result['results'], 1):
-                print(f"--- Result {i} ---")
-                print(format_result(item, result['domain']))
-                print()
+            print_search_result(result)
+            # Ambiguous auto-detected queries also carry the runner-up domain
+            if result.get("related"):
+                print("=== RELATED DOMAIN ===")
+                print_search_result(result["related"])
 
 
 if __name__ == "__main__":
@@ -5,14 +5,20 @@ Slide Search Core - BM25 search engine for slide design databases
 """
 
 import csv
-import re
+import sys
 from pathlib import Path
-from math import log
-from collections import defaultdict
+
+# Shared BM25 engine (works for both local and global installs)
+AGENT_ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(AGENT_ROOT / 'scripts'))
+from lib.csv_index import search_csv, search_csv_federated, search_many as _search_many
+from lib.keyword_matcher import KeywordMatcher
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
+# Shortest token indexed and queried
+MIN_TOKEN_LEN = 3
 
 CSV_CONFIG = {
     "strategy": {
@@ -40,67 +46,19 @@ CSV_CONFIG = {
 AVAILABLE_DOMAINS = list(CSV_CONFIG.keys())
 
 
-# ============ BM25 IMPLEMENTATION ============
-class BM25:
-    """BM25 ranking algorithm for text search"""
-
-    def __init__(self, k1=1.5, b=0.75):
-        self.k1 = k1
-        self.b = b
-        self.corpus = []
-        self.doc_lengths = []
-        self.avgdl = 0
-        self.idf = {}
-        self.doc_freqs = defaultdict(int)
-        self.N = 0
-
-    def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
-
-    def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
-        if self.N == 0:
-            return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+# Domain keyword mapping for auto-detection
+DOMAIN_KEYWORDS = {
+    "strategy": ["pitch", "deck", "investor", "yc", "seed", "series", "demo", "sales", "webinar",
+                 "conference", "board", "qbr", "all-hands", "duarte", "kawasaki", "structure"],
+    "layout": ["slide", "layout", "grid", "column", "title", "hero", "section", "cta",
+               "screenshot", "quote", "timeline", "comparison", "pricing", "team"],
+    "copy": ["headline", "copy", "formula", "aida", "pas", "hook", "cta", "benefit",
+             "objection", "proof", "testimonial", "urgency", "scarcity"],
+    "chart": ["chart", "graph", "bar", "line", "pie", "funnel", "metrics", "data",
+              "visualization", "kpi", "trend", "comparison", "heatmap", "gauge"]
+}
+
+DOMAIN_MATCHER = KeywordMatcher(DOMAIN_KEYWORDS, default="strategy")
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -112,79 +70,53 @@ def _load_csv(filepath):
 
 def _search_csv(filepath, search_cols, output_cols, query, max_results):
     """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+    return search_csv(DATA_DIR, filepath, search_cols, output_cols, query, max_results,
+                      min_len=MIN_TOKEN_LEN)
 
-    data = _load_csv(filepath)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
-
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
+def _search_csv_federated(configs, query, max_results):
+    """BM25 search of several domain configs in one federated index pass"""
+    corpora = [(DATA_DIR / c["file"], c["search_cols"], c["output_cols"]) for c in configs]
+    return search_csv_federated(DATA_DIR, corpora, query, max_results, MIN_TOKEN_LEN)
 
 
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "strategy": ["pitch", "deck", "investor", "yc", "seed", "series", "demo", "sales", "webinar",
-                     "conference", "board", "qbr", "all-hands", "duarte", "kawasaki", "structure"],
-        "layout": ["slide", "layout", "grid", "column", "title", "hero", "section", "cta",
-                   "screenshot", "quote", "timeline", "comparison", "pricing", "team"],
-        "copy": ["headline", "copy", "formula", "aida", "pas", "hook", "cta", "benefit",
-                 "objection", "proof", "testimonial", "urgency", "scarcity"],
-        "chart": ["chart", "graph", "bar", "line", "pie", "funnel", "metrics", "data",
-                  "visualization", "kpi", "trend", "comparison", "heatmap", "gauge"]
-    }
-
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "strategy"
+    return DOMAIN_MATCHER.detect(query)
 
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
-    if domain is None:
-        domain = detect_domain(query)
-
-    config = CSV_CONFIG.get(domain, CSV_CONFIG["strategy"])
-    filepath = DATA_DIR / config["file"]
+    return search_many([(query, domain, max_results)])[0]
 
-    if not filepath.exists():
-        return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+def search_many(queries, domain=None, max_results=MAX_RESULTS):
+    """
+    Run several searches, loading each domain's index once.
 
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+    Each query is a string or a (query, domain[, max_results]) tuple; domain
+    and max_results are the defaults for entries that omit them, and a
+    missing domain is routed as in search(). Returns search() results in order.
+    """
+    return _search_many(CSV_CONFIG, queries, DATA_DIR, DOMAIN_MATCHER, domain, max_results,
+                        min_len=MIN_TOKEN_LEN)
 
 
 def search_all(query, max_results=2):
     """Search across all domains for comprehensive results"""
     all_results = {}
-
-    for domain in AVAILABLE_DOMAINS:
-        result = search(query, domain, max_results)
-        if result.get("count", 0) > 0:
-            all_results[domain] = result
+    configs = [CSV_CONFIG[domain] for domain in AVAILABLE_DOMAINS]
+
+    for domain, config, results in zip(AVAILABLE_DOMAINS, configs,
+                                       _search_csv_federated(configs, query, max_results)):
+        if results:
+            all_results[domain] = {
+                "domain": domain,
+                "query": query,
+                "file": config["file"],
+                "count": len(results),
+                "results": results
+            }
 
     return all_results
 
@@ -212,8 +144,16 @@ DECISION_CSV_CONFIG = {
 }
 
 
+# Decision tables parsed once per process: csv_type -> ((mtime_ns, size), {key: row})
+_DECISION_TABLES = {}
+
+
 def _load_decision_csv(csv_type):
-    """Load a decision CSV and return as dict keyed by primary column."""
+    """
+    Load a decision CSV and return as dict keyed by primary column.
+    Tables are cached per process and reparsed only when the CSV changes;
+    callers must copy rows before modifying them.
+    """
     config = DECISION_CSV_CONFIG.get(csv_type)
     if not config:
         return {}
@@ -222,8 +162,16 @@ def _load_decision_csv(csv_type):
     if not filepath.exists():
         return {}
 
+    stat = filepath.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _DECISION_TABLES.get(csv_type)
+    if cached and cached[0] == signature:
+        return cached[1]
+
     data = _load_csv(filepath)
-    return {row[config["key_col"]]: row for row in data if config["key_col"] in row}
+    table = {row[config["key_col"]]: row for row in data if config["key_col"] in row}
+    _DECISION_TABLES[csv_type] = (signature, table)
+    return table
 
 
 def get_layout_for_goal(goal, previous_emotion=None):
@@ -252,9 +200,9 @@ def get_typography_for_slide(slide_type, has_metrics=False, has_quote=False):
     typography = _load_decision_csv("typography")
 
     if has_metrics:
-        return typography.get("metric-callout", {})
+        return dict(typography.get("metric-callout", {}))
     if has_quote:
-        return typography.get("quote-block", {})
+        return dict(typography.get("quote-block", {}))
 
     # Map slide types to typography
     type_map = {
@@ -277,7 +225,7 @@ def get_typography_for_slide(slide_type, has_metrics=False, has_quote=False):
     }
 
     content_type = type_map.get(slide_type, "feature-grid")
-    return typography.get(content_type, {})
+    return dict(typography.get(content_type, {}))
 
 
 def get_color_for_emotion(emotion):
@@ -286,7 +234,7 @@ def get_color_for_emotion(emotion):
     Uses slide-color-logic.csv for decision.
     """
     colors = _load_decision_csv("color-logic")
-    return colors.get(emotion, colors.get("clarity", {}))
+    return dict(colors.get(emotion, colors.get("clarity", {})))
 
 
 def get_background_config(slide_type):
@@ -295,7 +243,7 @@ def get_background_config(slide_type):
     Uses slide-backgrounds.csv for decision.
     """
     backgrounds = _load_decision_csv("backgrounds")
-    return backgrounds.get(slide_type, {})
+    return dict(backgrounds.get(slide_type, {}))
 
 
 def should_use_full_bleed(slide_index, total_slides, emotion):
@@ -364,7 +312,36 @@ def search_with_context(query, slide_position=1, total_slides=9, previous_emotio
     """
     # Get base results from existing BM25 search
     base_results = search_all(query, max_results=2)
+    result, _ = _slide_context(query, slide_position, total_slides, previous_emotion, base_results)
+    return result
 
+
+def plan_deck(queries, previous_emotion=None):
+    """
+    Contextual recommendations for every slide of a deck in one call.
+
+    Args:
+        queries: One search query per slide, in deck order
+        previous_emotion: Emotion of the slide before the first one (optional)
+
+    Returns:
+        One search_with_context() result per slide. Each slide's previous
+        emotion is the one chosen for the slide before it, and repeated
+        queries are searched once.
+    """
+    base_results = {}
+    plan = []
+    for position, query in enumerate(queries, 1):
+        if query not in base_results:
+            base_results[query] = search_all(query, max_results=2)
+        result, previous_emotion = _slide_context(query, position, len(queries), previous_emotion,
+                                                  base_results[query])
+        plan.append(result)
+    return plan
+
+
+def _slide_context(query, slide_position, total_slides, previous_emotion, base_results):
+    """Build one slide's contextual recommendations; returns (result, slide emotion)."""
     # Detect likely slide goal from query
     goal = detect_domain(query.lower())
     if "problem" in query.lower():
@@ -450,4 +427,4 @@ def search_with_context(query, slide_position=1, total_slides=9, previous_emotio
         "query": query,
         "context": context,
         "base_results": base_results,
-    }
+    }, emotion
@@ -9,7 +9,17 @@ Domains: style, color, industry
 """
 
 import argparse
-from core import CSV_CONFIG, MAX_RESULTS, search, search_all
+from core import CSV_CONFIG, MAX_RESULTS, DATA_DIR, search, search_all
+from lib.query_cache import cached
+from lib.search_daemon import routed
+
+# Answer from the warm search daemon when it is running (see .agent/scripts/search-daemon.py)
+search = routed("logo-design", search)
+search_all = routed("logo-design", search_all)
+
+# Reuse results of identical queries across sessions (see .agent/scripts/lib/query_cache.py)
+search = cached(DATA_DIR, search, CSV_CONFIG)
+search_all = cached(DATA_DIR, search_all, CSV_CONFIG)
 
 
 def format_output(result):
@@ -31,6 +41,10 @@ def format_output(result):
             output.append(f"- **{key}:** {value_str}")
         output.append("")
 
+    # Ambiguous auto-routed queries carry the runner-up domain's results too
+    if "related" in result:
+        output.append(format_output(result["related"]))
+
     return "\n".join(output)
 
 
@@ -4,15 +4,23 @@
 Three.js Skill Core - BM25 search engine for Three.js examples and API
 """
 
-import csv
-import re
+import sys
 from pathlib import Path
-from math import log
-from collections import defaultdict
+
+# Shared BM25 engine (works for both local and global installs)
+AGENT_ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(AGENT_ROOT / 'scripts'))
+from lib.csv_index import get_scorer, search_csv, search_many as _search_many
+from lib.facet_index import bitset_rows, facet_index, prefix_index
+from lib.keyword_matcher import KeywordMatcher
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 5
+# Shortest token indexed and queried (short terms like "ui", "3d" matter here)
+MIN_TOKEN_LEN = 2
+# Large corpora: score with NumPy (CSR matrix) when installed, else pure Python
+SEARCH_BACKEND = "auto"
 
 CSV_CONFIG = {
     "examples": {
@@ -45,134 +53,60 @@ DOMAIN_KEYWORDS = {
     "api": ["api", "class", "method", "function", "property", "how to", "what is", "parameter", "constructor"]
 }
 
+DOMAIN_MATCHER = KeywordMatcher(DOMAIN_KEYWORDS, default="examples")
 
-# ============ BM25 IMPLEMENTATION ============
-class BM25:
-    """BM25 ranking algorithm for text search"""
-
-    def __init__(self, k1=1.5, b=0.75):
-        self.k1 = k1
-        self.b = b
-        self.corpus = []
-        self.doc_lengths = []
-        self.avgdl = 0
-        self.idf = {}
-        self.doc_freqs = defaultdict(int)
-        self.N = 0
-
-    def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 1]
-
-    def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
-        if self.N == 0:
-            return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+# Example columns completed by prefix, and the columns completions return
+COMPLETION_COLS = ["Name", "File"]
+COMPLETION_OUTPUT_COLS = ["ID", "Category", "Name", "File", "Complexity"]
 
 
 # ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+def _load_index(domain):
+    """Columnar compiled index of a domain's CSV (mapped once per process)"""
+    config = CSV_CONFIG[domain]
+    index, _ = get_scorer(DATA_DIR, DATA_DIR / config["file"], config["search_cols"],
+                          min_len=MIN_TOKEN_LEN, backend=SEARCH_BACKEND)
+    return index
+
+
+def _example_filter(category=None, complexity=None):
+    """Bitset of example rows in category (substring) and at complexity (exact); None for no filter"""
+    index = _load_index("examples")
+    bits = None
+    if category is not None:
+        bits = facet_index(index, "Category").containing(category)
+    if complexity is not None:
+        level = facet_index(index, "Complexity").equals(complexity)
+        bits = level if bits is None else bits & level
+    return bits
 
 
 def _search_csv(filepath, search_cols, output_cols, query, max_results):
     """Core search function using BM25"""
-    if not filepath.exists():
-        return []
-
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
-
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
+    return search_csv(DATA_DIR, filepath, search_cols, output_cols, query, max_results,
+                      min_len=MIN_TOKEN_LEN, backend=SEARCH_BACKEND)
 
 
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    scores = {
-        domain: sum(1 for kw in keywords if kw in query_lower)
-        for domain, keywords in DOMAIN_KEYWORDS.items()
-    }
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "examples"
+    return DOMAIN_MATCHER.detect(query)
 
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
-    if domain is None:
-        domain = detect_domain(query)
+    return search_many([(query, domain, max_results)])[0]
 
-    config = CSV_CONFIG.get(domain, CSV_CONFIG["examples"])
-    filepath = DATA_DIR / config["file"]
 
-    if not filepath.exists():
-        return {"error": f"File not found: {filepath}", "domain": domain}
+def search_many(queries, domain=None, max_results=MAX_RESULTS):
+    """
+    Run several searches, loading each domain's index once.
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
-
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+    Each query is a string or a (query, domain[, max_results]) tuple; domain
+    and max_results are the defaults for entries that omit them, and a
+    missing domain is routed as in search(). Returns search() results in order.
+    """
+    return _search_many(CSV_CONFIG, queries, DATA_DIR, DOMAIN_MATCHER, domain, max_results,
+                        min_len=MIN_TOKEN_LEN, backend=SEARCH_BACKEND)
 
 
 def search_by_complexity(complexity, max_results=MAX_RESULTS):
@@ -181,8 +115,8 @@ def search_by_complexity(complexity, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}"}
 
-    data = _load_csv(filepath)
-    results = [row for row in data if row.get("Complexity", "").lower() == complexity.lower()][:max_results]
+    index = _load_index("examples")
+    results = index.rows(bitset_rows(_example_filter(complexity=complexity), max_results))
 
     return {
         "domain": "examples",
@@ -198,8 +132,8 @@ def search_by_category(category, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}"}
 
-    data = _load_csv(filepath)
-    results = [row for row in data if category.lower() in row.get("Category", "").lower()][:max_results]
+    index = _load_index("examples")
+    results = index.rows(bitset_rows(_example_filter(category=category), max_results))
 
     return {
         "domain": "examples",
@@ -221,9 +155,16 @@ def get_recommended_examples(use_case, max_results=MAX_RESULTS):
     recommended = use_case_result["results"][0].get("Recommended Examples", "")
     example_names = [e.strip() for e in recommended.split(";")]
 
-    # Search for each example
+    # Recommendations name example files; resolve them exactly, else search for them
     all_results = []
+    index = _load_index("examples")
+    files = prefix_index(index, ["File"])
+    output_cols = CSV_CONFIG["examples"]["output_cols"]
     for name in example_names[:max_results]:
+        rows = files.lookup(f"{name}.html")
+        if rows:
+            all_results.extend(index.rows(rows[:1], output_cols))
+            continue
         result = search(name, domain="examples", max_results=1)
         if result.get("count", 0) > 0:
             all_results.extend(result["results"])
@@ -234,3 +175,47 @@ def get_recommended_examples(use_case, max_results=MAX_RESULTS):
         "count": len(all_results),
         "results": all_results
     }
+
+
+def search_examples(query, category=None, complexity=None, max_results=MAX_RESULTS):
+    """BM25 search of examples restricted to a category and/or complexity level"""
+    config = CSV_CONFIG["examples"]
+    filepath = DATA_DIR / config["file"]
+    if not filepath.exists():
+        return {"error": f"File not found: {filepath}"}
+
+    bits = _example_filter(category, complexity)
+    index, scorer = get_scorer(DATA_DIR, filepath, config["search_cols"], min_len=MIN_TOKEN_LEN,
+                               backend=SEARCH_BACKEND)
+    # Only rows inside the facet bitset are scored
+    allowed = None if bits is None else set(bitset_rows(bits))
+    hits = [idx for idx, _ in scorer.top_k(query, max_results, allowed)]
+    results = index.rows(hits, config["output_cols"])
+
+    return {
+        "domain": "examples",
+        "query": query,
+        "category": category,
+        "complexity": complexity,
+        "file": config["file"],
+        "count": len(results),
+        "results": results
+    }
+
+
+def complete_examples(prefix, max_results=MAX_RESULTS):
+    """Examples whose name or file starts with prefix (e.g. "webgl_loader_g")"""
+    filepath = DATA_DIR / CSV_CONFIG["examples"]["file"]
+    if not filepath.exists():
+        return {"error": f"File not found: {filepath}"}
+
+    index = _load_index("examples")
+    rows = prefix_index(index, COMPLETION_COLS).complete(prefix.strip(), max_results)
+    results = index.rows(rows, COMPLETION_OUTPUT_COLS)
+
+    return {
+        "domain": "examples",
+        "prefix": prefix,
+        "count": len(results),
+        "results": results
+    }
@@ -6,6 +6,8 @@ Usage: python search.py "<query>" [--domain <domain>] [--max-results 5]
        python search.py "<query>" --use-case
        python search.py --category <category>
        python search.py --complexity <low|medium|high>
+       python search.py "<query>" --category <category> --complexity <level>
+       python search.py --complete <name or file prefix>
 
 Domains: examples, categories, use-cases, api
 """
@@ -13,9 +15,23 @@ Domains: examples, categories, use-cases, api
 import argparse
 import json
 from core import (
-    CSV_CONFIG, MAX_RESULTS, search,
-    search_by_complexity, search_by_category, get_recommended_examples
+    CSV_CONFIG, MAX_RESULTS, DATA_DIR, search,
+    search_by_complexity, search_by_category, get_recommended_examples,
+    search_examples, complete_examples
 )
+from lib.query_cache import cached
+from lib.search_daemon import routed
+
+# Answer from the warm search daemon when it is running (see .agent/scripts/search-daemon.py)
+search = routed("threejs", search)
+search_by_complexity = routed("threejs", search_by_complexity)
+search_by_category = routed("threejs", search_by_category)
+get_recommended_examples = routed("threejs", get_recommended_examples)
+search_examples = routed("threejs", search_examples)
+complete_examples = routed("threejs", complete_examples)
+
+# Reuse results of identical queries across sessions (see .agent/scripts/lib/query_cache.py)
+search = cached(DATA_DIR, search, CSV_CONFIG)
 
 
 def format_output(result):
@@ -25,7 +41,7 @@ def format_output(result):
 
     output = []
     output.append(f"## Three.js Search Results")
-    output.append(f"**Domain:** {result['domain']} | **Query:** {result.get('query', result.get('category', result.get('complexity', 'N/A')))}")
+    output.append(f"**Domain:** {result['domain']} | **Query:** {result.get('query', result.get('prefix', result.get('category', result.get('complexity', 'N/A'))))}")
     output.append(f"**Found:** {result['count']} results\n")
 
     for i, row in enumerate(result['results'], 1):
@@ -37,6 +53,10 @@ def format_output(result):
             output.append(f"- **{key}:** {value_str}")
         output.append("")
 
+    # Ambiguous auto-routed queries carry the runner-up domain's results too
+    if "related" in result:
+        output.append(format_output(result["related"]))
+
     return "\n".join(output)
 
 
@@ -51,11 +71,17 @@ def main():
     parser.add_argument("--use-case", "-u", action="store_true", help="Get recommended examples for use case")
     parser.add_argument("--category", "-c", type=str, help="Filter by category")
     parser.add_argument("--complexity", "-x", choices=["low", "medium", "high"], help="Filter by complexity")
+    parser.add_argument("--complete", "-p", type=str, metavar="PREFIX",
+                        help="Complete an example name or file prefix (e.g. webgl_loader_g)")
 
     args = parser.parse_args()
 
     # Handle special search modes
-    if args.complexity:
+    if args.complete is not None:
+        result = complete_examples(args.complete, args.max_results)
+    elif args.query and not args.use_case and (args.category or args.complexity):
+        result = search_examples(args.query, args.category, args.complexity, args.max_results)
+    elif args.complexity:
         result = search_by_complexity(args.complexity, args.max_results)
     elif args.category:
         result = search_by_category(args.category, args.max_results)
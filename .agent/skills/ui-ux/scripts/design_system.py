@@ -11,14 +11,20 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Batch: many projects or pages sharing the loaded indexes
+    results = generate_design_systems([
+        {"query": "SaaS dashboard", "project_name": "My Project", "page": "billing"},
+        {"query": "SaaS dashboard", "project_name": "My Project", "page": "settings"},
+    ], persist=True)
 """
 
-import csv
 import json
 import os
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search_many, DATA_DIR
+from lib.rule_index import RuleIndex, load_rule_index
 
 
 # ============ CONFIGURATION ============
@@ -38,52 +44,31 @@ class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
 
     def __init__(self):
-        self.reasoning_data = self._load_reasoning()
+        self.reasoning_rules = self._load_reasoning()
+        self.reasoning_data = self.reasoning_rules.rules
 
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
+    def _load_reasoning(self) -> RuleIndex:
+        """Load reasoning rules from CSV, indexed by category."""
+        return load_rule_index(DATA_DIR / REASONING_FILE, "UI_Category")
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _domain_requests(self, query: str, style_priority: list = None) -> list:
+        """Build the (query, domain, max_results) searches that follow the product search."""
+        requests = []
         for domain, config in SEARCH_CONFIG.items():
+            if domain == "product":
+                continue  # Already searched to pick the reasoning category
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                requests.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                requests.append((query, domain, config["max_results"]))
+        return requests
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        return self.reasoning_rules.find(category)
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
@@ -162,21 +147,51 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
-        # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
-        product_results = product_result.get("results", [])
-        category = "General"
-        if product_results:
-            category = product_results[0].get("Product Type", "General")
+        return self.generate_many([(query, project_name)])[0]
 
-        # Step 2: Get reasoning rules for this category
-        reasoning = self._apply_reasoning(category, {})
-        style_priority = reasoning.get("style_priority", [])
+    def generate_many(self, queries: list) -> list:
+        """
+        Generate design systems for many queries at once.
 
-        # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        Each item is a query string or a (query, project_name) tuple. All product
+        searches run as one batch, then every remaining domain search runs as a
+        second batch, so each CSV index is resolved once and read in one pass.
+        """
+        items = [(item, None) if isinstance(item, str) else tuple(item) for item in queries]
 
+        # Step 1: First search product to get category
+        product_max = SEARCH_CONFIG["product"]["max_results"]
+        product_searches = search_many([(query, "product", product_max) for query, _ in items])
+
+        plans = []
+        requests = []
+        for (query, project_name), product_result in zip(items, product_searches):
+            product_results = product_result.get("results", [])
+            category = "General"
+            if product_results:
+                category = product_results[0].get("Product Type", "General")
+
+            # Step 2: Get reasoning rules for this category
+            reasoning = self._apply_reasoning(category, {})
+            style_priority = reasoning.get("style_priority", [])
+
+            # Step 3: Multi-domain search with style priority hints
+            domain_requests = self._domain_requests(query, style_priority)
+            domains = [domain for _, domain, _ in domain_requests]
+            plans.append((query, project_name, category, reasoning, product_result, domains))
+            requests.extend(domain_requests)
+
+        domain_searches = iter(search_many(requests))
+        design_systems = []
+        for query, project_name, category, reasoning, product_result, domains in plans:
+            search_results = {"product": product_result}  # Reuse product search
+            search_results.update((domain, next(domain_searches)) for domain in domains)
+            design_systems.append(self._build(query, project_name, category, reasoning, search_results))
+        return design_systems
+
+    def _build(self, query: str, project_name: str, category: str, reasoning: dict,
+               search_results: dict) -> dict:
+        """Assemble the design system from reasoning and per-domain search results."""
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
         color_results = self._extract_results(search_results.get("color", {}))
@@ -487,6 +502,52 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     return format_ascii_box(design_system)
 
 
+def generate_design_systems(projects: list, output_format: str = "ascii", persist: bool = False,
+                            output_dir: str = None) -> list:
+    """
+    Batch entry point: generate design systems for many projects or pages in one call.
+
+    Args:
+        projects: List of query strings or dicts with "query" and optional
+                  "project_name" and "page" keys. Entries sharing a query and
+                  project name are generated once; with persist, their MASTER.md
+                  is written once and each page gets its own override file.
+                  Distinct entries persisting to the same project folder
+                  raise ValueError before anything is written.
+        output_format: "ascii" (default) or "markdown"
+        persist: If True, save design systems to design-system/ folders
+        output_dir: Optional output directory (defaults to current working directory)
+
+    Returns:
+        List of formatted design system strings, one per entry in projects
+    """
+    entries = [{"query": p} if isinstance(p, str) else p for p in projects]
+    keys = [(e["query"], e.get("project_name")) for e in entries]
+    unique = list(dict.fromkeys(keys))
+
+    generator = DesignSystemGenerator()
+    design_systems = dict(zip(unique, generator.generate_many(unique)))
+
+    if persist:
+        # Another query with the same project name would overwrite its MASTER.md
+        folders = {}
+        for key in unique:
+            folder = _design_system_dir(design_systems[key], output_dir)
+            if folder in folders:
+                raise ValueError(f"Queries '{folders[folder]}' and '{key[0]}' would both persist to {folder}; "
+                                 f"give them different project names")
+            folders[folder] = key[0]
+        for key in unique:
+            persist_design_system(design_systems[key], output_dir=output_dir)
+        for key, entry in zip(keys, entries):
+            if entry.get("page"):
+                persist_page_override(design_systems[key], entry["page"], output_dir, key[0])
+
+    formatter = format_markdown if output_format == "markdown" else format_ascii_box
+    formatted = {key: formatter(design_system) for key, design_system in design_systems.items()}
+    return [formatted[key] for key in keys]
+
+
 # ============ PERSISTENCE FUNCTIONS ============
 def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
     """
@@ -501,13 +562,7 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     Returns:
         dict with created file paths and status
     """
-    base_dir = Path(output_dir) if output_dir else Path.cwd()
-    
-    # Use project name for project-specific folder
-    project_name = design_system.get("project_name", "default")
-    project_slug = project_name.lower().replace(' ', '-')
-    
-    design_system_dir = base_dir / "design-system" / project_slug
+    design_system_dir = _design_system_dir(design_system, output_dir)
     pages_dir = design_system_dir / "pages"
     
     created_files = []
@@ -526,11 +581,7 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     
     # If page is specified, create page override file with intelligent content
     if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+        created_files.append(persist_page_override(design_system, page, output_dir, page_query))
     
     return {
         "status": "success",
@@ -539,6 +590,27 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     }
 
 
+def persist_page_override(design_system: dict, page: str, output_dir: str = None, page_query: str = None) -> str:
+    """Write one page override file next to an already persisted MASTER.md; returns its path."""
+    pages_dir = _design_system_dir(design_system, output_dir) / "pages"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
+    page_content = format_page_override_md(design_system, page, page_query)
+    with open(page_file, 'w', encoding='utf-8') as f:
+        f.write(page_content)
+    return str(page_file)
+
+
+def _design_system_dir(design_system: dict, output_dir: str = None) -> Path:
+    """Project-specific design-system/<project>/ folder."""
+    base_dir = Path(output_dir) if output_dir else Path.cwd()
+    
+    # Use project name for project-specific folder
+    project_name = design_system.get("project_name", "default")
+    project_slug = project_name.lower().replace(' ', '-')
+    return base_dir / "design-system" / project_slug
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
     project = design_system.get("project_name", "PROJECT")
@@ -918,16 +990,18 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
+    from core import search_many
     
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    style_search, ux_search, landing_search = search_many([
+        (combined_context, "style", 1),
+        (combined_context, "ux", 3),
+        (combined_context, "landing", 1)
+    ])
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -5,6 +5,7 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] --pages "dashboard,settings"
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,13 +13,24 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --pages      Comma-separated pages; the design system is generated once for all of them
 """
 
 import argparse
 import sys
 import io
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+from core import CSV_CONFIG, STACK_CONFIG, _STACK_COLS, AVAILABLE_STACKS, MAX_RESULTS, DATA_DIR, search, search_stack
+from lib.query_cache import cached
+from lib.search_daemon import routed
+from design_system import generate_design_system, generate_design_systems, persist_design_system
+
+# Answer from the warm search daemon when it is running (see .agent/scripts/search-daemon.py)
+search = routed("ui-ux", search)
+search_stack = routed("ui-ux", search_stack)
+
+# Reuse results of identical queries across sessions (see .agent/scripts/lib/query_cache.py)
+search = cached(DATA_DIR, search, CSV_CONFIG)
+search_stack = cached(DATA_DIR, search_stack, [STACK_CONFIG, _STACK_COLS])
 
 # Force UTF-8 for stdout/stderr to handle emojis on Windows (cp1252 default)
 if sys.stdout.encoding and sys.stdout.encoding.lower() != 'utf-8':
@@ -50,6 +62,10 @@ def format_output(result):
             output.append(f"- **{key}:** {value_str}")
         output.append("")
 
+    # Ambiguous auto-routed queries carry the runner-up domain's results too
+    if "related" in result:
+        output.append(format_output(result["related"]))
+
     return "\n".join(output)
 
 
@@ -67,20 +83,31 @@ if __name__ == "__main__":
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--pages", type=str, default=None, help="Comma-separated page names; creates an override file for each")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
 
     args = parser.parse_args()
 
     # Design system takes priority
     if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
+        pages = [p.strip() for p in args.pages.split(",") if p.strip()] if args.pages else []
+        if pages:
+            result = generate_design_systems(
+                [{"query": args.query, "project_name": args.project_name, "page": page} for page in pages],
+                args.format,
+                persist=args.persist,
+                output_dir=args.output_dir
+            )[0]
+        else:
+            result = generate_design_system(
+                args.query, 
+                args.project_name, 
+                args.format,
+                persist=args.persist,
+                page=args.page,
+                output_dir=args.output_dir
+            )
+            pages = [args.page] if args.page else []
         print(result)
         
         # Print persistence confirmation
@@ -89,8 +116,8 @@ if __name__ == "__main__":
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
             print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
+            for page in pages:
+                page_filename = page.lower().replace(' ', '-')
                 print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")